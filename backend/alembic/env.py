@@ -9,6 +9,10 @@ from app.core.config import settings
 from app.models import Base
 from app.models.monitor import Monitor  # noqa: F401
 from app.models.result import CheckResult  # noqa: F401
+from app.models.user import User  # noqa: F401
+from app.models.lease import WorkerLease  # noqa: F401
+from app.models.incident import Incident  # noqa: F401
+from app.models.rollup import CheckRollup  # noqa: F401
 
 config = context.config
 fileConfig(config.config_file_name)
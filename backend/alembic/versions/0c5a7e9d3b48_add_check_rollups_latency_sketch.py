@@ -0,0 +1,26 @@
+"""Add latency sketch to check_rollups
+
+Revision ID: 0c5a7e9d3b48
+Revises: b6d1f8e3a2c7
+Create Date: 2026-10-16 19:37:52.561093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c5a7e9d3b48'
+down_revision: Union[str, Sequence[str], None] = 'b6d1f8e3a2c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('check_rollups', sa.Column('latency_sketch', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('check_rollups', 'latency_sketch')
@@ -0,0 +1,29 @@
+"""Add (monitor_id, checked_at) index on check_results
+
+Revision ID: 3c9e5f1a7b20
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-16 09:12:04.518233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9e5f1a7b20'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_check_results_monitor_id_checked_at',
+        'check_results',
+        ['monitor_id', 'checked_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_check_results_monitor_id_checked_at', table_name='check_results')
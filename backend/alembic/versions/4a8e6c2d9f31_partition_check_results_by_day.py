@@ -0,0 +1,102 @@
+"""Partition check_results by day on checked_at
+
+Rebuilds check_results as a range-partitioned table with one partition per
+day, copies existing rows across and adds a BRIN index on checked_at. The copy
+runs inside the migration, so large tables should be migrated in a
+maintenance window.
+
+Revision ID: 4a8e6c2d9f31
+Revises: 7e2c9b4a1f60
+Create Date: 2026-10-16 16:41:05.730218
+
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4a8e6c2d9f31'
+down_revision: Union[str, Sequence[str], None] = '7e2c9b4a1f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DAYS_AHEAD = 7
+
+COLUMNS = (
+    'id, monitor_id, status_code, response_time_ms, is_up, checked_at, error_message, '
+    'dns_ms, connect_ms, tls_ms, ttfb_ms, transfer_ms'
+)
+
+
+def _create_table(partitioned: bool) -> None:
+    op.create_table('check_results',
+        sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('check_results_id_seq')"), nullable=False),
+        sa.Column('monitor_id', sa.Integer(), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response_time_ms', sa.Integer(), nullable=True),
+        sa.Column('is_up', sa.Boolean(), nullable=False),
+        sa.Column('checked_at', sa.DateTime(), nullable=False),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('dns_ms', sa.SmallInteger(), nullable=True),
+        sa.Column('connect_ms', sa.SmallInteger(), nullable=True),
+        sa.Column('tls_ms', sa.SmallInteger(), nullable=True),
+        sa.Column('ttfb_ms', sa.SmallInteger(), nullable=True),
+        sa.Column('transfer_ms', sa.SmallInteger(), nullable=True),
+        sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id', 'checked_at') if partitioned else sa.PrimaryKeyConstraint('id'),
+        **({'postgresql_partition_by': 'RANGE (checked_at)'} if partitioned else {}),
+    )
+
+
+def _set_aside_old_table() -> None:
+    op.execute('ALTER TABLE check_results RENAME TO check_results_old')
+    op.execute('ALTER INDEX check_results_pkey RENAME TO check_results_old_pkey')
+    op.drop_index('ix_check_results_monitor_id_checked_at', table_name='check_results_old')
+    op.execute('ALTER SEQUENCE check_results_id_seq OWNED BY NONE')
+
+
+def _finish() -> None:
+    op.execute(f'INSERT INTO check_results ({COLUMNS}) SELECT {COLUMNS} FROM check_results_old')
+    op.drop_table('check_results_old')
+    op.execute('ALTER SEQUENCE check_results_id_seq OWNED BY check_results.id')
+    op.create_index(
+        'ix_check_results_monitor_id_checked_at', 'check_results', ['monitor_id', 'checked_at']
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    _set_aside_old_table()
+    op.execute('ALTER SEQUENCE check_results_id_seq AS bigint')
+    _create_table(partitioned=True)
+
+    # One partition per day from the oldest row to a week ahead;
+    # the worker's retention job keeps creating them from there
+    oldest, newest = bind.execute(
+        sa.text('SELECT min(checked_at), max(checked_at) FROM check_results_old')
+    ).one()
+    today = datetime.now(timezone.utc).replace(tzinfo=None)
+    day = (oldest or today).replace(hour=0, minute=0, second=0, microsecond=0)
+    last = max(today + timedelta(days=DAYS_AHEAD), newest or today)
+    while day <= last:
+        following = day + timedelta(days=1)
+        op.execute(
+            f"CREATE TABLE check_results_p{day:%Y%m%d} PARTITION OF check_results "
+            f"FOR VALUES FROM ('{day.isoformat(sep=' ')}') TO ('{following.isoformat(sep=' ')}')"
+        )
+        day = following
+
+    _finish()
+    op.create_index(
+        'ix_check_results_checked_at_brin', 'check_results', ['checked_at'], postgresql_using='brin'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_check_results_checked_at_brin', table_name='check_results')
+    _set_aside_old_table()
+    _create_table(partitioned=False)
+    _finish()
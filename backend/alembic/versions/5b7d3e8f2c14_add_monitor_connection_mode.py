@@ -0,0 +1,28 @@
+"""Add connection_mode to monitors
+
+Revision ID: 5b7d3e8f2c14
+Revises: e5a1b9c47d02
+Create Date: 2026-10-16 12:05:38.174902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7d3e8f2c14'
+down_revision: Union[str, Sequence[str], None] = 'e5a1b9c47d02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('monitors', sa.Column(
+        'connection_mode', sa.String(length=8), nullable=False, server_default='warm'
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('monitors', 'connection_mode')
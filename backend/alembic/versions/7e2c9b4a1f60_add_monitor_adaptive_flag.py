@@ -0,0 +1,28 @@
+"""Add adaptive check frequency flag to monitors
+
+Revision ID: 7e2c9b4a1f60
+Revises: f3a9c1d5b7e2
+Create Date: 2026-10-16 15:02:47.118394
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e2c9b4a1f60'
+down_revision: Union[str, Sequence[str], None] = 'f3a9c1d5b7e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('monitors', sa.Column(
+        'adaptive', sa.Boolean(), nullable=False, server_default=sa.false()
+    ))
+
+
+def downgrade() -> None:
+    op.drop_column('monitors', 'adaptive')
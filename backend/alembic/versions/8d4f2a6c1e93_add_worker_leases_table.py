@@ -0,0 +1,34 @@
+"""Add worker_leases table for check sharding
+
+Revision ID: 8d4f2a6c1e93
+Revises: 3c9e5f1a7b20
+Create Date: 2026-10-16 10:02:47.301955
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d4f2a6c1e93'
+down_revision: Union[str, Sequence[str], None] = '3c9e5f1a7b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('worker_leases',
+        sa.Column('worker_id', sa.String(length=255), nullable=False),
+        sa.Column('hostname', sa.String(length=255), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('worker_id'),
+    )
+    op.create_index('ix_worker_leases_heartbeat_at', 'worker_leases', ['heartbeat_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_worker_leases_heartbeat_at', table_name='worker_leases')
+    op.drop_table('worker_leases')
@@ -0,0 +1,42 @@
+"""Add per-monitor SLO definitions and a matching latency_good rollup counter
+
+Revision ID: 9f4b2d7e1c63
+Revises: 0c5a7e9d3b48
+Create Date: 2026-10-16 22:05:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9f4b2d7e1c63'
+down_revision: Union[str, Sequence[str], None] = '0c5a7e9d3b48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('monitors', sa.Column('slo_availability_target', sa.Float(), nullable=True))
+    op.add_column('monitors', sa.Column('slo_latency_target', sa.Float(), nullable=True))
+    op.add_column('monitors', sa.Column('slo_latency_threshold_ms', sa.Integer(), nullable=True))
+    op.add_column('monitors', sa.Column('slo_window_days', sa.Integer(), nullable=True))
+    op.add_column('monitors', sa.Column(
+        'slo_calendar_month', sa.Boolean(), nullable=False, server_default=sa.false()
+    ))
+    op.add_column('check_rollups', sa.Column(
+        'latency_good', sa.Integer(), nullable=False, server_default='0'
+    ))
+    # Every monitor starts on the default 500ms threshold, which le_500 already counts
+    op.execute('UPDATE check_rollups SET latency_good = le_500')
+
+
+def downgrade() -> None:
+    op.drop_column('check_rollups', 'latency_good')
+    op.drop_column('monitors', 'slo_calendar_month')
+    op.drop_column('monitors', 'slo_window_days')
+    op.drop_column('monitors', 'slo_latency_threshold_ms')
+    op.drop_column('monitors', 'slo_latency_target')
+    op.drop_column('monitors', 'slo_availability_target')
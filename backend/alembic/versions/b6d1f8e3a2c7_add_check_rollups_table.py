@@ -0,0 +1,39 @@
+"""Add check_rollups table for minute, hour and day aggregates
+
+Revision ID: b6d1f8e3a2c7
+Revises: 4a8e6c2d9f31
+Create Date: 2026-10-16 18:12:36.904127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d1f8e3a2c7'
+down_revision: Union[str, Sequence[str], None] = '4a8e6c2d9f31'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def upgrade() -> None:
+    op.create_table('check_rollups',
+        sa.Column('monitor_id', sa.Integer(), nullable=False),
+        sa.Column('bucket_seconds', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=False),
+        sa.Column('up', sa.Integer(), nullable=False),
+        sa.Column('latency_count', sa.Integer(), nullable=False),
+        sa.Column('latency_sum_ms', sa.BigInteger(), nullable=False),
+        *(sa.Column(f'le_{ms}', sa.Integer(), nullable=False) for ms in LATENCY_BUCKETS_MS),
+        sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('monitor_id', 'bucket_seconds', 'bucket_start'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('check_rollups')
@@ -0,0 +1,30 @@
+"""Add phase timing columns to check_results
+
+Revision ID: c2f8a4d6e9b1
+Revises: 5b7d3e8f2c14
+Create Date: 2026-10-16 13:41:52.660319
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f8a4d6e9b1'
+down_revision: Union[str, Sequence[str], None] = '5b7d3e8f2c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PHASE_COLUMNS = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms')
+
+
+def upgrade() -> None:
+    for column in PHASE_COLUMNS:
+        op.add_column('check_results', sa.Column(column, sa.SmallInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    for column in reversed(PHASE_COLUMNS):
+        op.drop_column('check_results', column)
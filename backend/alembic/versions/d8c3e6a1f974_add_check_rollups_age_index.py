@@ -0,0 +1,29 @@
+"""Add (bucket_seconds, bucket_start) index on check_rollups for compaction
+
+Revision ID: d8c3e6a1f974
+Revises: 9f4b2d7e1c63
+Create Date: 2026-10-16 22:48:13.602554
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8c3e6a1f974'
+down_revision: Union[str, Sequence[str], None] = '9f4b2d7e1c63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_check_rollups_bucket_seconds_bucket_start',
+        'check_rollups',
+        ['bucket_seconds', 'bucket_start'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_check_rollups_bucket_seconds_bucket_start', table_name='check_rollups')
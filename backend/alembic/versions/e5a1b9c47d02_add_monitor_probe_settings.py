@@ -0,0 +1,34 @@
+"""Add probe mode, timeout and body cap to monitors
+
+Revision ID: e5a1b9c47d02
+Revises: 8d4f2a6c1e93
+Create Date: 2026-10-16 11:24:13.882410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a1b9c47d02'
+down_revision: Union[str, Sequence[str], None] = '8d4f2a6c1e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('monitors', sa.Column(
+        'probe_mode', sa.String(length=16), nullable=False, server_default='headers'
+    ))
+    op.add_column('monitors', sa.Column(
+        'timeout_seconds', sa.Float(), nullable=False, server_default='30'
+    ))
+    op.add_column('monitors', sa.Column('max_body_bytes', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('monitors', 'max_body_bytes')
+    op.drop_column('monitors', 'timeout_seconds')
+    op.drop_column('monitors', 'probe_mode')
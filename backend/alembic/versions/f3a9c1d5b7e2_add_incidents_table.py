@@ -0,0 +1,38 @@
+"""Add incidents table for confirmed state changes
+
+Revision ID: f3a9c1d5b7e2
+Revises: c2f8a4d6e9b1
+Create Date: 2026-10-16 14:20:09.412857
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a9c1d5b7e2'
+down_revision: Union[str, Sequence[str], None] = 'c2f8a4d6e9b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('incidents',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('monitor_id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('resolved_at', sa.DateTime(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['monitor_id'], ['monitors.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_incidents_monitor_id_started_at', 'incidents', ['monitor_id', 'started_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_incidents_monitor_id_started_at', table_name='incidents')
+    op.drop_table('incidents')
@@ -0,0 +1,38 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.dashboard import get_dashboard_summary
+from app.core.db import get_db
+
+router = APIRouter(prefix="/dashboard", tags=["dashboard"])
+
+
+class MonitorSummaryResponse(BaseModel):
+    monitor_id: int
+    name: str
+    url: str
+    is_active: bool
+    is_up: bool | None
+    last_checked_at: datetime | None
+    status_code: int | None
+    response_time_ms: int | None
+    checks_24h: int
+    uptime_24h: float | None
+    p95_ms_24h: float | None
+    incident_started_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
+@router.get("/summary", response_model=list[MonitorSummaryResponse])
+async def dashboard_summary(db: AsyncSession = Depends(get_db)):
+    """Everything the dashboard shows for every monitor, from one query.
+
+    p95 is interpolated from the rollup histogram; the SLO endpoints give
+    sketch-accurate percentiles for a single monitor.
+    """
+    return await get_dashboard_summary(db)
@@ -0,0 +1,39 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.export import FORMAT_NDJSON, MEDIA_TYPES, export_results
+from app.models.rollup import naive_utc
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+
+@router.get("/results")
+async def export_check_results(
+    monitor_id: list[int] | None = Query(default=None),
+    from_: datetime | None = Query(default=None, alias="from", description="Oldest check time, inclusive"),
+    to: datetime | None = Query(default=None, description="Newest check time, exclusive"),
+    format: Literal["ndjson", "csv", "arrow"] = FORMAT_NDJSON,
+    gzip: bool = Query(default=False, description="Send the body gzip-encoded"),
+):
+    """Stream check history, ordered by monitor and time, in constant memory.
+
+    Rows are read through a server-side cursor and sent batch by batch;
+    disconnecting stops the query.
+    """
+    # Naive timestamps are taken as UTC, so either bound may carry an offset
+    from_ = naive_utc(from_) if from_ is not None else None
+    to = naive_utc(to) if to is not None else None
+    if from_ is not None and to is not None and from_ >= to:
+        raise HTTPException(status_code=400, detail="from must be before to")
+
+    headers = {"Content-Disposition": f'attachment; filename="check_results.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        export_results(monitor_id, from_, to, format, gzip),
+        media_type=MEDIA_TYPES[format],
+        headers=headers,
+    )
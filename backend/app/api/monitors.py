@@ -1,21 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import select
+from datetime import datetime, timedelta
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.result import CheckResult
-from app.api.schemas import MonitorCreate, MonitorResponse, MonitorUpdate
+from app.api.schemas import (
+    MonitorCreate,
+    MonitorResponse,
+    MonitorUpdate,
+    SeriesPointResponse,
+    SeriesResponse,
+)
+from app.core.cache import slo_cache
 from app.core.db import get_db
 from app.core.security import get_current_user
+from app.core.series import MAX_POINTS, calculate_series
 from app.models.monitor import Monitor
+from app.models.rollup import naive_utc, utc_naive_now
 from app.models.user import User
 
 router = APIRouter(prefix="/monitors", tags=["monitors"])
 
+# Hard ceiling on any page, whatever the client asks for
+MAX_PAGE_SIZE = 500
+
+
+def encode_result_cursor(checked_at: datetime, result_id: int) -> str:
+    return f"{checked_at.isoformat()},{result_id}"
+
+
+def decode_result_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        checked_at, result_id = cursor.rsplit(",", 1)
+        return naive_utc(datetime.fromisoformat(checked_at)), int(result_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
 
 @router.get("", response_model=list[MonitorResponse])
-# TODO: add pagination for large monitor lists
-async def list_monitors(db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Monitor))
-    monitors = result.scalars().all()
+async def list_monitors(
+    response: Response,
+    cursor: int | None = Query(default=None, description="Last monitor id of the previous page"),
+    limit: int = Query(default=MAX_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
+):
+    """Monitors ordered by id.
+
+    When there are more, the next page's cursor is sent in X-Next-Cursor.
+    """
+    query = select(Monitor).order_by(Monitor.id).limit(limit + 1)
+    if cursor is not None:
+        query = query.where(Monitor.id > cursor)
+    monitors = (await db.execute(query)).scalars().all()
+
+    if len(monitors) > limit:
+        monitors = monitors[:limit]
+        response.headers["X-Next-Cursor"] = str(monitors[-1].id)
     return monitors
 
 
@@ -37,6 +77,16 @@ async def create_monitor(
         name=data.name,
         url=str(data.url),
         interval_seconds=data.interval_seconds,
+        probe_mode=data.probe_mode,
+        timeout_seconds=data.timeout_seconds,
+        max_body_bytes=data.max_body_bytes,
+        connection_mode=data.connection_mode,
+        adaptive=data.adaptive,
+        slo_availability_target=data.slo_availability_target,
+        slo_latency_target=data.slo_latency_target,
+        slo_latency_threshold_ms=data.slo_latency_threshold_ms,
+        slo_window_days=data.slo_window_days,
+        slo_calendar_month=data.slo_calendar_month,
     )
     db.add(monitor)
     await db.commit()
@@ -55,6 +105,8 @@ async def update_monitor(
     if not monitor:
         raise HTTPException(status_code=404, detail="Monitor not found")
 
+    # Fields sent as null reset optional settings to their defaults; omitted ones stay
+    changes = data.model_dump(exclude_unset=True)
     if data.name is not None:
         monitor.name = data.name
     if data.url is not None:
@@ -63,27 +115,125 @@ async def update_monitor(
         monitor.interval_seconds = data.interval_seconds
     if data.is_active is not None:
         monitor.is_active = data.is_active
+    if data.probe_mode is not None:
+        monitor.probe_mode = data.probe_mode
+    if data.timeout_seconds is not None:
+        monitor.timeout_seconds = data.timeout_seconds
+    if "max_body_bytes" in changes:
+        monitor.max_body_bytes = changes["max_body_bytes"]
+    if data.connection_mode is not None:
+        monitor.connection_mode = data.connection_mode
+    if data.adaptive is not None:
+        monitor.adaptive = data.adaptive
+    if "slo_availability_target" in changes:
+        monitor.slo_availability_target = changes["slo_availability_target"]
+    if "slo_latency_target" in changes:
+        monitor.slo_latency_target = changes["slo_latency_target"]
+    if "slo_latency_threshold_ms" in changes:
+        # The owning worker recomputes latency_good rollups when it picks this up
+        monitor.slo_latency_threshold_ms = changes["slo_latency_threshold_ms"]
+    if "slo_window_days" in changes:
+        monitor.slo_window_days = changes["slo_window_days"]
+    if data.slo_calendar_month is not None:
+        monitor.slo_calendar_month = data.slo_calendar_month
 
     await db.commit()
     await db.refresh(monitor)
+    # Reports carry the monitor's name and SLO definition
+    await slo_cache.invalidate([monitor_id])
     return monitor
 
 
 @router.get("/{monitor_id}/results")
 async def get_monitor_results(
-    monitor_id: int, limit: int = 20, db: AsyncSession = Depends(get_db)
+    monitor_id: int,
+    response: Response,
+    from_: datetime | None = Query(default=None, alias="from", description="Oldest check time, inclusive"),
+    to: datetime | None = Query(default=None, description="Newest check time, exclusive"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(default=20, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db),
 ):
+    """A monitor's results, newest first, optionally within [from, to).
+
+    Pages by keyset on (checked_at, id), so each page is an index range scan
+    however deep it is. When there are more, the next page's cursor is sent
+    in X-Next-Cursor.
+    """
     monitor = await db.get(Monitor, monitor_id)
     if not monitor:
         raise HTTPException(status_code=404, detail="Monitor not found")
 
-    result = await db.execute(
+    query = (
         select(CheckResult)
         .where(CheckResult.monitor_id == monitor_id)
-        .order_by(CheckResult.checked_at.desc())
-        .limit(limit)
+        .order_by(CheckResult.checked_at.desc(), CheckResult.id.desc())
+        .limit(limit + 1)
+    )
+    if from_ is not None:
+        query = query.where(CheckResult.checked_at >= naive_utc(from_))
+    if to is not None:
+        query = query.where(CheckResult.checked_at < naive_utc(to))
+    if cursor is not None:
+        checked_at, result_id = decode_result_cursor(cursor)
+        # Spelled out rather than a row comparison so the checked_at bound uses the index
+        query = query.where(
+            CheckResult.checked_at <= checked_at,
+            or_(
+                CheckResult.checked_at < checked_at,
+                and_(CheckResult.checked_at == checked_at, CheckResult.id < result_id),
+            ),
+        )
+    results = (await db.execute(query)).scalars().all()
+
+    if len(results) > limit:
+        results = results[:limit]
+        last = results[-1]
+        response.headers["X-Next-Cursor"] = encode_result_cursor(last.checked_at, last.id)
+    return results
+
+
+@router.get("/{monitor_id}/series", response_model=SeriesResponse)
+async def get_monitor_series(
+    monitor_id: int,
+    from_: datetime | None = Query(default=None, alias="from", description="Defaults to 24 hours before to"),
+    to: datetime | None = Query(default=None, description="Defaults to now"),
+    points: int = Query(default=300, ge=1, le=MAX_POINTS),
+    db: AsyncSession = Depends(get_db),
+):
+    """Uptime and latency over [from, to) in about `points` buckets, for charts.
+
+    Read from rollups, so a year costs about the same as an hour.
+    """
+    to = naive_utc(to) if to is not None else utc_naive_now()
+    from_ = naive_utc(from_) if from_ is not None else to - timedelta(hours=24)
+    if from_ >= to:
+        raise HTTPException(status_code=400, detail="from must be before to")
+
+    monitor = await db.get(Monitor, monitor_id)
+    if not monitor:
+        raise HTTPException(status_code=404, detail="Monitor not found")
+
+    series = await calculate_series(db, monitor_id, from_, to, points)
+    return SeriesResponse(
+        monitor_id=monitor_id,
+        since=series.since,
+        until=series.until,
+        resolution_seconds=series.resolution_seconds,
+        bucket_seconds=series.bucket_seconds,
+        points=[
+            SeriesPointResponse(
+                start=b.start,
+                total_checks=b.total,
+                uptime=b.uptime,
+                latency_min_ms=b.latency_min_ms,
+                latency_avg_ms=b.latency_avg_ms,
+                latency_max_ms=b.latency_max_ms,
+                latency_p95_ms=b.latency_p95_ms,
+            )
+            for b in series.buckets
+        ],
     )
-    return result.scalars().all()
 
 
 @router.delete("/{monitor_id}", status_code=204)
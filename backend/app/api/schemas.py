@@ -1,19 +1,48 @@
 from datetime import datetime
+from typing import Literal
 
-from pydantic import BaseModel, HttpUrl
+from pydantic import BaseModel, Field, HttpUrl
+
+from app.core.slo import MAX_WINDOW_DAYS
+
+ProbeMode = Literal["head", "headers", "body"]
+ConnectionMode = Literal["warm", "cold"]
 
 
 class MonitorCreate(BaseModel):
     name: str
     url: HttpUrl
     interval_seconds: int = 60
+    probe_mode: ProbeMode = "headers"
+    timeout_seconds: float = Field(default=30.0, gt=0, le=120)
+    max_body_bytes: int | None = Field(default=None, gt=0)
+    connection_mode: ConnectionMode = "warm"
+    adaptive: bool = False
+    # SLO definition; unset fields use the app-wide defaults
+    slo_availability_target: float | None = Field(default=None, gt=0, lt=1)
+    slo_latency_target: float | None = Field(default=None, gt=0, lt=1)
+    slo_latency_threshold_ms: int | None = Field(default=None, gt=0)
+    slo_window_days: int | None = Field(default=None, ge=1, le=MAX_WINDOW_DAYS)
+    slo_calendar_month: bool = False
 
 
 class MonitorUpdate(BaseModel):
+    """Omitted fields are left alone; null resets max_body_bytes and slo_* to the defaults."""
+
     name: str | None = None
     url: HttpUrl | None = None
     interval_seconds: int | None = None
     is_active: bool | None = None
+    probe_mode: ProbeMode | None = None
+    timeout_seconds: float | None = Field(default=None, gt=0, le=120)
+    max_body_bytes: int | None = Field(default=None, gt=0)
+    connection_mode: ConnectionMode | None = None
+    adaptive: bool | None = None
+    slo_availability_target: float | None = Field(default=None, gt=0, lt=1)
+    slo_latency_target: float | None = Field(default=None, gt=0, lt=1)
+    slo_latency_threshold_ms: int | None = Field(default=None, gt=0)
+    slo_window_days: int | None = Field(default=None, ge=1, le=MAX_WINDOW_DAYS)
+    slo_calendar_month: bool | None = None
 
 
 class LoginRequest(BaseModel):
@@ -37,8 +66,37 @@ class MonitorResponse(BaseModel):
     url: str
     interval_seconds: int
     is_active: bool
+    probe_mode: str
+    timeout_seconds: float
+    max_body_bytes: int | None
+    connection_mode: str
+    adaptive: bool
+    slo_availability_target: float | None
+    slo_latency_target: float | None
+    slo_latency_threshold_ms: int | None
+    slo_window_days: int | None
+    slo_calendar_month: bool
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class SeriesPointResponse(BaseModel):
+    start: datetime
+    total_checks: int
+    uptime: float | None
+    latency_min_ms: float | None
+    latency_avg_ms: float | None
+    latency_max_ms: float | None
+    latency_p95_ms: float | None
+
+
+class SeriesResponse(BaseModel):
+    monitor_id: int
+    since: datetime
+    until: datetime
+    resolution_seconds: int
+    bucket_seconds: int
+    points: list[SeriesPointResponse]
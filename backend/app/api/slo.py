@@ -1,10 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
+from app.core.archive import calculate_uptime
+from app.core.cache import get_cached_slo_reports
 from app.core.db import get_db
-from app.core.slo import get_slo_report, SLO_WINDOW_DAYS, AVAILABILITY_SLO, LATENCY_SLO_MS
+from app.core.sketch import DDSketch
+from app.core.slo import (
+    LatencyPercentiles,
+    SLODefinition,
+    calculate_latency_sketches,
+    SLO_WINDOW_DAYS,
+    MAX_WINDOW_DAYS,
+    AVAILABILITY_SLO,
+    LATENCY_SLO_MS,
+)
 from app.models.monitor import Monitor
+from app.models.rollup import naive_utc, utc_naive_now
 
 
 router = APIRouter(prefix="/slo", tags=["SLO"])
@@ -23,13 +39,65 @@ class SLOStatusResponse(BaseModel):
         from_attributes = True
 
 
+class PhaseBreakdownResponse(BaseModel):
+    window_hours: int
+    dns_ms: float | None
+    connect_ms: float | None
+    tls_ms: float | None
+    ttfb_ms: float | None
+    transfer_ms: float | None
+
+    class Config:
+        from_attributes = True
+
+
+class LatencyPercentilesResponse(BaseModel):
+    count: int
+    p50_ms: float | None
+    p90_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+    class Config:
+        from_attributes = True
+
+
+class MonitorLatencyResponse(LatencyPercentilesResponse):
+    monitor_id: int
+
+
+class LatencyWindowResponse(BaseModel):
+    since: datetime
+    until: datetime
+    fleet: LatencyPercentilesResponse
+    monitors: list[MonitorLatencyResponse]
+
+
+class MonitorUptimeResponse(BaseModel):
+    monitor_id: int
+    total_checks: int
+    up_checks: int
+    uptime: float | None
+
+
+class UptimeWindowResponse(BaseModel):
+    since: datetime
+    until: datetime
+    covered_since: datetime  # Counts start here; later than since if history is missing
+    monitors: list[MonitorUptimeResponse]
+
+
 class SLOReportResponse(BaseModel):
     monitor_id: int
     monitor_name: str
     window_days: int
+    calendar_month: bool
+    latency_threshold_ms: int
     total_checks: int
     availability: SLOStatusResponse
     latency: SLOStatusResponse
+    percentiles: LatencyPercentilesResponse
+    phases: PhaseBreakdownResponse
 
     class Config:
         from_attributes = True
@@ -55,9 +123,115 @@ async def get_slo_config():
     )
 
 
+@router.get("/latency", response_model=LatencyWindowResponse)
+async def get_latency_percentiles(
+    monitor_id: list[int] | None = Query(default=None),
+    since: datetime | None = Query(default=None, description="Defaults to 24 hours before until"),
+    until: datetime | None = Query(default=None, description="Defaults to now"),
+    db: AsyncSession = Depends(get_db),
+):
+    """p50/p90/p95/p99 response times over any window, per monitor and fleet-wide.
+
+    Merges the rollup sketches covering the window; raw results are not read.
+    Without `monitor_id`, covers every monitor with data in the window.
+    """
+    # Naive timestamps are taken as UTC, like stored check times
+    until = naive_utc(until) if until is not None else utc_naive_now()
+    since = naive_utc(since) if since is not None else until - timedelta(hours=24)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+    if until - since > timedelta(days=MAX_WINDOW_DAYS):
+        raise HTTPException(status_code=400, detail=f"Window is limited to {MAX_WINDOW_DAYS} days")
+
+    sketches = await calculate_latency_sketches(db, monitor_id, since, until)
+    fleet = DDSketch()
+    for sketch in sketches.values():
+        fleet.merge(sketch)
+
+    return LatencyWindowResponse(
+        since=since.replace(tzinfo=timezone.utc),
+        until=until.replace(tzinfo=timezone.utc),
+        fleet=LatencyPercentilesResponse.model_validate(LatencyPercentiles.from_sketch(fleet)),
+        monitors=[
+            MonitorLatencyResponse(
+                monitor_id=mid,
+                **asdict(LatencyPercentiles.from_sketch(sketch)),
+            )
+            for mid, sketch in sorted(sketches.items())
+        ],
+    )
+
+
+@router.get("/uptime", response_model=UptimeWindowResponse)
+async def get_uptime(
+    monitor_id: list[int] | None = Query(default=None),
+    since: datetime | None = Query(default=None, description="Defaults to 365 days before until"),
+    until: datetime | None = Query(default=None, description="Defaults to now"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Raw check counts and uptime over any window, e.g. a month or a year.
+
+    Counts every check: archived periods are read from the columnar archive
+    (ARCHIVE_DIR), the rest from check_results while within raw retention,
+    and from day rollups before that.
+    """
+    until = naive_utc(until) if until is not None else utc_naive_now()
+    since = naive_utc(since) if since is not None else until - timedelta(days=365)
+    if since >= until:
+        raise HTTPException(status_code=400, detail="since must be before until")
+
+    counts, covered_since = await calculate_uptime(db, monitor_id, since, until)
+    return UptimeWindowResponse(
+        since=since.replace(tzinfo=timezone.utc),
+        until=until.replace(tzinfo=timezone.utc),
+        covered_since=covered_since.replace(tzinfo=timezone.utc),
+        monitors=[
+            MonitorUptimeResponse(
+                monitor_id=mid, total_checks=c.total, up_checks=c.up, uptime=c.uptime
+            )
+            for mid, c in sorted(counts.items())
+        ],
+    )
+
+
+@router.get("/monitors", response_model=list[SLOReportResponse])
+async def list_monitor_slos(
+    response: Response,
+    monitor_id: list[int] | None = Query(default=None),
+    window_days: int | None = Query(
+        default=None, ge=1, le=MAX_WINDOW_DAYS, description="Defaults to each monitor's own window"
+    ),
+    cursor: int | None = Query(default=None, description="Last monitor id of the previous page"),
+    limit: int = Query(default=100, ge=1, le=500),
+    db: AsyncSession = Depends(get_db),
+):
+    """SLO reports for every monitor, or those in `monitor_id`, ordered by id.
+
+    When there are more, the next page's cursor is sent in X-Next-Cursor.
+    """
+    query = select(Monitor).order_by(Monitor.id).limit(limit + 1)
+    if monitor_id:
+        query = query.where(Monitor.id.in_(monitor_id))
+    if cursor is not None:
+        query = query.where(Monitor.id > cursor)
+    monitors = (await db.execute(query)).scalars().all()
+
+    if len(monitors) > limit:
+        monitors = monitors[:limit]
+        response.headers["X-Next-Cursor"] = str(monitors[-1].id)
+
+    reports = await get_cached_slo_reports(
+        db, [(m.id, m.name, SLODefinition.for_monitor(m)) for m in monitors], window_days
+    )
+    return [SLOReportResponse.model_validate(r, from_attributes=True) for r in reports]
+
+
 @router.get("/monitors/{monitor_id}", response_model=SLOReportResponse)
 async def get_monitor_slo(
     monitor_id: int,
+    window_days: int | None = Query(
+        default=None, ge=1, le=MAX_WINDOW_DAYS, description="Defaults to the monitor's own window"
+    ),
     db: AsyncSession = Depends(get_db),
 ):
 
@@ -65,6 +239,8 @@ async def get_monitor_slo(
     if not monitor:
         raise HTTPException(status_code=404, detail="Monitor not found")
 
-    report = await get_slo_report(db, monitor_id, monitor.name)
+    [report] = await get_cached_slo_reports(
+        db, [(monitor_id, monitor.name, SLODefinition.for_monitor(monitor))], window_days
+    )
 
     return SLOReportResponse.model_validate(report, from_attributes=True)
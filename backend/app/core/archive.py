@@ -0,0 +1,254 @@
+import asyncio
+import os
+import re
+from collections.abc import AsyncIterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+from sqlalchemy import and_, func, or_, select, text
+
+from app.core.config import settings
+from app.models.result import CheckResult
+from app.models.rollup import DAY, CheckRollup, bucket_start, naive_utc
+
+# Archived columns, in file order; the database's types, narrowed where they allow
+SCHEMA = pa.schema(
+    [
+        ("monitor_id", pa.int32()),
+        ("checked_at", pa.timestamp("us")),  # Naive UTC, like check_results
+        ("id", pa.int64()),
+        ("is_up", pa.bool_()),
+        ("status_code", pa.int32()),
+        ("response_time_ms", pa.int32()),
+        ("error_message", pa.string()),
+        ("dns_ms", pa.int16()),
+        ("connect_ms", pa.int16()),
+        ("tls_ms", pa.int16()),
+        ("ttfb_ms", pa.int16()),
+        ("transfer_ms", pa.int16()),
+    ]
+)
+COLUMNS = SCHEMA.names
+
+# Rows fetched per round trip while exporting; also the unit written to the file
+EXPORT_BATCH_ROWS = 50_000
+
+_FILE_RE = re.compile(r"^check_results_(\d{8}T\d{4})_(\d{8}T\d{4})\.parquet$")
+_STAMP = "%Y%m%dT%H%M"
+
+
+def archive_dir() -> Path | None:
+    return Path(settings.archive_dir) if settings.archive_dir else None
+
+
+def file_name(lo: datetime, hi: datetime) -> str:
+    """Archive file for check_results in [lo, hi); the bounds are read back from the name."""
+    return f"check_results_{lo:{_STAMP}}_{hi:{_STAMP}}.parquet"
+
+
+def archived_ranges(directory: Path) -> list[tuple[datetime, datetime, Path]]:
+    """(lo, hi, path) of every complete archive file, oldest first."""
+    if not directory.is_dir():
+        return []
+    ranges = []
+    for path in directory.iterdir():
+        match = _FILE_RE.match(path.name)
+        if match:  # Skips files still being written, which end in .tmp
+            lo, hi = (datetime.strptime(m, _STAMP) for m in match.groups())
+            ranges.append((lo, hi, path))
+    return sorted(ranges)
+
+
+def uncovered(
+    since: datetime, until: datetime, covered: list[tuple[datetime, datetime]]
+) -> list[tuple[datetime, datetime]]:
+    """Parts of [since, until) outside every covered range."""
+    gaps = []
+    cursor = since
+    for lo, hi in sorted(covered):
+        if hi <= cursor or lo >= until:
+            continue
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = max(cursor, hi)
+    if cursor < until:
+        gaps.append((cursor, until))
+    return gaps
+
+
+async def write_archive(path: Path, batches: AsyncIterable[Sequence[tuple]]) -> int:
+    """Write rows (tuples in COLUMNS order) to a Parquet file, replacing it atomically.
+
+    Rows should be sorted by monitor_id then checked_at: row group statistics
+    then let readers skip every group without the monitors they ask for.
+    """
+    tmp = path.with_name(path.name + ".tmp")
+    rows = 0
+    try:
+        with pq.ParquetWriter(tmp, SCHEMA, compression="zstd") as writer:
+            async for batch in batches:
+                table = pa.Table.from_arrays(
+                    [pa.array(c, type=f.type) for c, f in zip(zip(*batch), SCHEMA)], schema=SCHEMA
+                )
+                # Compression is CPU-bound; keep it off the event loop
+                await asyncio.to_thread(
+                    writer.write_table, table, row_group_size=settings.archive_row_group_size
+                )
+                rows += len(batch)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return rows
+
+
+async def export_partition(conn, name: str, lo: datetime, hi: datetime, directory: Path) -> int:
+    """Copy one check_results partition to an archive file through a server-side cursor."""
+    directory.mkdir(parents=True, exist_ok=True)
+    result = await conn.stream(
+        text(f'SELECT {", ".join(COLUMNS)} FROM "{name}" ORDER BY monitor_id, checked_at')
+    )
+    return await write_archive(directory / file_name(lo, hi), result.partitions(EXPORT_BATCH_ROWS))
+
+
+@dataclass
+class UptimeCounts:
+    """Checks and how many were up, for one monitor over one window."""
+    total: int = 0
+    up: int = 0
+
+    @property
+    def uptime(self) -> float | None:
+        return self.up / self.total if self.total else None
+
+
+def archived_uptime(
+    paths: list[Path], monitor_ids: list[int] | None, since: datetime, until: datetime
+) -> dict[int, UptimeCounts]:
+    """Uptime counts per monitor from archive files, reading two columns of them.
+
+    Files are memory-mapped and scanned in parallel; row groups whose
+    statistics rule out the monitors or the window are never decompressed.
+    """
+    if not paths:
+        return {}
+    dataset = ds.dataset(
+        [str(p) for p in paths],
+        schema=SCHEMA,
+        format="parquet",
+        filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True),
+    )
+    condition = (pc.field("checked_at") >= pa.scalar(since, pa.timestamp("us"))) & (
+        pc.field("checked_at") < pa.scalar(until, pa.timestamp("us"))
+    )
+    if monitor_ids is not None:
+        condition &= pc.field("monitor_id").isin(pa.array(monitor_ids, pa.int32()))
+    table = dataset.to_table(columns=["monitor_id", "is_up"], filter=condition)
+    grouped = table.group_by("monitor_id").aggregate([("is_up", "count"), ("is_up", "sum")])
+    return {
+        mid: UptimeCounts(total, up or 0)
+        for mid, total, up in zip(
+            grouped["monitor_id"].to_pylist(),
+            grouped["is_up_count"].to_pylist(),
+            grouped["is_up_sum"].to_pylist(),
+        )
+    }
+
+
+def split_at_raw_horizon(
+    gaps: list[tuple[datetime, datetime]], raw_since: datetime | None
+) -> tuple[list[tuple[datetime, datetime]], list[tuple[datetime, datetime]]]:
+    """(whole days to read from day rollups, ranges to read from check_results).
+
+    Raw rows before `raw_since` may already be dropped, so those parts of the
+    gaps come from day rollups, which are kept forever. A day only partly in a
+    gap can't be counted from its rollup and is left out.
+    """
+    if raw_since is None:
+        return [], gaps
+    days, raw = [], []
+    for lo, hi in gaps:
+        if lo < raw_since:
+            first = bucket_start(lo, DAY)
+            if first < lo:
+                first += timedelta(seconds=DAY)
+            last = bucket_start(min(hi, raw_since), DAY)
+            if first < last:
+                days.append((first, last))
+        if hi > raw_since:
+            raw.append((max(lo, raw_since), hi))
+    return days, raw
+
+
+def _raw_since(now: datetime) -> datetime | None:
+    """From when check_results is certain to still hold every row, or None if it's never pruned."""
+    from app.core.retention import retention_days  # app.core.retention imports this module
+
+    days = retention_days()
+    if days <= 0:
+        return None
+    # The partition holding the cutoff is kept, and partitions start at midnight
+    return bucket_start(now - timedelta(days=days), DAY)
+
+
+def _in_ranges(column, ranges: list[tuple[datetime, datetime]]):
+    return or_(*(and_(column >= lo, column < hi) for lo, hi in ranges))
+
+
+async def calculate_uptime(
+    db, monitor_ids: list[int] | None, since: datetime, until: datetime
+) -> tuple[dict[int, UptimeCounts], datetime]:
+    """Uptime per monitor over any window, and when the counted checks begin.
+
+    Each part of the window is read from exactly one place: archive files
+    where they cover them, check_results within raw retention, and day
+    rollups before it, so a partition that is both archived and not yet
+    dropped is not counted twice. Rollups only count whole days, so a window
+    starting mid-day before raw retention is counted from the next midnight,
+    which is what the returned start reports.
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    directory = archive_dir()
+    archived = [
+        (lo, hi, path)
+        for lo, hi, path in (archived_ranges(directory) if directory else [])
+        if lo < until and hi > since
+    ]
+    counts = await asyncio.to_thread(
+        archived_uptime, [path for _, _, path in archived], monitor_ids, since, until
+    )
+
+    gaps = uncovered(since, until, [(lo, hi) for lo, hi, _ in archived])
+    days, raw = split_at_raw_horizon(gaps, _raw_since(datetime.now(timezone.utc)))
+    queries = []
+    if days:
+        query = select(
+            CheckRollup.monitor_id, func.sum(CheckRollup.total), func.sum(CheckRollup.up)
+        ).where(
+            CheckRollup.bucket_seconds == DAY, _in_ranges(CheckRollup.bucket_start, days)
+        ).group_by(CheckRollup.monitor_id)
+        if monitor_ids is not None:
+            query = query.where(CheckRollup.monitor_id.in_(monitor_ids))
+        queries.append(query)
+    if raw:
+        query = select(
+            CheckResult.monitor_id,
+            func.count(),
+            func.count().filter(CheckResult.is_up),
+        ).where(_in_ranges(CheckResult.checked_at, raw)).group_by(CheckResult.monitor_id)
+        if monitor_ids is not None:
+            query = query.where(CheckResult.monitor_id.in_(monitor_ids))
+        queries.append(query)
+    for query in queries:
+        for monitor_id, total, up in await db.execute(query):
+            entry = counts.setdefault(monitor_id, UptimeCounts())
+            entry.total += total
+            entry.up += up
+
+    starts = [max(lo, since) for lo, _, _ in archived] + [lo for lo, _ in days + raw]
+    return counts, min(starts, default=until)
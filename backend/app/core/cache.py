@@ -0,0 +1,255 @@
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import asdict, replace
+from typing import Protocol
+
+from app.core.config import settings
+from app.core.metrics import updog_slo_cache_total
+from app.core.slo import (
+    LatencyPercentiles,
+    PhaseBreakdown,
+    SLODefinition,
+    SLOReport,
+    SLOStatus,
+    get_slo_reports,
+)
+
+
+class CacheBackend(Protocol):
+    """Store shared by API replicas; only needs strings and counters."""
+
+    async def mget(self, keys: list[str]) -> list[str | None]: ...
+
+    async def set(self, key: str, value: str, ttl: float) -> None: ...
+
+    async def incr(self, keys: list[str]) -> None: ...
+
+
+class MemoryBackend:
+    """In-process CacheBackend, for tests and single-process deployments."""
+
+    def __init__(self):
+        self._values: dict[str, tuple[float | None, str]] = {}
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        now = time.monotonic()
+        values = []
+        for key in keys:
+            entry = self._values.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= now:
+                del self._values[key]
+                entry = None
+            values.append(None if entry is None else entry[1])
+        return values
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        self._values[key] = (time.monotonic() + ttl, value)
+
+    async def incr(self, keys: list[str]) -> None:
+        for key in keys:
+            _, value = self._values.get(key, (None, "0"))
+            self._values[key] = (None, str(int(value) + 1))
+
+
+class RedisBackend:
+    """CacheBackend on Redis, so reports computed by one replica serve them all."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url, decode_responses=True)
+
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        return await self._redis.mget(keys)
+
+    async def set(self, key: str, value: str, ttl: float) -> None:
+        await self._redis.set(key, value, px=int(ttl * 1000))
+
+    async def incr(self, keys: list[str]) -> None:
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+            await pipe.execute()
+
+
+def backend_from_url(url: str | None) -> CacheBackend | None:
+    if not url:
+        return None
+    if url == "memory://":
+        return MemoryBackend()
+    return RedisBackend(url)
+
+
+def _dump_report(report: SLOReport) -> str:
+    return json.dumps(asdict(report))
+
+
+def _load_report(data: str) -> SLOReport:
+    fields = json.loads(data)
+    return SLOReport(
+        **{
+            **fields,
+            "availability": SLOStatus(**fields["availability"]),
+            "latency": SLOStatus(**fields["latency"]),
+            "percentiles": LatencyPercentiles(**fields["percentiles"]),
+            "phases": PhaseBreakdown(**fields["phases"]),
+        }
+    )
+
+
+class SLOReportCache:
+    """LRU of SLO reports with a TTL, invalidated when a monitor gets new results.
+
+    Every monitor has a version that the result writer bumps after each
+    flush. Entries remember the version they were computed at and are only
+    served while it is current, so a report computed while results were
+    landing is never kept. With a shared backend, versions and reports live
+    there too and the local LRU is a first level in front of it.
+
+    Without one, only this process's writer bumps versions, so the cache is
+    used only while `sole_writer` says that writer is the only one: an
+    embedded worker with no peers. Otherwise every lookup computes.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: float,
+        backend: CacheBackend | None = None,
+        sole_writer: Callable[[], bool] | None = None,
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self.sole_writer = sole_writer
+        self._entries: OrderedDict[tuple[int, int | None], tuple[float, int, SLOReport]] = OrderedDict()
+        self._versions: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def enabled(self) -> bool:
+        if not self.max_size:
+            return False
+        if self.backend is not None:
+            return True
+        return self.sole_writer is not None and self.sole_writer()
+
+    def clear(self) -> None:
+        """Drop local entries, e.g. when other writers may have missed invalidating them."""
+        self._entries.clear()
+
+    async def versions(self, monitor_ids: list[int]) -> dict[int, int]:
+        if self.backend is None:
+            return {mid: self._versions.get(mid, 0) for mid in monitor_ids}
+        values = await self.backend.mget([f"slo:version:{mid}" for mid in monitor_ids])
+        return {mid: int(value or 0) for mid, value in zip(monitor_ids, values)}
+
+    async def get_many(
+        self, monitor_ids: list[int], window_days: int | None
+    ) -> tuple[dict[int, SLOReport], dict[int, int]]:
+        """Cached reports that are still current, and every monitor's version.
+
+        window_days is the window that was asked for, None meaning each
+        monitor's own. Pass the versions back to put() so reports are stored
+        against the state they were computed from.
+        """
+        if not self.enabled:
+            return {}, {}
+        versions = await self.versions(monitor_ids)
+        now = time.monotonic()
+        found: dict[int, SLOReport] = {}
+        for mid in monitor_ids:
+            entry = self._entries.get((mid, window_days))
+            if entry is None:
+                continue
+            expires, version, report = entry
+            if expires <= now or version != versions[mid]:
+                del self._entries[(mid, window_days)]
+                continue
+            self._entries.move_to_end((mid, window_days))
+            found[mid] = report
+
+        missing = [mid for mid in monitor_ids if mid not in found]
+        if missing and self.backend is not None:
+            values = await self.backend.mget(
+                [f"slo:report:{mid}:{window_days}:{versions[mid]}" for mid in missing]
+            )
+            for mid, data in zip(missing, values):
+                if data is not None:
+                    found[mid] = _load_report(data)
+                    self._store(mid, window_days, versions[mid], found[mid])
+
+        updog_slo_cache_total.labels(result="hit").inc(len(found))
+        updog_slo_cache_total.labels(result="miss").inc(len(monitor_ids) - len(found))
+        return found, versions
+
+    def _store(self, monitor_id: int, window_days: int | None, version: int, report: SLOReport) -> None:
+        key = (monitor_id, window_days)
+        self._entries[key] = (time.monotonic() + self.ttl, version, report)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def put(
+        self, reports: list[SLOReport], versions: dict[int, int], window_days: int | None
+    ) -> None:
+        if not self.enabled:
+            return
+        for report in reports:
+            version = versions[report.monitor_id]
+            self._store(report.monitor_id, window_days, version, report)
+            if self.backend is not None:
+                await self.backend.set(
+                    f"slo:report:{report.monitor_id}:{window_days}:{version}",
+                    _dump_report(report),
+                    self.ttl,
+                )
+
+    async def invalidate(self, monitor_ids) -> None:
+        """Mark every cached report of these monitors stale."""
+        monitor_ids = list(monitor_ids)
+        for mid in monitor_ids:
+            self._versions[mid] = self._versions.get(mid, 0) + 1
+        if self.backend is not None and monitor_ids:
+            await self.backend.incr([f"slo:version:{mid}" for mid in monitor_ids])
+
+
+slo_cache = SLOReportCache(
+    max_size=settings.slo_cache_size,
+    ttl=settings.slo_cache_ttl_seconds,
+    backend=backend_from_url(settings.slo_cache_url),
+)
+
+
+async def get_cached_slo_reports(
+    db, monitors: list[tuple[int, str, SLODefinition]], window_days: int | None = None
+) -> list[SLOReport]:
+    """get_slo_reports, computing only the reports the cache can't serve.
+
+    window_days overrides every monitor's own window with a rolling one. A
+    failing shared backend degrades to computing everything.
+    """
+    if window_days is not None:
+        monitors = [
+            (mid, name, replace(definition, window_days=window_days, calendar_month=False))
+            for mid, name, definition in monitors
+        ]
+    monitor_ids = [monitor_id for monitor_id, _, _ in monitors]
+    try:
+        found, versions = await slo_cache.get_many(monitor_ids, window_days)
+    except Exception as e:
+        print(f"SLO cache unavailable: {e}")
+        found, versions = {}, None
+
+    computed = await get_slo_reports(db, [m for m in monitors if m[0] not in found])
+    if versions:
+        try:
+            await slo_cache.put(computed, versions, window_days)
+        except Exception as e:
+            print(f"Failed to cache SLO reports: {e}")
+    found.update((report.monitor_id, report) for report in computed)
+    return [found[monitor_id] for monitor_id in monitor_ids]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+from app.core.metrics import (
+    updog_compacted_rows_total,
+    updog_compaction_bytes_reclaimed_total,
+    updog_compaction_rows_per_second,
+)
+from app.models.rollup import HOUR, MINUTE, RESOLUTIONS, CheckRollup, naive_utc
+
+ROLLUPS = CheckRollup.__tablename__
+
+# Rollup tiers that age out; day rollups are kept forever
+TIER_NAMES = {MINUTE: "minute", HOUR: "hour"}
+
+# One batch: pick rows by physical location through the (bucket_seconds,
+# bucket_start) index and delete just those, so each transaction holds row
+# locks on at most :batch rows and never blocks the writer for long
+_DELETE_BATCH_SQL = (
+    f"WITH gone AS ("
+    f"DELETE FROM {ROLLUPS} WHERE ctid = ANY(ARRAY("
+    f"SELECT ctid FROM {ROLLUPS} "
+    f"WHERE bucket_seconds = :seconds AND bucket_start < :cutoff LIMIT :batch"
+    f")) RETURNING pg_column_size({ROLLUPS}.*) AS size"
+    f") SELECT count(*), coalesce(sum(size), 0) FROM gone"
+)
+
+
+@dataclass
+class CompactionStats:
+    """What one compaction pass over a tier removed."""
+    tier: str
+    rows: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def record(self) -> None:
+        updog_compacted_rows_total.labels(tier=self.tier).inc(self.rows)
+        updog_compaction_bytes_reclaimed_total.labels(tier=self.tier).inc(self.bytes)
+        updog_compaction_rows_per_second.labels(tier=self.tier).set(self.rows_per_second)
+        if self.rows:
+            print(
+                f"Compacted {self.rows} {self.tier} rows ({self.bytes / 1024 / 1024:.1f} MiB) "
+                f"in {self.seconds:.1f}s, {self.rows_per_second:.0f} rows/s"
+            )
+
+
+def rollup_cutoffs(now: datetime) -> list[tuple[int, datetime]]:
+    """(bucket_seconds, cutoff) for each rollup tier with a retention, naive UTC."""
+    days = {
+        MINUTE: settings.rollup_minute_retention_days,
+        HOUR: settings.rollup_hour_retention_days,
+    }
+    now = naive_utc(now)
+    return [(seconds, now - timedelta(days=d)) for seconds, d in days.items() if d > 0]
+
+
+def retained_resolutions(until: datetime, now: datetime) -> tuple[int, ...]:
+    """Rollup resolutions still kept for some of the time before `until` (naive UTC)."""
+    cutoffs = dict(rollup_cutoffs(now))
+    return tuple(s for s in RESOLUTIONS if s not in cutoffs or until > cutoffs[s])
+
+
+async def delete_rollups_before(
+    seconds: int,
+    cutoff: datetime,
+    batch_size: int | None = None,
+    pause: float | None = None,
+) -> CompactionStats:
+    """Delete rollups of one resolution that start before `cutoff`, in batches.
+
+    Each batch commits on its own and is followed by a pause, so live writes
+    and vacuum keep up; the space is reused after autovacuum, not returned
+    to the OS, and `bytes` counts the tuples freed.
+    """
+    batch_size = batch_size or settings.compaction_batch_size
+    pause = settings.compaction_pause_seconds if pause is None else pause
+    stats = CompactionStats(TIER_NAMES[seconds])
+    start = time.monotonic()
+    while True:
+        async with engine.begin() as conn:
+            if conn.dialect.name != "postgresql":
+                break
+            result = await conn.execute(
+                text(_DELETE_BATCH_SQL),
+                {"seconds": seconds, "cutoff": cutoff, "batch": batch_size},
+            )
+            rows, size = result.one()
+        stats.rows += rows
+        stats.bytes += size
+        if rows < batch_size:
+            break
+        await asyncio.sleep(pause)
+    # Pauses count: the rate is what the job sustains, not the database's peak
+    stats.seconds = time.monotonic() - start
+    return stats
+
+
+async def compact_rollups(now: datetime | None = None) -> list[CompactionStats]:
+    """Age minute rollups out, then hour rollups, per their retention settings."""
+    now = now or datetime.now(timezone.utc)
+    results = []
+    for seconds, cutoff in rollup_cutoffs(now):
+        stats = await delete_rollups_before(seconds, cutoff)
+        stats.record()
+        results.append(stats)
+    return results
+
+
+async def run_compaction() -> None:
+    """Housekeeping job: apply the rollup tiers' retention."""
+    try:
+        await compact_rollups()
+    except Exception as e:
+        print(f"Failed to compact rollups: {e}")
@@ -19,6 +19,68 @@ class Settings(BaseSettings):
     # Port for the server (Railway sets this via PORT env var)
     port: int = 8000
 
+    # Check scheduling: each monitor runs on its own interval_seconds
+    min_check_interval_seconds: int = 10
+    scheduler_sync_seconds: int = 30  # How often to pick up monitor changes
+    adaptive_interval_seconds: int = 10  # Interval of adaptive monitors while failing
+    adaptive_stable_checks: int = 5  # Consecutive UP checks before relaxing again
+    max_checks_per_second: float = 0  # Fleet-wide ceiling on check starts, split across workers; 0 = unlimited
+    check_timeout_seconds: float = 30.0  # Used when a monitor has no timeout of its own
+    check_max_body_bytes: int = 64 * 1024  # Used by "body" probes without max_body_bytes
+    check_drain_bytes: int = 64 * 1024  # Warm probes read the rest of bodies up to this Content-Length, to reuse the connection
+    check_keepalive_seconds: float = 120.0  # Keep pooled connections across sweeps
+    check_http2: bool = False  # Multiplex checks to shared hosts (needs h2)
+    dns_cache_ttl_seconds: float = 60.0  # Ceiling on record TTLs; used as is when a TTL is unknown
+    check_max_concurrency: int = 500  # Checks in flight across all targets
+    check_per_host_concurrency: int = 10  # Checks in flight against one host
+
+    # Worker: run it inside the API process, or separately via `python -m app.worker`
+    run_worker_in_api: bool = True
+    worker_metrics_port: int = 9101  # Standalone worker's /metrics port
+    worker_drain_timeout_seconds: float = 30.0
+
+    # Sharding checks across worker processes and nodes
+    coordination_enabled: bool = True
+    worker_id: str | None = None  # Defaults to hostname-pid-random
+    lease_ttl_seconds: int = 30
+    lease_heartbeat_seconds: int = 10
+    coordination_vnodes: int = 64
+
+    # Bulk result writer
+    result_batch_size: int = 5000
+    result_flush_interval_seconds: float = 1.0
+    result_max_buffer: int = 200_000  # Oldest results dropped beyond this if the DB is down
+
+    # Re-check a monitor right away before believing it changed state
+    confirm_retries: int = 2  # 0 alerts on the first differing result
+    confirm_backoff_seconds: float = 1.0  # Doubles after each re-check
+
+    # Multi-window burn-rate alerts on the availability and latency SLOs
+    burn_rate_alerts_enabled: bool = True
+    burn_rate_eval_seconds: int = 60
+
+    # SLO report cache. SLO_CACHE_URL (redis://...) shares it across API replicas and lets a
+    # standalone worker invalidate it; otherwise only the TTL bounds staleness there
+    slo_cache_size: int = 10_000  # Reports kept per process, 0 disables caching
+    slo_cache_ttl_seconds: float = 60.0
+    slo_cache_url: str | None = None
+
+    # check_results partitions and retention (demo mode uses demo_retention_days)
+    result_partition_period: str = "day"  # "day" or "week"
+    result_partitions_ahead: int = 7  # Periods created ahead of time
+    result_retention_days: int = 90  # 0 keeps results forever
+
+    # Tiered retention past raw results: minute rollups, then hourly, then daily forever
+    rollup_minute_retention_days: int = 120  # 0 keeps them forever
+    rollup_hour_retention_days: int = 400
+    compaction_batch_size: int = 5000  # Rows deleted per transaction
+    compaction_pause_seconds: float = 0.2  # Between batches, to leave room for live traffic
+
+    # Columnar archive of closed check_results partitions, read back for long-range uptime.
+    # The worker leader writes it and the API reads it, so both need the same directory
+    archive_dir: str | None = None  # Unset disables archiving
+    archive_row_group_size: int = 128 * 1024  # Rows per Parquet row group
+
     demo_mode: bool = False
     demo_retention_days: int = 7
 
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, true
+
+from app.core.rollups import in_window
+from app.core.sketch import DDSketch
+from app.models.incident import Incident
+from app.models.monitor import Monitor
+from app.models.result import CheckResult
+from app.models.rollup import CheckRollup, naive_utc, utc_naive_now
+
+SUMMARY_WINDOW = timedelta(hours=24)
+
+
+@dataclass(slots=True)
+class MonitorSummary:
+    monitor_id: int
+    name: str
+    url: str
+    is_active: bool
+    is_up: bool | None  # None without a check in the window
+    last_checked_at: datetime | None
+    status_code: int | None
+    response_time_ms: int | None
+    checks_24h: int
+    uptime_24h: float | None
+    p95_ms_24h: float | None
+    incident_started_at: datetime | None  # Start of the open incident, if any
+
+
+async def get_dashboard_summary(db, now: datetime | None = None) -> list[MonitorSummary]:
+    """Status, 24h uptime and p95, and open incident of every monitor, in one query.
+
+    Counts come from rollups and the last result from a lateral lookup
+    bounded to the window, so partitions outside it are never touched. The
+    p95 merges the window's rollup sketches, like the SLO percentiles.
+    """
+    now = naive_utc(now) if now is not None else utc_naive_now()
+    since = now - SUMMARY_WINDOW
+
+    stats = (
+        select(
+            CheckRollup.monitor_id,
+            func.sum(CheckRollup.total).label("total"),
+            func.sum(CheckRollup.up).label("up"),
+            func.array_agg(CheckRollup.latency_sketch)
+            .filter(CheckRollup.latency_sketch.is_not(None))
+            .label("sketches"),
+        )
+        .where(in_window(since, now))
+        .group_by(CheckRollup.monitor_id)
+        .subquery()
+    )
+    incidents = (
+        select(Incident.monitor_id, func.min(Incident.started_at).label("started_at"))
+        .where(Incident.resolved_at.is_(None))
+        .group_by(Incident.monitor_id)
+        .subquery()
+    )
+    latest = (
+        select(
+            CheckResult.is_up,
+            CheckResult.checked_at,
+            CheckResult.status_code,
+            CheckResult.response_time_ms,
+        )
+        .where(CheckResult.monitor_id == Monitor.id, CheckResult.checked_at >= since)
+        .order_by(CheckResult.checked_at.desc())
+        .limit(1)
+        .lateral()
+    )
+
+    rows = await db.execute(
+        select(
+            Monitor.id,
+            Monitor.name,
+            Monitor.url,
+            Monitor.is_active,
+            latest.c.is_up,
+            latest.c.checked_at,
+            latest.c.status_code,
+            latest.c.response_time_ms,
+            stats.c.total,
+            stats.c.up,
+            stats.c.sketches,
+            incidents.c.started_at,
+        )
+        .select_from(Monitor)
+        .outerjoin(latest, true())
+        .outerjoin(stats, stats.c.monitor_id == Monitor.id)
+        .outerjoin(incidents, incidents.c.monitor_id == Monitor.id)
+        .order_by(Monitor.id)
+    )
+
+    summaries = []
+    for (
+        monitor_id, name, url, is_active, is_up, checked_at, status_code, response_time_ms,
+        total, up, sketches, incident_started_at,
+    ) in rows:
+        total = total or 0
+        sketch = DDSketch()
+        for data in sketches or ():
+            sketch.merge(DDSketch.from_bytes(data))
+        summaries.append(
+            MonitorSummary(
+                monitor_id=monitor_id,
+                name=name,
+                url=url,
+                is_active=is_active,
+                is_up=is_up,
+                last_checked_at=checked_at,
+                status_code=status_code,
+                response_time_ms=response_time_ms,
+                checks_24h=total,
+                uptime_24h=up / total if total else None,
+                p95_ms_24h=sketch.quantile(0.95),
+                incident_started_at=incident_started_at,
+            )
+        )
+    return summaries
@@ -1,10 +1,11 @@
 import random
 from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select, delete
+from sqlalchemy import select
 
-from app.core.config import settings
 from app.core.db import async_session
+from app.core.retention import ensure_partitions
+from app.core.rollups import backfill_rollups
 from app.models.monitor import Monitor
 from app.models.result import CheckResult
 
@@ -118,6 +119,7 @@ async def seed_demo_data() -> bool:
 
         print(f"Demo mode: Generating {DAYS_OF_HISTORY} days of historical data...")
         now = datetime.now(timezone.utc)
+        await ensure_partitions(since=now - timedelta(days=DAYS_OF_HISTORY))
 
         for monitor in monitors:
             results = []
@@ -142,24 +144,8 @@ async def seed_demo_data() -> bool:
             await db.commit()
             print(f"  ✓ {monitor.name}: {len(results)} historical checks")
 
+        await backfill_rollups(since=now - timedelta(days=DAYS_OF_HISTORY), until=now)
+
         print("Demo mode: Seeding complete!")
         return True
 
-
-async def cleanup_old_data() -> int:
-    if not settings.demo_mode:
-        return 0
-
-    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.demo_retention_days)
-
-    async with async_session() as db:
-        result = await db.execute(
-            delete(CheckResult).where(CheckResult.checked_at < cutoff)
-        )
-        await db.commit()
-
-        deleted = result.rowcount
-        if deleted > 0:
-            print(f"Demo mode: Cleaned up {deleted} old check results")
-
-        return deleted
@@ -0,0 +1,173 @@
+import asyncio
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from datetime import datetime
+
+import pyarrow as pa
+from sqlalchemy import select
+
+from app.core.archive import COLUMNS, SCHEMA
+from app.core.db import engine
+from app.models.result import CheckResult
+from app.models.rollup import naive_utc
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_CSV = "csv"
+FORMAT_ARROW = "arrow"
+
+MEDIA_TYPES = {
+    FORMAT_NDJSON: "application/x-ndjson",
+    FORMAT_CSV: "text/csv",
+    FORMAT_ARROW: "application/vnd.apache.arrow.stream",
+}
+
+# Rows per server-side cursor fetch; memory use is bounded by one batch
+EXPORT_BATCH_ROWS = 10_000
+
+
+class NDJSONEncoder:
+    """One JSON object per line, keyed by column."""
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, batch: Sequence[tuple]) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(COLUMNS, row)), default=datetime.isoformat) + "\n" for row in batch
+        ).encode()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CSVEncoder:
+    """CSV with a header row; None becomes an empty field."""
+
+    def __init__(self):
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out)
+
+    def _drain(self) -> bytes:
+        data = self._out.getvalue().encode()
+        self._out.seek(0)
+        self._out.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self._writer.writerow(COLUMNS)
+        return self._drain()
+
+    def encode(self, batch: Sequence[tuple]) -> bytes:
+        self._writer.writerows(batch)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _Chunks:
+    """Write-only file collecting what Arrow's stream writer emits, drained after each batch."""
+
+    closed = False
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ArrowEncoder:
+    """Arrow IPC stream: the schema, then a record batch per batch of rows."""
+
+    def __init__(self):
+        self._sink = _Chunks()
+        self._writer = None
+
+    def header(self) -> bytes:
+        self._writer = pa.ipc.new_stream(pa.PythonFile(self._sink, mode="w"), SCHEMA)
+        return self._sink.drain()
+
+    def encode(self, batch: Sequence[tuple]) -> bytes:
+        self._writer.write_batch(
+            pa.RecordBatch.from_arrays(
+                [pa.array(c, type=f.type) for c, f in zip(zip(*batch), SCHEMA)], schema=SCHEMA
+            )
+        )
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()  # Writes the end-of-stream marker
+        return self._sink.drain()
+
+
+ENCODERS = {FORMAT_NDJSON: NDJSONEncoder, FORMAT_CSV: CSVEncoder, FORMAT_ARROW: ArrowEncoder}
+
+
+async def encode(
+    batches: AsyncIterator[Sequence[tuple]], fmt: str, gzip: bool = False
+) -> AsyncIterator[bytes]:
+    """Turn batches of rows (COLUMNS order) into chunks of `fmt`, optionally gzipped.
+
+    Each batch is encoded and sent as soon as it arrives, so only one is
+    ever held.
+    """
+    encoder = ENCODERS[fmt]()
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # 31: gzip container
+
+    def out(data: bytes) -> bytes:
+        return compressor.compress(data) if compressor else data
+
+    if data := out(encoder.header()):
+        yield data
+    async for batch in batches:
+        # Encoding a batch is CPU-bound; keep it off the event loop
+        if data := out(await asyncio.to_thread(encoder.encode, batch)):
+            yield data
+    if data := out(encoder.finish()):
+        yield data
+    if compressor:
+        yield compressor.flush()
+
+
+async def export_results(
+    monitor_ids: list[int] | None,
+    since: datetime | None,
+    until: datetime | None,
+    fmt: str,
+    gzip: bool = False,
+) -> AsyncIterator[bytes]:
+    """Stream check results in `fmt`, ordered by monitor and time.
+
+    Reads through a server-side cursor on its own connection, so memory stays
+    at one batch whatever the export's size. Closing the generator (e.g. the
+    client went away) closes the cursor and stops the query.
+    """
+    query = (
+        select(*(getattr(CheckResult, c) for c in COLUMNS))
+        .order_by(CheckResult.monitor_id, CheckResult.checked_at)
+        .execution_options(yield_per=EXPORT_BATCH_ROWS)
+    )
+    if monitor_ids:
+        query = query.where(CheckResult.monitor_id.in_(monitor_ids))
+    if since is not None:
+        query = query.where(CheckResult.checked_at >= naive_utc(since))
+    if until is not None:
+        query = query.where(CheckResult.checked_at < naive_utc(until))
+
+    async with engine.connect() as conn:
+        result = await conn.stream(query)
+        async for data in encode(result.partitions(), fmt, gzip):
+            yield data
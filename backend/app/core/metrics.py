@@ -34,5 +34,118 @@ updog_last_check_up = Gauge(
 updog_alerts_total = Counter(
     "updog_alerts_total",
     "Total alerts sent",
-    ["alert_type"],  # "down" or "recovered"
+    ["alert_type"],  # "down", "recovered", "slo_page", "slo_ticket" or "slo_resolved"
+)
+
+updog_scheduler_lag_seconds = Histogram(
+    "updog_scheduler_lag_seconds",
+    "Delay between a check's scheduled time and its dispatch",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 15.0, 60.0],
+)
+
+updog_scheduler_due_queue_depth = Gauge(
+    "updog_scheduler_due_queue_depth",
+    "Checks that have come due and not finished yet, whether waiting to start or running",
+)
+
+updog_scheduler_tightened_monitors = Gauge(
+    "updog_scheduler_tightened_monitors",
+    "Adaptive monitors currently checked at the failing interval",
+)
+
+updog_checks_queued = Gauge(
+    "updog_checks_queued",
+    "Checks waiting for a concurrency slot",
+)
+
+updog_check_queue_seconds = Histogram(
+    "updog_check_queue_seconds",
+    "Time checks spent waiting for a concurrency slot before sending",
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 15.0, 60.0],
+)
+
+updog_results_written_total = Counter(
+    "updog_results_written_total",
+    "Check results written to the database by the bulk writer",
+)
+
+updog_result_flush_seconds = Histogram(
+    "updog_result_flush_seconds",
+    "Time taken to write one batch of check results",
+    buckets=[0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0],
+)
+
+updog_rollups_written_total = Counter(
+    "updog_rollups_written_total",
+    "Rollup bucket upserts written by the worker",
+)
+
+updog_worker_members = Gauge(
+    "updog_worker_members",
+    "Live check workers sharing the monitor ring",
+)
+
+updog_worker_owned_monitors = Gauge(
+    "updog_worker_owned_monitors",
+    "Active monitors scheduled by this worker",
+)
+
+updog_dns_cache_total = Counter(
+    "updog_dns_cache_total",
+    "DNS lookups made by warm checks, by cache result",
+    ["result"],  # "hit" or "miss"
+)
+
+updog_check_phase_seconds = Histogram(
+    "updog_check_phase_seconds",
+    "Time spent in each phase of a check",
+    ["phase"],  # dns, connect, tls, ttfb, transfer
+    buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+updog_state_changes_total = Counter(
+    "updog_state_changes_total",
+    "Up/down transitions seen by a sweep, by whether re-checks confirmed them",
+    ["result"],  # "confirmed" or "rejected"
+)
+
+updog_slo_burn_alerts_firing = Gauge(
+    "updog_slo_burn_alerts_firing",
+    "Monitor SLIs currently burning error budget past an alert rule",
+    ["severity"],  # "page" or "ticket"
+)
+
+updog_slo_burn_eval_seconds = Histogram(
+    "updog_slo_burn_eval_seconds",
+    "Time taken to evaluate burn-rate rules for every tracked monitor",
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+updog_slo_cache_total = Counter(
+    "updog_slo_cache_total",
+    "SLO report lookups, by whether the cache could serve them",
+    ["result"],  # "hit" or "miss"
+)
+
+updog_compacted_rows_total = Counter(
+    "updog_compacted_rows_total",
+    "Rows removed by tiered retention, by tier",
+    ["tier"],  # "raw", "minute" or "hour"
+)
+
+updog_compaction_bytes_reclaimed_total = Counter(
+    "updog_compaction_bytes_reclaimed_total",
+    "Bytes freed by tiered retention: dropped partitions, or deleted tuples awaiting vacuum",
+    ["tier"],
+)
+
+updog_compaction_rows_per_second = Gauge(
+    "updog_compaction_rows_per_second",
+    "Rows removed per second by the last compaction run of each tier",
+    ["tier"],
+)
+
+updog_archived_rows_total = Counter(
+    "updog_archived_rows_total",
+    "check_results rows copied to the columnar archive",
 )
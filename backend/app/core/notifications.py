@@ -65,3 +65,66 @@ async def send_discord_alert(
     except Exception as e:
         print(f"Failed to send Discord alert: {e}")
         return False
+
+
+async def send_slo_burn_alert(
+    monitor_name: str,
+    url: str,
+    sli: str,
+    severity: str | None,
+    burn_rate: float,
+    window: str,
+) -> bool:
+    """Alert that a monitor is burning error budget; severity None means it stopped."""
+
+    if not settings.discord_webhook_url:
+        return False
+
+    if severity is None:
+        color = 3066993  # Green
+        status = "✅ SLO BURN RESOLVED"
+        description = f"**{monitor_name}** {sli} is back within its error budget."
+    elif severity == "page":
+        color = 15158332  # Red
+        status = "🔥 SLO BURN - PAGE"
+        description = f"**{monitor_name}** is burning its {sli} error budget fast!"
+    else:
+        color = 15105570  # Orange
+        status = "⚠️ SLO BURN - TICKET"
+        description = f"**{monitor_name}** is steadily burning its {sli} error budget."
+
+    embed = {
+        "title": status,
+        "description": description,
+        "color": color,
+        "fields": [
+            {"name": "URL", "value": url, "inline": True},
+        ],
+    }
+
+    if severity is not None:
+        embed["fields"].append({
+            "name": "Burn Rate",
+            "value": f"{burn_rate:.1f}x over {window}",
+            "inline": True,
+        })
+
+    payload = {
+        "username": "UpDog Monitor",
+        "embeds": [embed],
+    }
+
+    try:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(
+                settings.discord_webhook_url,
+                json=payload,
+            )
+            if response.status_code == 204:
+                alert_type = f"slo_{severity or 'resolved'}"
+                updog_alerts_total.labels(alert_type=alert_type).inc()
+                return True
+            return False
+    except Exception as e:
+        print(f"Failed to send Discord alert: {e}")
+        return False
@@ -0,0 +1,268 @@
+import re
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from app.core.archive import archive_dir, archived_ranges, export_partition
+from app.core.compaction import CompactionStats, retained_resolutions
+from app.core.config import settings
+from app.core.db import engine
+from app.core.metrics import updog_archived_rows_total
+from app.core.rollups import backfill_rollups
+from app.models.result import CheckResult
+from app.models.rollup import DAY, naive_utc, utc_naive_now
+
+PARENT = CheckResult.__tablename__
+
+PERIOD_DAY = "day"
+PERIOD_WEEK = "week"
+PERIOD_STEPS = {PERIOD_DAY: timedelta(days=1), PERIOD_WEEK: timedelta(weeks=1)}
+
+_BOUND_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+_PARTITION_RE = re.compile(rf"^{PARENT}_p(\d{{8}})$")
+
+
+def period_start(at: datetime, period: str) -> datetime:
+    """Start of the day, or Monday of the week, containing `at`."""
+    start = at.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == PERIOD_WEEK:
+        start -= timedelta(days=start.weekday())
+    return start
+
+
+def partition_name(start: datetime) -> str:
+    return f"{PARENT}_p{start:%Y%m%d}"
+
+
+def partition_start(name: str) -> datetime | None:
+    """Lower bound encoded in a partition's name, for tables that have lost their bound."""
+    match = _PARTITION_RE.match(name)
+    return datetime.strptime(match[1], "%Y%m%d") if match else None
+
+
+def missing_ranges(
+    start: datetime,
+    end: datetime,
+    existing: list[tuple[datetime, datetime]],
+    period: str,
+) -> list[tuple[datetime, datetime]]:
+    """Partition bounds needed to cover [start, end) around the existing partitions.
+
+    New partitions follow the period grid; where existing ones were cut on a
+    different grid (the period was changed), only the gaps are filled.
+    """
+    step = PERIOD_STEPS[period]
+    existing = sorted(existing)
+    ranges = []
+    lo = period_start(start, period)
+    while lo < end:
+        hi = lo + step
+        cursor = lo
+        for taken_lo, taken_hi in existing:
+            if taken_hi <= cursor or taken_lo >= hi:
+                continue
+            if taken_lo > cursor:
+                ranges.append((cursor, taken_lo))
+            cursor = max(cursor, taken_hi)
+        if cursor < hi:
+            ranges.append((cursor, hi))
+        lo = hi
+    return ranges
+
+
+def retention_days() -> int:
+    return settings.demo_retention_days if settings.demo_mode else settings.result_retention_days
+
+
+async def _partitions(conn) -> list[tuple[str, datetime, datetime]]:
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass)"
+        ),
+        {"parent": PARENT},
+    )
+    partitions = []
+    for name, bound in rows:
+        match = _BOUND_RE.search(bound or "")
+        if match:  # Skips a DEFAULT partition if someone added one
+            partitions.append(
+                (name, datetime.fromisoformat(match[1]), datetime.fromisoformat(match[2]))
+            )
+    return partitions
+
+
+async def _detach_pending(conn) -> set[str]:
+    """Partitions left mid-way through DETACH ... CONCURRENTLY, e.g. by a killed worker."""
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:parent AS regclass) AND i.inhdetachpending"
+        ),
+        {"parent": PARENT},
+    )
+    return {name for (name,) in rows}
+
+
+async def _orphans(conn) -> list[tuple[str, datetime]]:
+    """(name, lower bound) of partition tables already detached but never dropped."""
+    rows = await conn.execute(
+        text(
+            "SELECT c.relname FROM pg_class c "
+            "WHERE c.relkind = 'r' AND c.relname LIKE :pattern AND pg_table_is_visible(c.oid) "
+            "AND NOT EXISTS (SELECT 1 FROM pg_inherits i WHERE i.inhrelid = c.oid)"
+        ),
+        {"pattern": f"{PARENT}\\_p%"},
+    )
+    return [(name, start) for (name,) in rows if (start := partition_start(name)) is not None]
+
+
+async def ensure_partitions(since: datetime | None = None) -> int:
+    """Create partitions from `since` (default now) to RESULT_PARTITIONS_AHEAD periods ahead."""
+    period = settings.result_partition_period
+    now = utc_naive_now()
+    if since is not None:
+        since = naive_utc(since)
+    end = period_start(now, period) + PERIOD_STEPS[period] * (settings.result_partitions_ahead + 1)
+
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return 0
+        existing = [(lo, hi) for _, lo, hi in await _partitions(conn)]
+        ranges = missing_ranges(since or now, end, existing, period)
+        for lo, hi in ranges:
+            await conn.execute(
+                text(
+                    f'CREATE TABLE "{partition_name(lo)}" PARTITION OF {PARENT} '
+                    f"FOR VALUES FROM ('{lo.isoformat(sep=' ')}') TO ('{hi.isoformat(sep=' ')}')"
+                )
+            )
+    if ranges:
+        print(f"Created {len(ranges)} check_results partitions")
+    return len(ranges)
+
+
+async def archive_closed_partitions() -> int:
+    """Copy every closed partition that isn't archived yet to ARCHIVE_DIR.
+
+    A partition is closed once its range is an hour past, so results still
+    buffered by the writer have landed.
+    """
+    directory = archive_dir()
+    if directory is None:
+        return 0
+    closed_before = utc_naive_now() - timedelta(hours=1)
+    done = {(lo, hi) for lo, hi, _ in archived_ranges(directory)}
+
+    archived = 0
+    async with engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            return 0
+        for name, lo, hi in await _partitions(conn):
+            if hi > closed_before or (lo, hi) in done:
+                continue
+            rows = await export_partition(conn, name, lo, hi, directory)
+            # Each partition's cursor gets its own transaction
+            await conn.commit()
+            updog_archived_rows_total.inc(rows)
+            print(f"Archived {rows} rows of {name}")
+            archived += 1
+    return archived
+
+
+async def _rolled_up(conn, lo: datetime, hi: datetime) -> int:
+    """Results counted by day rollups in [lo, hi), to check a partition against."""
+    return await conn.scalar(
+        text(
+            "SELECT coalesce(sum(total), 0) FROM check_rollups "
+            "WHERE bucket_seconds = :seconds AND bucket_start >= :lo AND bucket_start < :hi"
+        ),
+        {"seconds": DAY, "lo": lo, "hi": hi},
+    )
+
+
+async def drop_expired_partitions() -> CompactionStats:
+    """Detach and drop partitions whose every row is older than the retention window.
+
+    Raw rows are the first tier of retention: before a partition goes, its
+    rollups are checked against it and rebuilt if any results never made it
+    into them, so the history outlives the raw rows. With ARCHIVE_DIR set,
+    partitions are also kept until they have been archived.
+
+    A drop interrupted part way is finished on the next run: a partition
+    still pending detach is detached with FINALIZE and dropped, as is a
+    detached partition table that was never dropped.
+    """
+    stats = CompactionStats("raw")
+    days = retention_days()
+    if days <= 0:
+        return stats
+    now = utc_naive_now()
+    cutoff = now - timedelta(days=days)
+
+    start = time.monotonic()
+    async with engine.connect() as conn:
+        if conn.dialect.name != "postgresql":
+            return stats
+        # DETACH ... CONCURRENTLY can't run inside a transaction block
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        directory = archive_dir()
+        archived = {(lo, hi) for lo, hi, _ in archived_ranges(directory)} if directory else None
+        dropped = 0
+        # A detach stopped part way blocks every other one, so finish those first
+        finished = set()
+        for name in await _detach_pending(conn):
+            await conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}" FINALIZE'))
+            finished.add(name)
+        # Their checks passed before the detach began. Other orphans have lost their
+        # range, so wait until even a weekly partition starting on their date has expired
+        for name, lo in await _orphans(conn):
+            if name not in finished and lo + PERIOD_STEPS[PERIOD_WEEK] > cutoff:
+                continue
+            stats.rows += await conn.scalar(text(f'SELECT count(*) FROM "{name}"'))
+            stats.bytes += await conn.scalar(text(f"SELECT pg_total_relation_size('\"{name}\"')"))
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+            print(f"Dropped {name}, left detached by an earlier run")
+            dropped += 1
+
+        for name, lo, hi in await _partitions(conn):
+            if hi > cutoff:
+                continue
+            if archived is not None and (lo, hi) not in archived:
+                print(f"Keeping {name} until it has been archived")
+                continue
+            rows = await conn.scalar(text(f'SELECT count(*) FROM "{name}"'))
+            if await _rolled_up(conn, lo, hi) < rows:
+                print(f"Rollups are missing results from {name}; rebuilding before the drop")
+                # Tiers compaction has aged out of the range would only be deleted again
+                await backfill_rollups(lo, hi, retained_resolutions(hi, now))
+            size = await conn.scalar(text(f"SELECT pg_total_relation_size('\"{name}\"')"))
+            await conn.execute(text(f'ALTER TABLE {PARENT} DETACH PARTITION "{name}" CONCURRENTLY'))
+            await conn.execute(text(f'DROP TABLE "{name}"'))
+            stats.rows += rows
+            stats.bytes += size
+            dropped += 1
+    stats.seconds = time.monotonic() - start
+
+    if dropped:
+        print(f"Dropped {dropped} check_results partitions older than {days} days")
+    stats.record()
+    return stats
+
+
+async def run_retention() -> None:
+    """Housekeeping job: create partitions ahead of time, archive closed ones, drop expired ones."""
+    try:
+        await ensure_partitions()
+    except Exception as e:
+        print(f"Failed to create check_results partitions: {e}")
+    try:
+        await archive_closed_partitions()
+    except Exception as e:
+        print(f"Failed to archive check_results partitions: {e}")
+    try:
+        await drop_expired_partitions()
+    except Exception as e:
+        print(f"Failed to drop expired check_results partitions: {e}")
@@ -0,0 +1,169 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import and_, or_, text
+
+from app.core.db import engine
+from app.core.sketch import DDSketch
+from app.models.rollup import (
+    COUNTER_COLUMNS,
+    DAY,
+    LATENCY_BUCKETS_MS,
+    RESOLUTIONS,
+    CheckRollup,
+    bucket_start,
+    naive_utc,
+    utc_naive_now,
+)
+
+
+def _ceil(at: datetime, seconds: int) -> datetime:
+    start = bucket_start(at, seconds)
+    return start if start == at else start + timedelta(seconds=seconds)
+
+
+def window_segments(
+    since: datetime, until: datetime, resolutions: tuple[int, ...] = RESOLUTIONS
+) -> list[tuple[int, datetime, datetime]]:
+    """(bucket_seconds, from, to) ranges of bucket starts that tile [since, until).
+
+    Uses the largest buckets that fit: days in the middle, hours and then
+    minutes towards the edges. The minute still in progress at `until` is
+    included; the partial minute at `since` is not.
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    *smaller, size = resolutions
+    if not smaller:
+        lo = _ceil(since, size)
+        return [(size, lo, until)] if lo < until else []
+
+    lo, hi = _ceil(since, size), bucket_start(until, size)
+    if lo >= hi:
+        return window_segments(since, until, tuple(smaller))
+    return (
+        window_segments(since, lo, tuple(smaller))
+        + [(size, lo, hi)]
+        + window_segments(hi, until, tuple(smaller))
+    )
+
+
+def in_window(since: datetime, until: datetime):
+    """Filter on CheckRollup selecting the buckets that cover [since, until)."""
+    return or_(
+        *(
+            and_(
+                CheckRollup.bucket_seconds == seconds,
+                CheckRollup.bucket_start >= lo,
+                CheckRollup.bucket_start < hi,
+            )
+            for seconds, lo, hi in window_segments(since, until)
+        )
+    )
+
+
+def _backfill_sql(seconds: int) -> str:
+    histogram = ", ".join(
+        f"count(*) FILTER (WHERE r.response_time_ms <= {ms})" for ms in LATENCY_BUCKETS_MS
+    )
+    columns = ", ".join(COUNTER_COLUMNS)
+    # The sketch is rebuilt by _backfill_sketches in the same transaction
+    updates = ", ".join([f"{c} = excluded.{c}" for c in COUNTER_COLUMNS] + ["latency_sketch = NULL"])
+    return (
+        f"INSERT INTO check_rollups (monitor_id, bucket_seconds, bucket_start, {columns}) "
+        f"SELECT r.monitor_id, {seconds}, "
+        f"date_bin(interval '{seconds} seconds', r.checked_at, timestamp '1970-01-01'), "
+        f"count(*), count(*) FILTER (WHERE r.is_up), count(r.response_time_ms), "
+        f"coalesce(sum(r.response_time_ms), 0), "
+        f"count(*) FILTER (WHERE r.response_time_ms <= "
+        f"coalesce(m.slo_latency_threshold_ms, :default_threshold)), {histogram} "
+        f"FROM check_results r JOIN monitors m ON m.id = r.monitor_id "
+        f"WHERE r.checked_at >= :lo AND r.checked_at < :hi "
+        f"GROUP BY 1, 3 "
+        f"ON CONFLICT (monitor_id, bucket_seconds, bucket_start) DO UPDATE SET {updates}"
+    )
+
+
+def _backfill_sketch_sql(seconds: int) -> str:
+    # Bins are computed in SQL so only (bucket, bin, count) rows come back
+    return (
+        f"SELECT monitor_id, "
+        f"date_bin(interval '{seconds} seconds', checked_at, timestamp '1970-01-01'), "
+        f"CASE WHEN response_time_ms >= 1 "
+        f"THEN ceil(ln(response_time_ms) * {DDSketch.multiplier!r})::int END, count(*) "
+        f"FROM check_results "
+        f"WHERE checked_at >= :lo AND checked_at < :hi AND response_time_ms IS NOT NULL "
+        f"GROUP BY 1, 2, 3"
+    )
+
+
+async def _backfill_sketches(conn, seconds: int, lo: datetime, hi: datetime) -> None:
+    sketches: dict[tuple[int, datetime], DDSketch] = {}
+    result = await conn.execute(text(_backfill_sketch_sql(seconds)), {"lo": lo, "hi": hi})
+    for monitor_id, start, index, count in result:
+        sketches.setdefault((monitor_id, start), DDSketch()).add_bin(index, count)
+    if sketches:
+        await conn.execute(
+            text(
+                "UPDATE check_rollups SET latency_sketch = :sketch "
+                "WHERE monitor_id = :monitor_id AND bucket_seconds = :seconds AND bucket_start = :start"
+            ),
+            [
+                {"monitor_id": monitor_id, "seconds": seconds, "start": start, "sketch": sketch.to_bytes()}
+                for (monitor_id, start), sketch in sketches.items()
+            ],
+        )
+
+
+async def backfill_rollups(
+    since: datetime, until: datetime | None = None, resolutions: tuple[int, ...] = RESOLUTIONS
+) -> int:
+    """Rebuild rollups of `resolutions` from raw check_results, one day per transaction.
+
+    Only buckets that are complete at `until` are written, and they replace
+    what was there, so rerunning is safe. Buckets still open are left to the
+    worker.
+    """
+    from app.core.slo import LATENCY_SLO_MS  # app.core.slo imports this module
+
+    until = naive_utc(until) if until is not None else utc_naive_now()
+    day = bucket_start(naive_utc(since), DAY)
+    buckets = 0
+    while day < until:
+        following = day + timedelta(seconds=DAY)
+        async with engine.begin() as conn:
+            for seconds in resolutions:
+                hi = min(following, bucket_start(until, seconds))
+                if hi > day:
+                    result = await conn.execute(
+                        text(_backfill_sql(seconds)),
+                        {"lo": day, "hi": hi, "default_threshold": LATENCY_SLO_MS},
+                    )
+                    buckets += result.rowcount
+                    await _backfill_sketches(conn, seconds, day, hi)
+        print(f"Backfilled rollups for {day:%Y-%m-%d}")
+        day = following
+    return buckets
+
+
+def _recompute_sql(seconds: int) -> str:
+    return (
+        f"UPDATE check_rollups c SET latency_good = s.good FROM ("
+        f"SELECT date_bin(interval '{seconds} seconds', checked_at, timestamp '1970-01-01') AS start, "
+        f"count(*) FILTER (WHERE response_time_ms <= :threshold) AS good "
+        f"FROM check_results WHERE monitor_id = :monitor_id AND checked_at >= :lo GROUP BY 1"
+        f") s WHERE c.monitor_id = :monitor_id AND c.bucket_seconds = {seconds} "
+        f"AND c.bucket_start = s.start"
+    )
+
+
+async def recompute_latency_good(monitor_id: int, threshold_ms: int, days: int) -> None:
+    """Recount one monitor's latency_good against a new threshold.
+
+    Reads only that monitor's raw results from the last `days`, rounded back
+    to a whole day so every bucket it touches is recounted in full. Older
+    buckets keep their counts.
+    """
+    lo = bucket_start(datetime.now(timezone.utc) - timedelta(days=days), DAY)
+    params = {"monitor_id": monitor_id, "threshold": threshold_ms, "lo": lo}
+    async with engine.begin() as conn:
+        for seconds in RESOLUTIONS:
+            await conn.execute(text(_recompute_sql(seconds)), params)
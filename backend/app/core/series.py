@@ -0,0 +1,114 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.core.compaction import rollup_cutoffs
+from app.core.sketch import DDSketch
+from app.models.rollup import RESOLUTIONS, CheckRollup, bucket_start, naive_utc
+
+# Most points a series request may ask for
+MAX_POINTS = 2000
+
+
+def series_resolution(since: datetime, until: datetime, points: int, now: datetime) -> tuple[int, int]:
+    """(rollup bucket_seconds to read, output bucket width) for a chart of `points`.
+
+    Reads the coarsest rollups that still give `points` buckets, skipping
+    resolutions already compacted away at `since`. Widths are whole multiples
+    of the resolution, so no rollup bucket straddles two output buckets.
+    """
+    step = max((until - since).total_seconds() / points, 1)
+    cutoffs = dict(rollup_cutoffs(now))
+    kept = [s for s in RESOLUTIONS if s not in cutoffs or since >= cutoffs[s]]
+    fitting = [s for s in kept if s <= step]
+    resolution = max(fitting) if fitting else min(kept)
+    width = max(resolution, -(-int(step) // resolution) * resolution)
+    return resolution, width
+
+
+@dataclass
+class SeriesBucket:
+    """Aggregates for one output bucket of a chart."""
+    start: datetime
+    total: int = 0
+    up: int = 0
+    latency_count: int = 0
+    latency_sum_ms: int = 0
+    sketch: DDSketch = field(default_factory=DDSketch)
+
+    @property
+    def uptime(self) -> float | None:
+        return self.up / self.total if self.total else None
+
+    @property
+    def latency_avg_ms(self) -> float | None:
+        return self.latency_sum_ms / self.latency_count if self.latency_count else None
+
+    @property
+    def latency_min_ms(self) -> float | None:
+        return self.sketch.quantile(0.0)
+
+    @property
+    def latency_max_ms(self) -> float | None:
+        return self.sketch.quantile(1.0)
+
+    @property
+    def latency_p95_ms(self) -> float | None:
+        return self.sketch.quantile(0.95)
+
+
+@dataclass
+class Series:
+    since: datetime
+    until: datetime
+    resolution_seconds: int  # Rollup buckets read
+    bucket_seconds: int  # Width of each returned bucket
+    buckets: list[SeriesBucket]
+
+
+async def calculate_series(
+    db, monitor_id: int, since: datetime, until: datetime, points: int, now: datetime | None = None
+) -> Series:
+    """Bucketed uptime and latency for one monitor, at most about `points` buckets.
+
+    Built from rollups only. Min and max latency come from the merged
+    sketches, so like the percentiles they are within the sketch's accuracy.
+    Buckets without checks are included, with no values, so charts show gaps.
+    """
+    since, until = naive_utc(since), naive_utc(until)
+    now = now or datetime.now(timezone.utc)
+    resolution, width = series_resolution(since, until, points, now)
+
+    first = bucket_start(since, width)
+    buckets: list[SeriesBucket] = []
+    at = first
+    while at < until:
+        buckets.append(SeriesBucket(at))
+        at += timedelta(seconds=width)
+
+    rows = await db.execute(
+        select(
+            CheckRollup.bucket_start,
+            CheckRollup.total,
+            CheckRollup.up,
+            CheckRollup.latency_count,
+            CheckRollup.latency_sum_ms,
+            CheckRollup.latency_sketch,
+        ).where(
+            CheckRollup.monitor_id == monitor_id,
+            CheckRollup.bucket_seconds == resolution,
+            CheckRollup.bucket_start >= first,
+            CheckRollup.bucket_start < until,
+        )
+    )
+    for start, total, up, latency_count, latency_sum_ms, sketch in rows:
+        bucket = buckets[int((start - first).total_seconds()) // width]
+        bucket.total += total
+        bucket.up += up
+        bucket.latency_count += latency_count
+        bucket.latency_sum_ms += latency_sum_ms
+        if sketch:
+            bucket.sketch.merge(DDSketch.from_bytes(sketch))
+
+    return Series(since, until, resolution, width, buckets)
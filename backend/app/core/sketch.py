@@ -0,0 +1,90 @@
+import math
+import struct
+
+RELATIVE_ACCURACY = 0.01
+
+_HEADER = struct.Struct("<BI")  # format version, zero count
+_BIN = struct.Struct("<hI")  # bin index, count
+_VERSION = 1
+
+
+class DDSketch:
+    """Latency sketch with bounded relative error (DDSketch, logarithmic mapping).
+
+    Values land in bins whose bounds grow by a factor of gamma, so any quantile
+    is within RELATIVE_ACCURACY of the true value. Sketches with the same
+    accuracy merge by adding bin counts, which makes them safe to combine
+    across time buckets and monitors.
+    """
+
+    __slots__ = ("bins", "zero_count", "count")
+
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    multiplier = 1 / math.log(gamma)  # index = ceil(ln(value) * multiplier)
+
+    def __init__(self):
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0  # Values under 1ms
+        self.count = 0
+
+    def __bool__(self) -> bool:
+        return self.count > 0
+
+    @classmethod
+    def index(cls, value: float) -> int:
+        return math.ceil(math.log(value) * cls.multiplier)
+
+    @classmethod
+    def value(cls, index: int) -> float:
+        """Representative value of a bin, within RELATIVE_ACCURACY of anything in it."""
+        return 2 * cls.gamma**index / (cls.gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        if value < 1:
+            self.zero_count += count
+        else:
+            index = self.index(value)
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def add_bin(self, index: int | None, count: int) -> None:
+        """Add counts for an already computed bin; None is the sub-millisecond bin."""
+        if index is None:
+            self.zero_count += count
+        else:
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.count += count
+
+    def merge(self, other: "DDSketch") -> None:
+        for index, count in other.bins.items():
+            self.bins[index] = self.bins.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.bins):
+            seen += self.bins[index]
+            if rank < seen:
+                return self.value(index)
+        return self.value(max(self.bins))
+
+    def to_bytes(self) -> bytes:
+        return _HEADER.pack(_VERSION, self.zero_count) + b"".join(
+            _BIN.pack(index, count) for index, count in sorted(self.bins.items())
+        )
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "DDSketch":
+        sketch = cls()
+        _, sketch.zero_count = _HEADER.unpack_from(data)
+        sketch.count = sketch.zero_count
+        for index, count in _BIN.iter_unpack(data[_HEADER.size:]):
+            sketch.bins[index] = count
+            sketch.count += count
+        return sketch
@@ -1,15 +1,65 @@
+import calendar
+from collections import defaultdict
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from sqlalchemy import select, func, and_
+from datetime import datetime, timedelta
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.rollups import in_window
+from app.core.sketch import DDSketch
 from app.models.result import CheckResult
+from app.models.rollup import CheckRollup, utc_naive_now
 
 
+# Defaults for monitors without their own SLO definition
 AVAILABILITY_SLO = 0.995  # 99.5% of checks must succeed
 LATENCY_SLO_MS = 500      # 95% of checks must complete within 500ms
 LATENCY_PERCENTILE = 0.95 # p95 latency target
 SLO_WINDOW_DAYS = 30      # Rolling 30-day window
+MAX_WINDOW_DAYS = 90      # Longest window the API will compute
+PHASE_WINDOW_HOURS = 24   # Phase breakdown covers recent checks only
+
+
+@dataclass(frozen=True)
+class SLODefinition:
+    """A monitor's SLO targets and the window its error budget covers."""
+    availability_target: float = AVAILABILITY_SLO
+    latency_target: float = LATENCY_PERCENTILE
+    latency_threshold_ms: int = LATENCY_SLO_MS
+    window_days: int = SLO_WINDOW_DAYS
+    calendar_month: bool = False
+
+    @classmethod
+    def for_monitor(cls, monitor) -> "SLODefinition":
+        """The monitor's own definition, with defaults for whatever it leaves unset."""
+        defaults = cls()
+        return cls(
+            availability_target=(
+                defaults.availability_target
+                if monitor.slo_availability_target is None
+                else monitor.slo_availability_target
+            ),
+            latency_target=(
+                defaults.latency_target
+                if monitor.slo_latency_target is None
+                else monitor.slo_latency_target
+            ),
+            latency_threshold_ms=monitor.slo_latency_threshold_ms or defaults.latency_threshold_ms,
+            window_days=monitor.slo_window_days or defaults.window_days,
+            calendar_month=bool(monitor.slo_calendar_month),
+        )
+
+    def window(self, now: datetime) -> tuple[datetime, datetime]:
+        """[since, until) of the budget period containing `now`, so far."""
+        if self.calendar_month:
+            return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), now
+        return now - timedelta(days=self.window_days), now
+
+    def period_days(self, now: datetime) -> int:
+        """Length of the whole budget period, which burn is projected over."""
+        if self.calendar_month:
+            return calendar.monthrange(now.year, now.month)[1]
+        return self.window_days
 
 
 @dataclass
@@ -25,85 +75,186 @@ class SLOStatus:
     time_remaining_hours: float | None
 
 
+@dataclass
+class PhaseBreakdown:
+    """Average ms per check phase; None when no recent check went through that phase."""
+    window_hours: int
+    dns_ms: float | None
+    connect_ms: float | None
+    tls_ms: float | None
+    ttfb_ms: float | None
+    transfer_ms: float | None
+
+
+@dataclass
+class LatencyPercentiles:
+    """Response time quantiles from merged rollup sketches; None when nothing was measured."""
+    count: int
+    p50_ms: float | None
+    p90_ms: float | None
+    p95_ms: float | None
+    p99_ms: float | None
+
+    @classmethod
+    def from_sketch(cls, sketch: DDSketch) -> "LatencyPercentiles":
+        p50, p90, p95, p99 = (
+            None if value is None else round(value, 1)
+            for value in (sketch.quantile(q) for q in (0.5, 0.9, 0.95, 0.99))
+        )
+        return cls(count=sketch.count, p50_ms=p50, p90_ms=p90, p95_ms=p95, p99_ms=p99)
+
+
 @dataclass
 class SLOReport:
     monitor_id: int
     monitor_name: str
     window_days: int
+    calendar_month: bool
+    latency_threshold_ms: int
     total_checks: int
     availability: SLOStatus
     latency: SLOStatus
+    percentiles: LatencyPercentiles
+    phases: PhaseBreakdown
 
 
-async def calculate_availability_slo(
-    db: AsyncSession,
-    monitor_id: int,
-    window_days: int = SLO_WINDOW_DAYS,
-) -> tuple[float, int, int]:
-    """Returns (availability_ratio, successful_checks, total_checks)."""
-    since = datetime.now(timezone.utc) - timedelta(days=window_days)
+@dataclass
+class SLICounts:
+    """Good/total check counts behind both SLIs, for one monitor over one window."""
+    total: int = 0
+    up: int = 0
+    latency_total: int = 0
+    latency_fast: int = 0
 
-    total_result = await db.execute(
-        select(func.count(CheckResult.id))
-        .where(and_(
-            CheckResult.monitor_id == monitor_id,
-            CheckResult.checked_at >= since,
-        ))
-    )
-    total_checks = total_result.scalar() or 0
+    @property
+    def availability(self) -> float:
+        return self.up / self.total if self.total else 1.0  # No data = assume OK
 
-    if total_checks == 0:
-        return 1.0, 0, 0  # No data = assume OK
+    @property
+    def latency(self) -> float:
+        return self.latency_fast / self.latency_total if self.latency_total else 1.0
 
-    success_result = await db.execute(
-        select(func.count(CheckResult.id))
-        .where(and_(
-            CheckResult.monitor_id == monitor_id,
-            CheckResult.checked_at >= since,
-            CheckResult.is_up.is_(True),
-        ))
-    )
-    successful_checks = success_result.scalar() or 0
 
-    availability = successful_checks / total_checks
-    return availability, successful_checks, total_checks
+def _by_window(definitions: dict[int, SLODefinition]) -> dict[tuple[datetime, datetime], list[int]]:
+    # Most monitors share a definition, so this is usually one or two windows
+    now = utc_naive_now()
+    windows = defaultdict(list)
+    for monitor_id, definition in definitions.items():
+        windows[definition.window(now)].append(monitor_id)
+    return windows
 
 
-async def calculate_latency_slo(
+async def calculate_slis(
     db: AsyncSession,
-    monitor_id: int,
-    window_days: int = SLO_WINDOW_DAYS,
-    target_ms: int = LATENCY_SLO_MS,
-) -> tuple[float, int, int]:
-    """Returns (ratio_under_target, fast_checks, total_checks_with_latency)."""
-    since = datetime.now(timezone.utc) - timedelta(days=window_days)
-
-    total_result = await db.execute(
-        select(func.count(CheckResult.id))
-        .where(and_(
-            CheckResult.monitor_id == monitor_id,
-            CheckResult.checked_at >= since,
-            CheckResult.response_time_ms.isnot(None),
-        ))
+    definitions: dict[int, SLODefinition],
+) -> dict[int, SLICounts]:
+    """Counts for every SLI of every given monitor in one grouped query.
+
+    Sums rollup buckets over each monitor's own window. latency_good is kept
+    by the worker against each monitor's own threshold, so no raw rows are read.
+    """
+    counts = {monitor_id: SLICounts() for monitor_id in definitions}
+    if not definitions:
+        return counts
+    stmt = (
+        select(
+            CheckRollup.monitor_id,
+            func.sum(CheckRollup.total),
+            func.sum(CheckRollup.up),
+            func.sum(CheckRollup.latency_count),
+            func.sum(CheckRollup.latency_good),
+        )
+        .where(
+            or_(
+                *(
+                    and_(CheckRollup.monitor_id.in_(monitor_ids), in_window(since, until))
+                    for (since, until), monitor_ids in _by_window(definitions).items()
+                )
+            )
+        )
+        .group_by(CheckRollup.monitor_id)
     )
-    total_checks = total_result.scalar() or 0
+    for monitor_id, total, up, latency_total, latency_fast in await db.execute(stmt):
+        counts[monitor_id] = SLICounts(
+            int(total or 0), int(up or 0), int(latency_total or 0), int(latency_fast or 0)
+        )
+    return counts
+
+
+async def calculate_latency_sketches(
+    db: AsyncSession,
+    monitor_ids: list[int] | None,
+    since: datetime,
+    until: datetime,
+) -> dict[int, DDSketch]:
+    """Each monitor's rollup sketches over [since, until), merged into one.
+
+    Reads at most a few hundred buckets per monitor whatever the window, since
+    whole days and hours are covered by their own buckets. Monitors without
+    measurements get an empty sketch; with monitor_ids=None only monitors that
+    have data are returned.
+    """
+    stmt = select(CheckRollup.monitor_id, CheckRollup.latency_sketch).where(
+        in_window(since, until), CheckRollup.latency_sketch.is_not(None)
+    )
+    sketches: dict[int, DDSketch] = {}
+    if monitor_ids is not None:
+        stmt = stmt.where(CheckRollup.monitor_id.in_(monitor_ids))
+        sketches = {monitor_id: DDSketch() for monitor_id in monitor_ids}
+    for monitor_id, data in await db.execute(stmt):
+        sketches.setdefault(monitor_id, DDSketch()).merge(DDSketch.from_bytes(data))
+    return sketches
+
+
+async def calculate_latency_percentiles(
+    db: AsyncSession,
+    definitions: dict[int, SLODefinition],
+) -> dict[int, LatencyPercentiles]:
+    percentiles = {}
+    for (since, until), monitor_ids in _by_window(definitions).items():
+        sketches = await calculate_latency_sketches(db, monitor_ids, since, until)
+        for monitor_id, sketch in sketches.items():
+            percentiles[monitor_id] = LatencyPercentiles.from_sketch(sketch)
+    return percentiles
 
-    if total_checks == 0:
-        return 1.0, 0, 0  # No data = assume OK
 
-    fast_result = await db.execute(
-        select(func.count(CheckResult.id))
+async def calculate_phase_breakdowns(
+    db: AsyncSession,
+    monitor_ids: list[int],
+    window_hours: int = PHASE_WINDOW_HOURS,
+) -> dict[int, PhaseBreakdown]:
+    since = utc_naive_now() - timedelta(hours=window_hours)
+
+    result = await db.execute(
+        select(
+            CheckResult.monitor_id,
+            func.avg(CheckResult.dns_ms),
+            func.avg(CheckResult.connect_ms),
+            func.avg(CheckResult.tls_ms),
+            func.avg(CheckResult.ttfb_ms),
+            func.avg(CheckResult.transfer_ms),
+        )
         .where(and_(
-            CheckResult.monitor_id == monitor_id,
+            CheckResult.monitor_id.in_(monitor_ids),
             CheckResult.checked_at >= since,
-            CheckResult.response_time_ms.isnot(None),
-            CheckResult.response_time_ms <= target_ms,
         ))
+        .group_by(CheckResult.monitor_id)
     )
-    fast_checks = fast_result.scalar() or 0
-
-    ratio = fast_checks / total_checks
-    return ratio, fast_checks, total_checks
+    empty = PhaseBreakdown(window_hours, None, None, None, None, None)
+    breakdowns = {monitor_id: empty for monitor_id in monitor_ids}
+    for monitor_id, *averages in result:
+        dns, connect, tls, ttfb, transfer = (
+            None if avg is None else round(float(avg), 1) for avg in averages
+        )
+        breakdowns[monitor_id] = PhaseBreakdown(
+            window_hours=window_hours,
+            dns_ms=dns,
+            connect_ms=connect,
+            tls_ms=tls,
+            ttfb_ms=ttfb,
+            transfer_ms=transfer,
+        )
+    return breakdowns
 
 
 def calculate_error_budget(
@@ -139,55 +290,83 @@ def calculate_error_budget(
     return budget_remaining, budget_pct, burn_rate, hours_until_exhausted
 
 
-async def get_slo_report(
-    db: AsyncSession,
-    monitor_id: int,
-    monitor_name: str,
-) -> SLOReport:
-
-    avail_sli, avail_success, avail_total = await calculate_availability_slo(
-        db, monitor_id, SLO_WINDOW_DAYS
-    )
-    avail_budget_rem, avail_budget_pct, avail_burn, avail_hours = calculate_error_budget(
-        avail_sli, AVAILABILITY_SLO, SLO_WINDOW_DAYS
-    )
-
-    availability = SLOStatus(
-        name="Availability",
-        target=AVAILABILITY_SLO,
-        current=avail_sli,
-        is_met=avail_sli >= AVAILABILITY_SLO,
-        error_budget_total=1 - AVAILABILITY_SLO,
-        error_budget_remaining=avail_budget_rem,
-        error_budget_pct=avail_budget_pct,
-        burn_rate=avail_burn,
-        time_remaining_hours=avail_hours,
+def _slo_status(name: str, sli: float, target: float, window_days: int) -> SLOStatus:
+    budget_remaining, budget_pct, burn_rate, hours = calculate_error_budget(
+        sli, target, window_days
     )
-
-    latency_sli, latency_fast, latency_total = await calculate_latency_slo(
-        db, monitor_id, SLO_WINDOW_DAYS, LATENCY_SLO_MS
-    )
-    latency_budget_rem, latency_budget_pct, latency_burn, latency_hours = calculate_error_budget(
-        latency_sli, LATENCY_PERCENTILE, SLO_WINDOW_DAYS
+    return SLOStatus(
+        name=name,
+        target=target,
+        current=sli,
+        is_met=sli >= target,
+        error_budget_total=1 - target,
+        error_budget_remaining=budget_remaining,
+        error_budget_pct=budget_pct,
+        burn_rate=burn_rate,
+        time_remaining_hours=hours,
     )
 
-    latency = SLOStatus(
-        name=f"Latency (p{int(LATENCY_PERCENTILE*100)} < {LATENCY_SLO_MS}ms)",
-        target=LATENCY_PERCENTILE,
-        current=latency_sli,
-        is_met=latency_sli >= LATENCY_PERCENTILE,
-        error_budget_total=1 - LATENCY_PERCENTILE,
-        error_budget_remaining=latency_budget_rem,
-        error_budget_pct=latency_budget_pct,
-        burn_rate=latency_burn,
-        time_remaining_hours=latency_hours,
-    )
 
+def build_slo_report(
+    monitor_id: int,
+    monitor_name: str,
+    counts: SLICounts,
+    percentiles: LatencyPercentiles,
+    phases: PhaseBreakdown,
+    definition: SLODefinition = SLODefinition(),
+) -> SLOReport:
+    period_days = definition.period_days(utc_naive_now())
     return SLOReport(
         monitor_id=monitor_id,
         monitor_name=monitor_name,
-        window_days=SLO_WINDOW_DAYS,
-        total_checks=avail_total,
-        availability=availability,
-        latency=latency,
+        window_days=period_days,
+        calendar_month=definition.calendar_month,
+        latency_threshold_ms=definition.latency_threshold_ms,
+        total_checks=counts.total,
+        availability=_slo_status(
+            "Availability", counts.availability, definition.availability_target, period_days
+        ),
+        latency=_slo_status(
+            f"Latency (p{round(definition.latency_target * 100, 2):g} < "
+            f"{definition.latency_threshold_ms}ms)",
+            counts.latency,
+            definition.latency_target,
+            period_days,
+        ),
+        percentiles=percentiles,
+        phases=phases,
     )
+
+
+async def get_slo_reports(
+    db: AsyncSession,
+    monitors: list[tuple[int, str, SLODefinition]],
+) -> list[SLOReport]:
+    """Reports for (id, name, definition) triples, with one query each for SLIs, percentiles and phases."""
+    definitions = {monitor_id: definition for monitor_id, _, definition in monitors}
+    if not definitions:
+        return []
+    counts = await calculate_slis(db, definitions)
+    percentiles = await calculate_latency_percentiles(db, definitions)
+    phases = await calculate_phase_breakdowns(db, list(definitions))
+    return [
+        build_slo_report(
+            monitor_id,
+            name,
+            counts[monitor_id],
+            percentiles[monitor_id],
+            phases[monitor_id],
+            definition,
+        )
+        for monitor_id, name, definition in monitors
+    ]
+
+
+async def get_slo_report(
+    db: AsyncSession,
+    monitor_id: int,
+    monitor_name: str,
+    definition: SLODefinition = SLODefinition(),
+) -> SLOReport:
+    reports = await get_slo_reports(db, [(monitor_id, monitor_name, definition)])
+    return reports[0]
@@ -1,16 +1,18 @@
 import secrets
 from contextlib import asynccontextmanager
 from app.api.auth import router as auth_router
+from app.api.dashboard import router as dashboard_router
+from app.api.export import router as export_router
 from app.api.monitors import router as monitors_router
 from app.api.health import router as health_router
 from app.api.slo import router as slo_router
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
 from sqlalchemy import text
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from app.worker.checker import run_checks
+from app.worker.runner import Worker
 from prometheus_fastapi_instrumentator import Instrumentator
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.cache import slo_cache
 from app.core.db import engine
 from app.core.config import settings, APP_VERSION
 from app.core.azure_monitor import setup_azure_monitor
@@ -57,29 +59,28 @@ async def lifespan(app: FastAPI):
         await conn.execute(text("SELECT 1"))
     print("Database connected!")
 
-    # Start the background scheduler
-    scheduler = AsyncIOScheduler()
-    scheduler.add_job(run_checks, "interval", seconds=60, id="url_checker")
-
-    # Demo mode: seed database and add cleanup job
+    # Demo mode: seed database (the worker's retention job drops old partitions)
     if settings.demo_mode:
-        from app.core.demo import seed_demo_data, cleanup_old_data
+        from app.core.demo import seed_demo_data
         await seed_demo_data()
-        scheduler.add_job(
-            cleanup_old_data,
-            "interval",
-            hours=24,
-            id="demo_cleanup"
-        )
         print(f"Demo mode enabled - data retention: {settings.demo_retention_days} days")
 
-    scheduler.start()
-    print("Scheduler started - checking URLs every 60 seconds")
+    # Checks can run here or in a separate `python -m app.worker` process
+    worker = Worker() if settings.run_worker_in_api else None
+    if worker:
+        # Without SLO_CACHE_URL, only this worker's writes can invalidate cached reports
+        slo_cache.sole_writer = worker.sole_writer
+        await worker.start()
+    else:
+        print("Embedded worker disabled - run checks with `python -m app.worker`")
+    if not slo_cache.backend:
+        print("SLO_CACHE_URL not set - SLO reports are only cached while a sole embedded worker runs")
 
     yield
 
-    # Shutdown: stop scheduler
-    scheduler.shutdown()
+    # Shutdown: stop the worker, letting in-flight checks finish
+    if worker:
+        await worker.stop()
     print("Shutting down...")
 
 
@@ -100,12 +101,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(auth_router, prefix="/api")
 app.include_router(monitors_router, prefix="/api")
 app.include_router(health_router, prefix="/api")
 app.include_router(slo_router, prefix="/api")
+app.include_router(export_router, prefix="/api")
+app.include_router(dashboard_router, prefix="/api")
 
 Instrumentator().instrument(app).expose(
     app, dependencies=[Depends(verify_metrics_auth)]
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+class Incident(Base):
+    """A confirmed outage: opened on a confirmed DOWN, resolved on a confirmed UP."""
+
+    __tablename__ = "incidents"
+    __table_args__ = (
+        Index("ix_incidents_monitor_id_started_at", "monitor_id", "started_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    monitor_id: Mapped[int] = mapped_column(Integer, ForeignKey("monitors.id", ondelete="CASCADE"))
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
+    resolved_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, String
+
+from app.models import Base
+
+
+def utc_now():
+    return datetime.now(timezone.utc)
+
+
+class WorkerLease(Base):
+    __tablename__ = "worker_leases"
+
+    worker_id: Mapped[str] = mapped_column(String(255), primary_key=True)
+    hostname: Mapped[str] = mapped_column(String(255))
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now, index=True)
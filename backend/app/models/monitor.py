@@ -4,7 +4,7 @@ from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import Boolean, DateTime, Integer, String
+from sqlalchemy import Boolean, DateTime, Float, Integer, String
 
 from app.models import Base
 
@@ -12,6 +12,17 @@ if TYPE_CHECKING:
     from app.models.result import CheckResult
 
 
+# Probe modes: how much of the response a check reads
+PROBE_HEAD = "head"  # HEAD request
+PROBE_HEADERS = "headers"  # GET, closed as soon as headers arrive
+PROBE_BODY = "body"  # GET, reading up to max_body_bytes of the body
+PROBE_MODES = (PROBE_HEAD, PROBE_HEADERS, PROBE_BODY)
+
+# Connection modes: what a check's response time measures
+CONNECTION_WARM = "warm"  # Reuse pooled connections: measures the request itself
+CONNECTION_COLD = "cold"  # Fresh connection each time: includes DNS, connect and TLS
+
+
 def utc_now():
     return datetime.now(timezone.utc)
 
@@ -24,6 +35,19 @@ class Monitor(Base):
     url: Mapped[str] = mapped_column(String(2048))
     interval_seconds: Mapped[int] = mapped_column(Integer, default=60)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    probe_mode: Mapped[str] = mapped_column(String(16), default=PROBE_HEADERS)
+    timeout_seconds: Mapped[float] = mapped_column(Float, default=30.0)
+    max_body_bytes: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    connection_mode: Mapped[str] = mapped_column(String(8), default=CONNECTION_WARM)
+    # Check faster while failing, back to interval_seconds once stable again
+    adaptive: Mapped[bool] = mapped_column(Boolean, default=False)
+    # SLO definition; NULLs fall back to the defaults in app.core.slo
+    slo_availability_target: Mapped[float | None] = mapped_column(Float, nullable=True)
+    slo_latency_target: Mapped[float | None] = mapped_column(Float, nullable=True)
+    slo_latency_threshold_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    slo_window_days: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Budget resets on the 1st of each month instead of rolling over slo_window_days
+    slo_calendar_month: Mapped[bool] = mapped_column(Boolean, default=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=utc_now, onupdate=utc_now
@@ -3,7 +3,9 @@ from __future__ import annotations
 from datetime import datetime, timezone
 from typing import TYPE_CHECKING
 
-from sqlalchemy import Boolean, DateTime, ForeignKey, Integer, Text
+from sqlalchemy import (
+    BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, Sequence, SmallInteger, Text,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.models import Base
@@ -16,15 +18,43 @@ def utc_now():
     return datetime.now(timezone.utc)
 
 
+check_results_id_seq = Sequence("check_results_id_seq")
+
+
 class CheckResult(Base):
-    __tablename__ = "check_results"
+    """One check outcome.
 
-    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    On Postgres the table is range-partitioned on checked_at (a partition per
+    day or week), so retention drops whole partitions instead of deleting rows.
+    """
+
+    __tablename__ = "check_results"
+    __table_args__ = (
+        Index("ix_check_results_monitor_id_checked_at", "monitor_id", "checked_at"),
+        # Rows arrive in time order, so a BRIN index covers time-range scans in a few pages
+        Index("ix_check_results_checked_at_brin", "checked_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (checked_at)"},
+    )
+
+    # Partitioned tables need the partition key in the primary key
+    id: Mapped[int] = mapped_column(
+        BigInteger,
+        check_results_id_seq,
+        server_default=check_results_id_seq.next_value(),
+        primary_key=True,
+    )
     monitor_id: Mapped[int] = mapped_column(Integer, ForeignKey("monitors.id", ondelete="CASCADE"))
     status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
     response_time_ms: Mapped[int | None] = mapped_column(Integer, nullable=True)
     is_up: Mapped[bool] = mapped_column(Boolean)
-    checked_at: Mapped[datetime] = mapped_column(DateTime, default=utc_now)
+    checked_at: Mapped[datetime] = mapped_column(DateTime, primary_key=True, default=utc_now)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
 
+    # Phase timings in ms; None when the phase didn't happen (e.g. reused connection)
+    dns_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    connect_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    tls_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    ttfb_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+    transfer_ms: Mapped[int | None] = mapped_column(SmallInteger, nullable=True)
+
     monitor: Mapped["Monitor"] = relationship(back_populates="check_results")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, LargeBinary
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models import Base
+
+
+# Bucket sizes, in seconds, maintained for every monitor
+MINUTE = 60
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = (MINUTE, HOUR, DAY)
+
+# Upper bounds of the cumulative latency histogram; le_<ms> counts checks at or under <ms>
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000)
+
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def naive_utc(at: datetime) -> datetime:
+    """`at` as naive UTC, how timestamps are stored; naive input is taken to be UTC already."""
+    if at.tzinfo is not None:
+        return at.astimezone(timezone.utc).replace(tzinfo=None)
+    return at
+
+
+def utc_naive_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_start(at: datetime, seconds: int) -> datetime:
+    """Start of the `seconds`-wide bucket containing `at`, as naive UTC."""
+    offset = int((naive_utc(at) - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=offset - offset % seconds)
+
+
+class CheckRollup(Base):
+    """Check counts and latency histogram for one monitor over one time bucket."""
+
+    __tablename__ = "check_rollups"
+    __table_args__ = (
+        # Lets compaction find aged buckets of one resolution without a full scan
+        Index("ix_check_rollups_bucket_seconds_bucket_start", "bucket_seconds", "bucket_start"),
+    )
+
+    monitor_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("monitors.id", ondelete="CASCADE"), primary_key=True
+    )
+    bucket_seconds: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+
+    total: Mapped[int] = mapped_column(Integer, default=0)
+    up: Mapped[int] = mapped_column(Integer, default=0)
+    # Checks that got a response time, and their sum
+    latency_count: Mapped[int] = mapped_column(Integer, default=0)
+    latency_sum_ms: Mapped[int] = mapped_column(BigInteger, default=0)
+    # Checks within the monitor's own SLO latency threshold
+    latency_good: Mapped[int] = mapped_column(Integer, default=0)
+    le_50: Mapped[int] = mapped_column(Integer, default=0)
+    le_100: Mapped[int] = mapped_column(Integer, default=0)
+    le_250: Mapped[int] = mapped_column(Integer, default=0)
+    le_500: Mapped[int] = mapped_column(Integer, default=0)
+    le_1000: Mapped[int] = mapped_column(Integer, default=0)
+    le_2500: Mapped[int] = mapped_column(Integer, default=0)
+    le_5000: Mapped[int] = mapped_column(Integer, default=0)
+    # Serialized DDSketch of response times, merged on every flush
+    latency_sketch: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+
+# Counter columns in a fixed order, shared by the worker's upserts and the backfill
+COUNTER_COLUMNS = (
+    "total",
+    "up",
+    "latency_count",
+    "latency_sum_ms",
+    "latency_good",
+    *(f"le_{ms}" for ms in LATENCY_BUCKETS_MS),
+)
@@ -0,0 +1,37 @@
+# Usage: PYTHONPATH=. python -m app.worker
+
+import asyncio
+import signal
+
+from prometheus_client import start_http_server
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.db import engine
+from app.worker.runner import Worker
+
+
+async def main():
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    print("Database connected!")
+
+    start_http_server(settings.worker_metrics_port)
+    print(f"Worker metrics on :{settings.worker_metrics_port}/metrics")
+
+    worker = Worker()
+    await worker.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    print("Shutting down - draining in-flight checks...")
+    await worker.stop()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,340 @@
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_, select
+
+from app.core.db import async_session
+from app.core.metrics import updog_slo_burn_alerts_firing, updog_slo_burn_eval_seconds
+from app.core.notifications import send_slo_burn_alert
+from app.models.monitor import Monitor
+from app.models.rollup import DAY, HOUR, MINUTE, CheckRollup
+
+PAGE = "page"
+TICKET = "ticket"
+_RANK = {TICKET: 1, PAGE: 2}
+
+# Per-slot counters, in this order
+TOTAL, UP, TIMED, FAST = range(4)
+FIELDS = 4
+
+
+@dataclass(frozen=True)
+class BurnRule:
+    """Fire when both windows burn error budget faster than `burn_rate`."""
+    severity: str
+    long_window: int  # seconds
+    short_window: int
+    burn_rate: float
+
+
+# The standard multi-window, multi-burn-rate rules for a 30-day budget:
+# pages at 2% of the budget in 1h or 5% in 6h, tickets at 10% in 1d or 3d
+BURN_RULES = (
+    BurnRule(PAGE, HOUR, 5 * MINUTE, 14.4),
+    BurnRule(PAGE, 6 * HOUR, 30 * MINUTE, 6.0),
+    BurnRule(TICKET, DAY, 2 * HOUR, 3.0),
+    BurnRule(TICKET, 3 * DAY, 6 * HOUR, 1.0),
+)
+
+# (name, good field, total field); targets are the monitor's own
+SLIS = (
+    ("availability", UP, TOTAL),
+    ("latency", FAST, TIMED),
+)
+
+# Windows up to this long come from minute slots, longer ones from hour slots
+MINUTE_RING_SECONDS = 2 * HOUR
+
+_WINDOWS = sorted({w for rule in BURN_RULES for w in (rule.long_window, rule.short_window)})
+MINUTE_WINDOWS = tuple(w // MINUTE for w in _WINDOWS if w <= MINUTE_RING_SECONDS)
+HOUR_WINDOWS = tuple(w // HOUR for w in _WINDOWS if w > MINUTE_RING_SECONDS)
+
+
+def _format_window(seconds: int) -> str:
+    if seconds % DAY == 0:
+        return f"{seconds // DAY}d"
+    if seconds % HOUR == 0:
+        return f"{seconds // HOUR}h"
+    return f"{seconds // MINUTE}m"
+
+
+def _epoch(at: datetime) -> float:
+    # Naive timestamps are UTC, like check_results.checked_at
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return at.timestamp()
+
+
+class SlidingCounts:
+    """Counters in a ring of fixed-width slots, with running sums per trailing window.
+
+    A window of w slots covers the newest slot and the w-1 before it. Adding a
+    result or moving on a slot touches each window's sum once, so reading any
+    window is O(1) however long it is.
+    """
+
+    __slots__ = ("width", "windows", "head", "_size", "_ring", "_sums")
+
+    def __init__(self, width: int, windows: tuple[int, ...]):
+        self.width = width
+        self.windows = windows  # In slots
+        self.head: int | None = None  # Newest slot index
+        self._size = max(windows)
+        self._ring = array("q", [0]) * (self._size * FIELDS)
+        self._sums = [[0] * FIELDS for _ in windows]
+
+    def _clear(self) -> None:
+        self._ring = array("q", [0]) * (self._size * FIELDS)
+        self._sums = [[0] * FIELDS for _ in self.windows]
+
+    def advance(self, slot: int) -> None:
+        if self.head is None or slot - self.head >= self._size:
+            if self.head is not None:
+                self._clear()
+            self.head = slot
+            return
+        ring, size = self._ring, self._size
+        while self.head < slot:
+            self.head += 1
+            # Each window drops the slot that just fell out of it
+            for w, sums in zip(self.windows, self._sums):
+                base = (self.head - w) % size * FIELDS
+                for f in range(FIELDS):
+                    sums[f] -= ring[base + f]
+            base = self.head % size * FIELDS
+            for f in range(FIELDS):
+                ring[base + f] = 0
+
+    def add(self, slot: int, counts: tuple[int, ...]) -> None:
+        self.advance(slot)
+        age = self.head - slot
+        if age >= self._size:
+            return  # Older than the longest window
+        base = slot % self._size * FIELDS
+        for f in range(FIELDS):
+            self._ring[base + f] += counts[f]
+        for w, sums in zip(self.windows, self._sums):
+            if age < w:
+                for f in range(FIELDS):
+                    sums[f] += counts[f]
+
+    def window(self, index: int) -> list[int]:
+        return self._sums[index]
+
+
+class MonitorBurn:
+    """Minute and hour counters for one monitor, covering every rule window."""
+
+    __slots__ = ("minutes", "hours", "first_seen", "warm", "targets")
+
+    def __init__(self, first_seen: float):
+        self.minutes = SlidingCounts(MINUTE, MINUTE_WINDOWS)
+        self.hours = SlidingCounts(HOUR, HOUR_WINDOWS)
+        # SLI name -> the monitor's target, as of its latest result
+        self.targets: dict[str, float] = {}
+        # Results before this came from rollups, not from add()
+        self.first_seen = first_seen
+        self.warm = False
+
+    def add(self, at: float, counts: tuple[int, ...]) -> None:
+        self.minutes.add(int(at // MINUTE), counts)
+        self.hours.add(int(at // HOUR), counts)
+
+    def advance(self, at: float) -> None:
+        self.minutes.advance(int(at // MINUTE))
+        self.hours.advance(int(at // HOUR))
+
+    def window(self, seconds: int) -> list[int]:
+        """Counts over a rule window; hour-based windows move an hour at a time."""
+        if seconds <= MINUTE_RING_SECONDS:
+            return self.minutes.window(MINUTE_WINDOWS.index(seconds // MINUTE))
+        return self.hours.window(HOUR_WINDOWS.index(seconds // HOUR))
+
+
+def counts_for(record) -> tuple[int, int, int, int]:
+    timed = record.response_time_ms is not None
+    return (
+        1,
+        int(record.is_up),
+        int(timed),
+        int(timed and record.response_time_ms <= record.latency_threshold_ms),
+    )
+
+
+def burn_rate(counts: list[int], good: int, total: int, target: float) -> float:
+    """How many times faster than sustainable the window spent its error budget."""
+    if not counts[total]:
+        return 0.0
+    return (1 - counts[good] / counts[total]) / (1 - target)
+
+
+@dataclass(slots=True)
+class BurnAlert:
+    """A change in one monitor SLI's alert severity; severity None means resolved."""
+    monitor_id: int
+    sli: str
+    severity: str | None
+    burn_rate: float
+    window: int  # Long window of the rule that fired, in seconds
+
+
+class BurnRateEngine:
+    """Multi-window burn-rate alerting from counters kept in memory.
+
+    Fed every result the worker produces, so evaluation reads nothing from
+    the database. A monitor's counters are warmed once from rollups, the
+    first tick after its first result here, so long windows survive restarts
+    and rebalances.
+    """
+
+    def __init__(self, rules: tuple[BurnRule, ...] = BURN_RULES):
+        self.rules = rules
+        self._monitors: dict[int, MonitorBurn] = {}
+        self._firing: dict[tuple[int, str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self._monitors)
+
+    def add(self, record) -> None:
+        at = _epoch(record.checked_at)
+        monitor = self._monitors.get(record.monitor_id)
+        if monitor is None:
+            monitor = self._monitors[record.monitor_id] = MonitorBurn(at)
+        monitor.add(at, counts_for(record))
+        monitor.targets = {
+            "availability": record.availability_target,
+            "latency": record.latency_target,
+        }
+
+    def invalidate(self) -> None:
+        """Drop everything, e.g. after monitors changed owner; counters re-warm on use."""
+        self._monitors.clear()
+        self._firing.clear()
+
+    async def warm(self, db, now: float | None = None) -> None:
+        """Load rollups from before each cold monitor's first result, in one query."""
+        cold = {mid: m for mid, m in self._monitors.items() if not m.warm}
+        if not cold:
+            return
+        now = time.time() if now is None else now
+        minutes_since = datetime.fromtimestamp(
+            now - MINUTE_RING_SECONDS - MINUTE, timezone.utc
+        ).replace(tzinfo=None)
+        hours_since = datetime.fromtimestamp(
+            now - max(HOUR_WINDOWS) * HOUR - HOUR, timezone.utc
+        ).replace(tzinfo=None)
+
+        rows = await db.execute(
+            select(
+                CheckRollup.monitor_id,
+                CheckRollup.bucket_seconds,
+                CheckRollup.bucket_start,
+                CheckRollup.total,
+                CheckRollup.up,
+                CheckRollup.latency_count,
+                CheckRollup.latency_good,
+            ).where(
+                CheckRollup.monitor_id.in_(cold),
+                or_(
+                    and_(CheckRollup.bucket_seconds == MINUTE, CheckRollup.bucket_start >= minutes_since),
+                    and_(CheckRollup.bucket_seconds == HOUR, CheckRollup.bucket_start >= hours_since),
+                ),
+            )
+        )
+        for monitor_id, seconds, start, *counts in rows:
+            monitor = cold[monitor_id]
+            slot = int(_epoch(start) // seconds)
+            first_minute = int(monitor.first_seen // MINUTE)
+            first_hour = int(monitor.first_seen // HOUR)
+            if seconds == MINUTE and slot < first_minute:
+                monitor.minutes.add(slot, counts)
+                # Minutes of the first hour stand in for its partial hour bucket
+                if slot * MINUTE >= first_hour * HOUR:
+                    monitor.hours.add(first_hour, counts)
+            elif seconds == HOUR and slot < first_hour:
+                monitor.hours.add(slot, counts)
+        for monitor in cold.values():
+            monitor.warm = True
+
+    def evaluate(self, now: float | None = None) -> list[BurnAlert]:
+        """Apply the rules to every tracked monitor and return severity changes.
+
+        Only escalations and resolutions are returned; a page easing to a
+        ticket keeps firing quietly.
+        """
+        now = time.time() if now is None else now
+        changes = []
+        for monitor_id, monitor in self._monitors.items():
+            monitor.advance(now)
+            for sli, good, total in SLIS:
+                target = monitor.targets[sli]
+                fired = None
+                for rule in self.rules:
+                    long_rate = burn_rate(monitor.window(rule.long_window), good, total, target)
+                    short_rate = burn_rate(monitor.window(rule.short_window), good, total, target)
+                    if long_rate > rule.burn_rate and short_rate > rule.burn_rate:
+                        if fired is None or _RANK[rule.severity] > _RANK[fired[0].severity]:
+                            fired = (rule, long_rate)
+
+                key = (monitor_id, sli)
+                previous = self._firing.get(key)
+                if fired is None:
+                    if previous is not None:
+                        del self._firing[key]
+                        changes.append(BurnAlert(monitor_id, sli, None, 0.0, 0))
+                    continue
+                rule, rate = fired
+                self._firing[key] = rule.severity
+                if previous is None or _RANK[rule.severity] > _RANK[previous]:
+                    changes.append(BurnAlert(monitor_id, sli, rule.severity, rate, rule.long_window))
+
+        for level in (PAGE, TICKET):
+            updog_slo_burn_alerts_firing.labels(severity=level).set(
+                sum(1 for s in self._firing.values() if s == level)
+            )
+        return changes
+
+    async def tick(self) -> None:
+        """Warm new monitors, evaluate every rule and send alerts for changes."""
+        start = time.monotonic()
+        try:
+            if any(not m.warm for m in self._monitors.values()):
+                async with async_session() as db:
+                    await self.warm(db)
+        except Exception as e:
+            print(f"Failed to warm burn-rate counters: {e}")
+        changes = self.evaluate()
+        updog_slo_burn_eval_seconds.observe(time.monotonic() - start)
+        if not changes:
+            return
+
+        async with async_session() as db:
+            monitors = {
+                row.id: row
+                for row in await db.execute(
+                    select(Monitor.id, Monitor.name, Monitor.url).where(
+                        Monitor.id.in_({c.monitor_id for c in changes})
+                    )
+                )
+            }
+        for change in changes:
+            monitor = monitors.get(change.monitor_id)
+            if monitor is None:
+                continue
+            print(
+                f"SLO burn for {monitor.name} {change.sli}: "
+                f"{change.severity or 'resolved'} ({change.burn_rate:.1f}x)"
+            )
+            await send_slo_burn_alert(
+                monitor_name=monitor.name,
+                url=str(monitor.url),
+                sli=change.sli,
+                severity=change.severity,
+                burn_rate=change.burn_rate,
+                window=_format_window(change.window),
+            )
+
+
+burn_rates = BurnRateEngine()
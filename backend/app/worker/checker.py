@@ -1,70 +1,161 @@
 import asyncio
 import time
+from collections.abc import AsyncIterator, Coroutine
 from datetime import datetime, timezone
 
 import httpx
-from sqlalchemy import select, desc
+from sqlalchemy import select
 
+from app.core.config import settings
 from app.core.db import async_session
-from app.models.monitor import Monitor
-from app.models.result import CheckResult
+from app.models.monitor import CONNECTION_COLD, PROBE_BODY, PROBE_HEAD, PROBE_HEADERS, Monitor
 from app.core.metrics import (
     updog_checks_total,
     updog_check_duration_seconds,
     updog_check_errors_total,
+    updog_check_phase_seconds,
     updog_last_check_up,
     updog_monitors_total,
 )
 from app.core.notifications import send_discord_alert
+from app.core.slo import SLODefinition
+from app.worker.confirm import Confirmer, record_incident
+from app.worker.http import PhaseTimer, clients, cold_transport, current_timer
+from app.worker.limits import HostLimiter, host_of
+from app.worker.state import state_table
+from app.worker.writer import ResultRecord, result_writer
 
 
-async def get_previous_state(db, monitor_id: int) -> bool | None:
-    result = await db.execute(
-        select(CheckResult)
-        .where(CheckResult.monitor_id == monitor_id)
-        .order_by(desc(CheckResult.checked_at))
-        .limit(1)
+limiter = HostLimiter(settings.check_max_concurrency, settings.check_per_host_concurrency)
+
+
+async def _probe(
+    monitor: Monitor, client: httpx.AsyncClient, timeout: float, timer: PhaseTimer
+) -> tuple[httpx.Response, AsyncIterator[bytes]]:
+    """Send the monitor's probe, timing no more body than its mode needs.
+
+    Returns at the "probe.complete" mark with the response still open, along
+    with the rest of its body, for `_release` to deal with.
+    """
+    mode = monitor.probe_mode or PROBE_HEADERS
+    request = client.build_request(
+        "HEAD" if mode == PROBE_HEAD else "GET",
+        str(monitor.url),
+        timeout=timeout,
+        extensions={"trace": timer.trace},
     )
-    last_check = result.scalar_one_or_none()
-    return last_check.is_up if last_check else None
+    response = await client.send(request, stream=True)
+    rest = response.aiter_raw()
+    try:
+        if mode == PROBE_BODY:
+            cap = monitor.max_body_bytes or settings.check_max_body_bytes
+            received = 0
+            async for chunk in rest:
+                received += len(chunk)
+                if received >= cap:
+                    break
+            timer.mark("body.complete")
+    except BaseException:
+        await response.aclose()
+        raise
+    timer.mark("probe.complete")
+    return response, rest
+
 
+def _drainable(monitor: Monitor, response: httpx.Response) -> bool:
+    """Whether what's left of a response is known to be small enough to read."""
+    if monitor.connection_mode == CONNECTION_COLD:
+        return False  # Its connection is never reused
+    if response.request.method == "HEAD":
+        return True
+    length = response.headers.get("content-length")
+    return length is not None and length.isdigit() and int(length) <= settings.check_drain_bytes
 
-async def _do_check(monitor: Monitor, client: httpx.AsyncClient) -> CheckResult:
+
+async def _read_to_end(chunks: AsyncIterator[bytes]) -> None:
+    async for _ in chunks:
+        pass
+
+
+async def _release(
+    monitor: Monitor, response: httpx.Response, rest: AsyncIterator[bytes], timeout: float
+) -> None:
+    """Close a probe's response, reading a small remainder first so its connection is pooled.
+
+    httpcore only reuses a connection whose response was read to the end.
+    Best effort and after the check is recorded: a body of unknown or large
+    size, or one that stalls, is closed instead, dropping the connection.
+    """
+    try:
+        if _drainable(monitor, response):
+            await asyncio.wait_for(_read_to_end(rest), timeout)
+    except Exception:
+        pass  # Closing below drops the connection instead
+    try:
+        await response.aclose()
+    except Exception as e:
+        print(f"Failed to close response from {monitor.url}: {e}")
+
+
+async def _do_check(monitor: Monitor, client: httpx.AsyncClient) -> ResultRecord:
+    timeout = monitor.timeout_seconds or settings.check_timeout_seconds
+    slo = SLODefinition.for_monitor(monitor)
+    timer = PhaseTimer()
+    token = current_timer.set(timer)
     try:
         start = time.monotonic()
-        response = await client.get(str(monitor.url))
-        elapsed_ms = int((time.monotonic() - start) * 1000)
+        try:
+            response, rest = await asyncio.wait_for(
+                _probe(monitor, client, timeout, timer), timeout
+            )
+        except asyncio.TimeoutError:
+            raise httpx.TimeoutException(f"Check timed out after {timeout:g}s") from None
+        status_code = response.status_code
+        elapsed_ms = int((timer.marks["probe.complete"] - start) * 1000)
+        phases = timer.phases()
+        # Outside the timeout and the timing, so it can't change the result
+        await _release(monitor, response, rest, timeout)
 
-        result = CheckResult(
+        result = ResultRecord(
             monitor_id=monitor.id,
-            status_code=response.status_code,
+            status_code=status_code,
             response_time_ms=elapsed_ms,
-            is_up=response.status_code < 400,
+            is_up=status_code < 400,
             checked_at=datetime.now(timezone.utc),
+            latency_threshold_ms=slo.latency_threshold_ms,
+            availability_target=slo.availability_target,
+            latency_target=slo.latency_target,
+            **{f"{phase}_ms": ms for phase, ms in phases.items()},
         )
 
         status = "up" if result.is_up else "down"
         updog_checks_total.labels(
             monitor_id=str(monitor.id),
             status=status,
-            status_code=str(response.status_code),
+            status_code=str(status_code),
         ).inc()
         updog_check_duration_seconds.labels(monitor_id=str(monitor.id)).observe(
             elapsed_ms / 1000
         )
+        for phase, ms in phases.items():
+            if ms is not None:
+                updog_check_phase_seconds.labels(phase=phase).observe(ms / 1000)
         updog_last_check_up.labels(
             monitor_id=str(monitor.id), monitor_name=monitor.name
         ).set(1 if result.is_up else 0)
 
         return result
     except Exception as e:
-        result = CheckResult(
+        result = ResultRecord(
             monitor_id=monitor.id,
             status_code=None,
             response_time_ms=None,
             is_up=False,
             checked_at=datetime.now(timezone.utc),
             error_message=str(e),
+            latency_threshold_ms=slo.latency_threshold_ms,
+            availability_target=slo.availability_target,
+            latency_target=slo.latency_target,
         )
 
         error_type = type(e).__name__
@@ -79,63 +170,124 @@ async def _do_check(monitor: Monitor, client: httpx.AsyncClient) -> CheckResult:
         ).set(0)
 
         return result
+    finally:
+        current_timer.reset(token)
 
 
-async def check_url(monitor: Monitor, client: httpx.AsyncClient | None = None) -> CheckResult:
+async def check_url(
+    monitor: Monitor,
+    client: httpx.AsyncClient | None = None,
+    limiter: HostLimiter | None = None,
+) -> ResultRecord:
+    if limiter is not None:
+        # Response time is measured only once a slot is held
+        async with limiter.slot(host_of(str(monitor.url))):
+            return await check_url(monitor, client)
     if client is not None:
         return await _do_check(monitor, client)
-    async with httpx.AsyncClient(timeout=30.0) as c:  # TODO: configurable timeout per monitor
+    async with httpx.AsyncClient(
+        timeout=settings.check_timeout_seconds, transport=cold_transport()
+    ) as c:
         return await _do_check(monitor, c)
 
 
-async def run_checks():
-    async with async_session() as db:
-        # Get all active monitors
-        result = await db.execute(select(Monitor).where(Monitor.is_active.is_(True)))
-        monitors = result.scalars().all()
+async def confirm_transition(
+    monitor: Monitor, first: ResultRecord, latest: ResultRecord | None = None
+) -> None:
+    """Persist a confirmed state change and alert on it.
+
+    `first` is the result that showed the change, `latest` the last re-check.
+    """
+    latest = latest or first
+    previous_up = state_table.update(latest)
+    before = "new" if previous_up is None else "UP" if previous_up else "DOWN"
+    print(f"State change for {monitor.name}: {before} → {'UP' if latest.is_up else 'DOWN'}")
+    try:
+        await record_incident(first)
+    except Exception as e:
+        print(f"Failed to record incident for {monitor.name}: {e}")
+
+    await send_discord_alert(
+        monitor_name=monitor.name,
+        url=str(monitor.url),
+        is_up=latest.is_up,
+        error_message=latest.error_message,
+        response_time_ms=latest.response_time_ms,
+    )
 
+
+def process_result(monitor: Monitor, check_result: ResultRecord) -> Coroutine | None:
+    """Buffer a result for writing and return an alert if the monitor changed state.
+
+    A monitor's first result counts as a change only when it is DOWN, so a
+    monitor that has never been up still gets an incident. With
+    CONFIRM_RETRIES set, a change is handed to the confirmer instead and only
+    alerted once its re-checks agree.
+    """
+    result_writer.add(check_result)
+
+    if confirmer.is_pending(monitor.id):
+        return None  # The re-checks already in flight decide this one
+
+    previous_up = state_table.is_up(monitor.id)
+    if previous_up == check_result.is_up or (previous_up is None and check_result.is_up):
+        state_table.update(check_result)
+        return None
+
+    if settings.confirm_retries > 0:
+        confirmer.start(monitor, check_result)
+        return None
+    return confirm_transition(monitor, check_result)
+
+
+async def recheck(monitor: Monitor) -> ResultRecord:
+    """Check one monitor outside a sweep, sharing the sweep's client and limits."""
+    return await check_url(monitor, clients.client_for(monitor), limiter)
+
+
+confirmer = Confirmer(
+    recheck,
+    confirm_transition,
+    retries=settings.confirm_retries,
+    backoff=settings.confirm_backoff_seconds,
+)
+
+
+async def run_checks(monitors: list[Monitor] | None = None) -> list[ResultRecord]:
+    """Check a batch of monitors, or every active monitor when none are given.
+
+    Returns the batch's results so the scheduler can adapt intervals.
+    """
+    if monitors is None:
+        async with async_session() as db:
+            result = await db.execute(select(Monitor).where(Monitor.is_active.is_(True)))
+            monitors = result.scalars().all()
         updog_monitors_total.labels(state="active").set(len(monitors))
 
-        if not monitors:
-            print("No active monitors to check")
-            return
-
-        print(f"Checking {len(monitors)} monitors...")
-
-        # Get previous states before running checks
-        previous_states = {}
-        for monitor in monitors:
-            previous_states[monitor.id] = await get_previous_state(db, monitor.id)
-
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            tasks = [check_url(monitor, client) for monitor in monitors]
-            results = await asyncio.gather(*tasks)
-
-        alert_tasks = []
-        for monitor, check_result in zip(monitors, results):
-            db.add(check_result)
-
-            previous_up = previous_states.get(monitor.id)
-
-            if previous_up is not None and previous_up != check_result.is_up:
-                print(
-                    f"State change for {monitor.name}: "
-                    f"{'UP' if previous_up else 'DOWN'} → "
-                    f"{'UP' if check_result.is_up else 'DOWN'}"
-                )
-                alert_tasks.append(
-                    send_discord_alert(
-                        monitor_name=monitor.name,
-                        url=str(monitor.url),
-                        is_up=check_result.is_up,
-                        error_message=check_result.error_message,
-                        response_time_ms=check_result.response_time_ms,
-                    )
-                )
-
-        await db.commit()
-        print(f"Saved {len(results)} check results")
-
-        if alert_tasks:
-            await asyncio.gather(*alert_tasks)
-            print(f"Sent {len(alert_tasks)} alerts")
+    if not monitors:
+        print("No active monitors to check")
+        return []
+
+    print(f"Checking {len(monitors)} monitors...")
+
+    await state_table.ensure_warm()
+
+    by_id = {monitor.id: monitor for monitor in monitors}
+    alert_tasks = []
+    results = []
+    tasks = [check_url(monitor, clients.client_for(monitor), limiter) for monitor in monitors]
+    # Handle each result as soon as it lands, so one hung target can't hold
+    # back writes and alerts for the rest of the batch
+    for next_result in asyncio.as_completed(tasks):
+        check_result = await next_result
+        results.append(check_result)
+        alert = process_result(by_id[check_result.monitor_id], check_result)
+        if alert is not None:
+            alert_tasks.append(asyncio.create_task(alert))
+
+    print(f"Queued {len(monitors)} check results for writing")
+
+    if alert_tasks:
+        await asyncio.gather(*alert_tasks)
+        print(f"Sent {len(alert_tasks)} alerts")
+    return results
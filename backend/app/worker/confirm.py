@@ -0,0 +1,99 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import update
+
+from app.core.db import async_session
+from app.core.metrics import updog_state_changes_total
+from app.models.incident import Incident
+from app.models.monitor import Monitor
+from app.models.rollup import naive_utc
+from app.worker.writer import ResultRecord, result_writer
+
+
+async def record_incident(result: ResultRecord) -> None:
+    """Open an incident on a confirmed DOWN, resolve open ones on a confirmed UP."""
+    # incidents timestamps are naive UTC, like check_results.checked_at
+    at = naive_utc(result.checked_at)
+
+    async with async_session() as db:
+        if result.is_up:
+            await db.execute(
+                update(Incident)
+                .where(Incident.monitor_id == result.monitor_id, Incident.resolved_at.is_(None))
+                .values(resolved_at=at)
+            )
+        else:
+            db.add(
+                Incident(
+                    monitor_id=result.monitor_id,
+                    started_at=at,
+                    error_message=result.error_message,
+                )
+            )
+        await db.commit()
+
+
+class Confirmer:
+    """Re-checks a monitor right away when a sweep sees it change state.
+
+    The transition is only passed to `on_confirmed` if every one of `retries`
+    re-checks agrees with it; a single disagreeing re-check rejects it. Re-checks
+    run outside the sweep, so a confirmed DOWN takes seconds, not an interval.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[Monitor], Awaitable[ResultRecord]],
+        on_confirmed: Callable[[Monitor, ResultRecord, ResultRecord], Awaitable[None]],
+        retries: int,
+        backoff: float,
+    ):
+        self._check = check
+        self._on_confirmed = on_confirmed
+        self.retries = retries
+        self.backoff = backoff
+        self._pending: dict[int, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def is_pending(self, monitor_id: int) -> bool:
+        return monitor_id in self._pending
+
+    def start(self, monitor: Monitor, candidate: ResultRecord) -> None:
+        """Begin confirming `candidate`, unless the monitor is already being confirmed."""
+        if monitor.id in self._pending:
+            return
+        task = asyncio.create_task(self._confirm(monitor, candidate))
+        self._pending[monitor.id] = task
+        task.add_done_callback(lambda _: self._pending.pop(monitor.id, None))
+
+    async def _confirm(self, monitor: Monitor, candidate: ResultRecord) -> None:
+        latest = candidate
+        delay = self.backoff
+        try:
+            for attempt in range(1, self.retries + 1):
+                await asyncio.sleep(delay)
+                delay *= 2
+                latest = await self._check(monitor)
+                result_writer.add(latest)
+                if latest.is_up != candidate.is_up:
+                    updog_state_changes_total.labels(result="rejected").inc()
+                    print(
+                        f"State change for {monitor.name} not confirmed "
+                        f"(re-check {attempt} of {self.retries} disagreed)"
+                    )
+                    return
+
+            updog_state_changes_total.labels(result="confirmed").inc()
+            await self._on_confirmed(monitor, candidate, latest)
+        except Exception as e:
+            print(f"Failed to confirm state change for {monitor.name}: {e}")
+
+    async def stop(self) -> None:
+        """Abandon pending confirmations; the next sweep will see the change again."""
+        tasks = list(self._pending.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
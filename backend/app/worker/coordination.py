@@ -0,0 +1,138 @@
+import asyncio
+import bisect
+import hashlib
+import os
+import socket
+import uuid
+from collections.abc import Callable, Iterable
+from datetime import timedelta
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.metrics import updog_worker_members
+from app.models.lease import WorkerLease
+from app.models.rollup import utc_naive_now
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hash ring with virtual nodes.
+
+    Adding or removing a worker only moves the monitors that hash next to it.
+    """
+
+    def __init__(self, nodes: Iterable[str], vnodes: int = 64):
+        points = sorted((_hash(f"{node}#{i}"), node) for node in nodes for i in range(vnodes))
+        self._keys = [key for key, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, monitor_id: int) -> str | None:
+        if not self._keys:
+            return None
+        index = bisect.bisect(self._keys, _hash(f"monitor:{monitor_id}")) % len(self._keys)
+        return self._nodes[index]
+
+
+class Coordinator:
+    """Shards monitors across live workers using a leases table.
+
+    Each worker heartbeats its lease row. Workers whose lease is fresher than
+    `lease_ttl_seconds` form the ring; a worker that stops heartbeating drops
+    out and its monitors move to the survivors on their next heartbeat.
+    """
+
+    def __init__(self, worker_id: str | None = None):
+        self.worker_id = worker_id or settings.worker_id or (
+            f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        )
+        self.on_change: Callable[[], None] | None = None
+        self._members: tuple[str, ...] = ()
+        self._ring = HashRing([])
+        self._stopping = asyncio.Event()
+        self.set_members([self.worker_id])
+
+    @property
+    def members(self) -> tuple[str, ...]:
+        return self._members
+
+    @property
+    def is_leader(self) -> bool:
+        """One live worker, the lowest id, runs fleet-wide housekeeping."""
+        return self._members[0] == self.worker_id
+
+    def owns(self, monitor_id: int) -> bool:
+        return self._ring.node_for(monitor_id) == self.worker_id
+
+    def set_members(self, members: Iterable[str]) -> bool:
+        """Rebuild the ring; returns True if membership changed."""
+        members = tuple(sorted(set(members) | {self.worker_id}))
+        if members == self._members:
+            return False
+        self._members = members
+        self._ring = HashRing(members, settings.coordination_vnodes)
+        updog_worker_members.set(len(members))
+        return True
+
+    async def heartbeat(self) -> bool:
+        now = utc_naive_now()
+        async with async_session() as db:
+            stmt = insert(WorkerLease).values(
+                worker_id=self.worker_id,
+                hostname=socket.gethostname(),
+                started_at=now,
+                heartbeat_at=now,
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[WorkerLease.worker_id],
+                    set_={"heartbeat_at": stmt.excluded.heartbeat_at},
+                )
+            )
+            # Leases long past their TTL are from workers that died without leaving
+            await db.execute(
+                delete(WorkerLease).where(
+                    WorkerLease.heartbeat_at < now - timedelta(seconds=settings.lease_ttl_seconds * 10)
+                )
+            )
+            result = await db.execute(
+                select(WorkerLease.worker_id).where(
+                    WorkerLease.heartbeat_at >= now - timedelta(seconds=settings.lease_ttl_seconds)
+                )
+            )
+            live = result.scalars().all()
+            await db.commit()
+
+        changed = self.set_members(live)
+        if changed:
+            print(f"Worker ring changed: {len(self._members)} live workers")
+        return changed
+
+    async def run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                if await self.heartbeat() and self.on_change:
+                    self.on_change()
+            except Exception as e:
+                print(f"Worker heartbeat failed: {e}")
+            try:
+                await asyncio.wait_for(
+                    self._stopping.wait(), timeout=settings.lease_heartbeat_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def leave(self) -> None:
+        """Give up our lease so other workers take over our monitors right away."""
+        self._stopping.set()
+        try:
+            async with async_session() as db:
+                await db.execute(delete(WorkerLease).where(WorkerLease.worker_id == self.worker_id))
+                await db.commit()
+        except Exception as e:
+            print(f"Failed to release worker lease: {e}")
@@ -0,0 +1,219 @@
+import asyncio
+import ipaddress
+import socket
+import time
+from contextvars import ContextVar
+
+import httpcore
+import httpx
+
+from app.core.config import settings
+from app.core.metrics import updog_dns_cache_total
+from app.models.monitor import CONNECTION_COLD, Monitor
+
+
+PHASES = ("dns", "connect", "tls", "ttfb", "transfer")
+
+
+class PhaseTimer:
+    """Collects httpcore trace events for one check and turns them into phase timings.
+
+    Phases that didn't happen, like connect and TLS on a reused connection, are None.
+    """
+
+    __slots__ = ("marks", "dns_ms")
+
+    def __init__(self):
+        self.marks: dict[str, float] = {}
+        self.dns_ms: int | None = None
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.monotonic()
+
+    async def trace(self, event: str, info: dict) -> None:
+        # "http11.send_request_headers.started" -> "send_request_headers.started"
+        self.marks[event.split(".", 1)[1]] = time.monotonic()
+
+    def _span(self, start: str, end: str) -> int | None:
+        if start not in self.marks or end not in self.marks:
+            return None
+        return int((self.marks[end] - self.marks[start]) * 1000)
+
+    def phases(self) -> dict[str, int | None]:
+        connect_ms = self._span("connect_tcp.started", "connect_tcp.complete")
+        if connect_ms is not None and self.dns_ms is not None:
+            connect_ms = max(connect_ms - self.dns_ms, 0)
+        return {
+            "dns": self.dns_ms,
+            "connect": connect_ms,
+            "tls": self._span("start_tls.started", "start_tls.complete"),
+            "ttfb": self._span("send_request_headers.started", "receive_response_headers.complete"),
+            "transfer": self._span("receive_response_headers.complete", "body.complete"),
+        }
+
+
+# Timer of the check running in the current task, for the DNS backend to report into
+current_timer: ContextVar[PhaseTimer | None] = ContextVar("current_timer", default=None)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def _dnspython_available() -> bool:
+    try:
+        import dns.asyncresolver  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """Network backend that resolves hostnames through a cache honouring record TTLs.
+
+    Answers are looked up with dnspython, which returns each record's TTL.
+    An answer is cached for that TTL, but never longer than `ttl`
+    (DNS_CACHE_TTL_SECONDS). Names that only the system resolver knows, like
+    /etc/hosts entries, fall back to getaddrinfo and are cached for `ttl`.
+    TLS still uses the hostname for SNI.
+    """
+
+    def __init__(self, ttl: float, backend: httpcore.AsyncNetworkBackend | None = None):
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: dict[tuple[str, int], tuple[float, str]] = {}
+        self._dnspython = ttl > 0 and _dnspython_available()
+
+    async def _lookup(self, host: str, port: int) -> tuple[str, float | None]:
+        """The address to connect to, and its record TTL when known."""
+        if self._dnspython:
+            import dns.asyncresolver
+            import dns.exception
+
+            for rdtype in ("A", "AAAA"):
+                try:
+                    answer = await dns.asyncresolver.resolve(host, rdtype)
+                except dns.exception.DNSException:
+                    continue
+                return answer[0].address, answer.rrset.ttl
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        return infos[0][4][0], None
+
+    async def resolve(self, host: str, port: int) -> str:
+        if _is_ip(host):
+            return host
+        key = (host, port)
+        start = time.monotonic()
+        cached = self._cache.get(key)
+        if cached and cached[0] > start:
+            updog_dns_cache_total.labels(result="hit").inc()
+            address = cached[1]
+        else:
+            updog_dns_cache_total.labels(result="miss").inc()
+            address, record_ttl = await self._lookup(host, port)
+            ttl = self.ttl if record_ttl is None else min(record_ttl, self.ttl)
+            self._cache[key] = (time.monotonic() + ttl, address)
+
+        timer = current_timer.get()
+        if timer is not None:
+            timer.dns_ms = int((time.monotonic() - start) * 1000)
+        return address
+
+    async def connect_tcp(
+        self, host, port, timeout=None, local_address=None, socket_options=None
+    ) -> httpcore.AsyncNetworkStream:
+        address = await self.resolve(host, port)
+        return await self._backend.connect_tcp(
+            address, port, timeout=timeout, local_address=local_address,
+            socket_options=socket_options,
+        )
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class PooledTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connection pool uses our DNS-caching backend."""
+
+    def __init__(self, network_backend: httpcore.AsyncNetworkBackend, http2: bool, limits: httpx.Limits):
+        super().__init__(http2=http2, limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+
+def cold_transport() -> PooledTransport:
+    """Transport for a single cold check: no DNS cache, no kept-alive connections."""
+    return PooledTransport(
+        CachingDNSBackend(ttl=0), http2=False, limits=httpx.Limits(max_keepalive_connections=0)
+    )
+
+
+class ClientPool:
+    """HTTP clients owned by the worker.
+
+    Warm monitors share one long-lived client, so connections, TLS sessions and
+    DNS answers carry over between checks. Cold monitors get a fresh client per
+    check and always pay for DNS, connect and TLS.
+    """
+
+    def __init__(self):
+        self.dns = CachingDNSBackend(settings.dns_cache_ttl_seconds)
+        self._warm: httpx.AsyncClient | None = None
+
+    @property
+    def warm(self) -> httpx.AsyncClient:
+        if self._warm is None:
+            http2 = settings.check_http2 and _http2_available()
+            if settings.check_http2 and not http2:
+                print("HTTP/2 disabled - install h2 to enable it")
+            limits = httpx.Limits(
+                # The limiter already bounds concurrency; never make checks wait on the pool
+                max_connections=settings.check_max_concurrency,
+                max_keepalive_connections=settings.check_max_concurrency,
+                keepalive_expiry=settings.check_keepalive_seconds,
+            )
+            self._warm = httpx.AsyncClient(
+                transport=PooledTransport(self.dns, http2=http2, limits=limits),
+                timeout=settings.check_timeout_seconds,
+            )
+        return self._warm
+
+    def client_for(self, monitor: Monitor) -> httpx.AsyncClient | None:
+        """The shared client, or None when the monitor measures cold connections."""
+        if monitor.connection_mode == CONNECTION_COLD:
+            return None
+        return self.warm
+
+    async def aclose(self) -> None:
+        if self._warm is not None:
+            await self._warm.aclose()
+            self._warm = None
+
+
+clients = ClientPool()
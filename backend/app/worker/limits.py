@@ -0,0 +1,52 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlsplit
+
+from app.core.metrics import updog_check_queue_seconds, updog_checks_queued
+
+
+def host_of(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+class HostLimiter:
+    """Global check budget plus a per-target-host cap.
+
+    Time spent waiting here is reported separately from response time, so a
+    saturated worker shows up as queueing instead of as slow targets.
+    """
+
+    def __init__(self, max_concurrency: int, per_host: int):
+        self._global = asyncio.Semaphore(max_concurrency)
+        self._per_host = per_host
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+        self._users: dict[str, int] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str) -> AsyncIterator[float]:
+        """Hold one check slot for `host`; yields seconds spent queued."""
+        host_sem = self._hosts.get(host)
+        if host_sem is None:
+            host_sem = self._hosts[host] = asyncio.Semaphore(self._per_host)
+        self._users[host] = self._users.get(host, 0) + 1
+
+        start = time.monotonic()
+        updog_checks_queued.inc()
+        try:
+            # Host first, so a busy host can't tie up global slots while it waits
+            async with host_sem:
+                async with self._global:
+                    updog_checks_queued.dec()
+                    queued = time.monotonic() - start
+                    updog_check_queue_seconds.observe(queued)
+                    start = None
+                    yield queued
+        finally:
+            if start is not None:
+                updog_checks_queued.dec()
+            self._users[host] -= 1
+            if not self._users[host]:
+                del self._users[host]
+                del self._hosts[host]
@@ -0,0 +1,170 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.db import engine
+from app.core.metrics import updog_rollups_written_total
+from app.core.rollups import recompute_latency_good
+from app.core.slo import MAX_WINDOW_DAYS
+from app.core.sketch import DDSketch
+from app.models.rollup import COUNTER_COLUMNS, LATENCY_BUCKETS_MS, RESOLUTIONS, CheckRollup, bucket_start
+
+RollupKey = tuple[int, int, datetime]  # monitor_id, bucket_seconds, bucket_start
+
+
+def counters_for(record) -> list[int]:
+    """One result's contribution to a bucket, in COUNTER_COLUMNS order."""
+    ms = record.response_time_ms
+    return [
+        1,
+        1 if record.is_up else 0,
+        0 if ms is None else 1,
+        ms or 0,
+        0 if ms is None or ms > record.latency_threshold_ms else 1,
+        *(0 if ms is None or ms > bound else 1 for bound in LATENCY_BUCKETS_MS),
+    ]
+
+
+@dataclass(slots=True)
+class PendingBucket:
+    counters: list[int] = field(default_factory=lambda: [0] * len(COUNTER_COLUMNS))
+    sketch: DDSketch = field(default_factory=DDSketch)
+
+    def merge(self, other: "PendingBucket") -> None:
+        for i, value in enumerate(other.counters):
+            self.counters[i] += value
+        self.sketch.merge(other.sketch)
+
+
+class RollupBuffer:
+    """Minute, hour and day counters and latency sketches accumulated between flushes.
+
+    Each flush upserts only the counter deltas, adding them onto whatever the
+    bucket already holds, so any number of workers can feed the same buckets.
+    Sketches can't be added in SQL, so they are read, merged and written back
+    under a row lock in the same transaction. When a monitor's SLO latency
+    threshold changes, its latency_good counts are recounted from raw results
+    right after a flush, once deltas counted the old way are written.
+    """
+
+    def __init__(self):
+        self._pending: dict[RollupKey, PendingBucket] = {}
+        # monitor_id -> new SLO latency threshold whose latency_good needs recounting
+        self._recompute: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def request_recompute(self, monitor_id: int, threshold_ms: int) -> None:
+        """Recount the monitor's latency_good against a new threshold after the next flush."""
+        self._recompute[monitor_id] = threshold_ms
+
+    async def _recount(self, monitor_id: int, threshold_ms: int) -> None:
+        await recompute_latency_good(monitor_id, threshold_ms, MAX_WINDOW_DAYS)
+
+    def _bucket(self, key: RollupKey) -> PendingBucket:
+        bucket = self._pending.get(key)
+        if bucket is None:
+            bucket = self._pending[key] = PendingBucket()
+        return bucket
+
+    def add(self, record) -> None:
+        counters = counters_for(record)
+        for seconds in RESOLUTIONS:
+            bucket = self._bucket(
+                (record.monitor_id, seconds, bucket_start(record.checked_at, seconds))
+            )
+            for i, value in enumerate(counters):
+                bucket.counters[i] += value
+            if record.response_time_ms is not None:
+                bucket.sketch.add(record.response_time_ms)
+
+    async def _upsert(self, pending: dict[RollupKey, PendingBucket]) -> None:
+        # Sorted keys take row locks in the same order in every worker
+        keys = sorted(pending)
+        stmt = insert(CheckRollup)
+        async with engine.begin() as conn:
+            # Create missing buckets first so every sketch below is read under a lock
+            await conn.execute(
+                stmt.on_conflict_do_nothing(),
+                [
+                    {"monitor_id": monitor_id, "bucket_seconds": seconds, "bucket_start": start}
+                    for monitor_id, seconds, start in keys
+                ],
+            )
+            stored = await conn.execute(
+                select(
+                    CheckRollup.monitor_id,
+                    CheckRollup.bucket_seconds,
+                    CheckRollup.bucket_start,
+                    CheckRollup.latency_sketch,
+                )
+                .where(
+                    tuple_(
+                        CheckRollup.monitor_id, CheckRollup.bucket_seconds, CheckRollup.bucket_start
+                    ).in_(keys)
+                )
+                .order_by(CheckRollup.monitor_id, CheckRollup.bucket_seconds, CheckRollup.bucket_start)
+                .with_for_update()
+            )
+            sketches = {}
+            for monitor_id, seconds, start, data in stored:
+                if data is None:
+                    continue
+                sketch = DDSketch.from_bytes(data)
+                sketch.merge(pending[(monitor_id, seconds, start)].sketch)
+                sketches[(monitor_id, seconds, start)] = sketch
+
+            rows = []
+            for key in keys:
+                sketch = sketches.get(key, pending[key].sketch)
+                rows.append({
+                    "monitor_id": key[0],
+                    "bucket_seconds": key[1],
+                    "bucket_start": key[2],
+                    **dict(zip(COUNTER_COLUMNS, pending[key].counters)),
+                    "latency_sketch": sketch.to_bytes() if sketch else None,
+                })
+            await conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["monitor_id", "bucket_seconds", "bucket_start"],
+                    set_={
+                        **{
+                            column: getattr(CheckRollup, column) + getattr(stmt.excluded, column)
+                            for column in COUNTER_COLUMNS
+                        },
+                        "latency_sketch": stmt.excluded.latency_sketch,
+                    },
+                ),
+                rows,
+            )
+
+    async def flush(self) -> int:
+        written = 0
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            try:
+                await self._upsert(pending)
+            except Exception as e:
+                # Keep the deltas for the next flush; recounts wait for them too
+                for key, bucket in pending.items():
+                    self._bucket(key).merge(bucket)
+                print(f"Failed to write {len(pending)} rollup buckets: {e}")
+                return 0
+            updog_rollups_written_total.inc(len(pending))
+            written = len(pending)
+
+        for monitor_id, threshold_ms in list(self._recompute.items()):
+            try:
+                await self._recount(monitor_id, threshold_ms)
+            except Exception as e:
+                print(f"Failed to recount latency for monitor {monitor_id}: {e}")
+                continue
+            if self._recompute.get(monitor_id) == threshold_ms:
+                del self._recompute[monitor_id]
+        return written
+
+
+rollup_buffer = RollupBuffer()
@@ -0,0 +1,122 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timezone
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.core.cache import slo_cache
+from app.core.compaction import run_compaction
+from app.core.config import settings
+from app.core.retention import run_retention
+from app.core.slo import LATENCY_SLO_MS
+from app.models.monitor import Monitor
+from app.worker.burn import burn_rates
+from app.worker.checker import confirmer, run_checks
+from app.worker.coordination import Coordinator
+from app.worker.http import clients
+from app.worker.rollups import rollup_buffer
+from app.worker.scheduler import CheckScheduler
+from app.worker.state import state_table
+from app.worker.writer import result_writer
+
+
+class Worker:
+    """Check scheduler, result writer and housekeeping jobs.
+
+    Runs embedded in the API process (RUN_WORKER_IN_API) or standalone via
+    `python -m app.worker`.
+    """
+
+    def __init__(self):
+        self.coordinator = Coordinator() if settings.coordination_enabled else None
+        self.scheduler = CheckScheduler(
+            run_checks,
+            owns=self.coordinator.owns if self.coordinator else None,
+            workers=(lambda: len(self.coordinator.members)) if self.coordinator else None,
+            on_changed=self._monitor_changed,
+        )
+        self.housekeeping = AsyncIOScheduler()
+        self._tasks: list[asyncio.Task] = []
+
+    def sole_writer(self) -> bool:
+        """Whether this worker writes every result, so a process-local cache sees each change."""
+        return self.coordinator is None or self.coordinator.members == (self.coordinator.worker_id,)
+
+    def _rebalance(self) -> None:
+        # Peers' writes never invalidated local SLO reports
+        slo_cache.clear()
+        self._tasks.append(asyncio.create_task(self._reload_state()))
+
+    async def _reload_state(self) -> None:
+        # Re-warming reads the last result from the database; one still buffered
+        # would be missed there and look like a state change
+        await result_writer.flush()
+        # Newly owned monitors may have state written by another worker
+        state_table.invalidate()
+        burn_rates.invalidate()
+        self.scheduler.request_refresh()
+
+    def _monitor_changed(self, previous: Monitor, monitor: Monitor) -> None:
+        # This worker owns the monitor, so its rollup deltas and the recount can't interleave
+        if previous.slo_latency_threshold_ms != monitor.slo_latency_threshold_ms:
+            rollup_buffer.request_recompute(
+                monitor.id, monitor.slo_latency_threshold_ms or LATENCY_SLO_MS
+            )
+
+    def leader_only(self, job: Callable[[], Awaitable]) -> Callable[[], Awaitable]:
+        """Wrap a fleet-wide job so only one live worker runs it."""
+
+        async def run():
+            if self.coordinator is None or self.coordinator.is_leader:
+                return await job()
+
+        run.__name__ = job.__name__
+        return run
+
+    async def start(self) -> None:
+        if self.coordinator:
+            try:
+                await self.coordinator.heartbeat()
+            except Exception as e:
+                print(f"Worker heartbeat failed: {e}")
+            self.coordinator.on_change = self._rebalance
+            self._tasks.append(asyncio.create_task(self.coordinator.run()))
+
+        self.housekeeping.add_job(
+            self.leader_only(run_retention),
+            "interval",
+            hours=1,
+            id="result_retention",
+            next_run_time=datetime.now(timezone.utc),
+        )
+        self.housekeeping.add_job(
+            self.leader_only(run_compaction),
+            "interval",
+            hours=1,
+            id="rollup_compaction",
+        )
+        if settings.burn_rate_alerts_enabled:
+            # Each worker evaluates the monitors it checks
+            self.housekeeping.add_job(
+                burn_rates.tick,
+                "interval",
+                seconds=settings.burn_rate_eval_seconds,
+                id="burn_rate_alerts",
+            )
+        self.housekeeping.start()
+
+        self._tasks.append(asyncio.create_task(self.scheduler.run()))
+        self._tasks.append(asyncio.create_task(result_writer.run()))
+        print("Worker started - checking each monitor on its own interval")
+
+    async def stop(self) -> None:
+        """Stop scheduling, drain in-flight checks, then flush buffered results."""
+        self.housekeeping.shutdown(wait=False)
+        await self.scheduler.stop(timeout=settings.worker_drain_timeout_seconds)
+        await confirmer.stop()
+        await result_writer.stop()
+        await clients.aclose()
+        if self.coordinator:
+            await self.coordinator.leave()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        print("Worker stopped")
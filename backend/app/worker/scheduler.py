@@ -0,0 +1,300 @@
+import asyncio
+import heapq
+import math
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.db import async_session
+from app.core.metrics import (
+    updog_monitors_total,
+    updog_scheduler_due_queue_depth,
+    updog_scheduler_lag_seconds,
+    updog_scheduler_tightened_monitors,
+    updog_worker_owned_monitors,
+)
+from app.models.monitor import Monitor
+
+# Golden-ratio stepping spreads consecutive monitor ids evenly over an interval
+_PHASE_STEP = (math.sqrt(5) - 1) / 2
+
+
+def phase_offset(monitor_id: int, interval: float) -> float:
+    """Stable offset of a monitor inside its interval, so checks don't all fire at once."""
+    return ((monitor_id * _PHASE_STEP) % 1.0) * interval
+
+
+def next_slot(now: float, interval: float, phase: float) -> float:
+    """First slot on the monitor's interval grid strictly after `now`."""
+    return phase + (math.floor((now - phase) / interval) + 1) * interval
+
+
+class CheckScheduler:
+    """Min-heap of next-due times, one entry per active monitor.
+
+    `dispatch` is awaited with each batch of monitors that came due together
+    and may return the batch's results, which drive adaptive intervals. Slots
+    are aligned to wall-clock time, so phases survive restarts.
+
+    With MAX_CHECKS_PER_SECOND set, a token bucket caps how fast checks start;
+    monitors past the ceiling stay due and go out as tokens refill. The
+    ceiling is fleet-wide: `workers`, when given, returns how many live
+    workers share it, and each refills at an even share.
+
+    `on_changed`, when given, is called with the old and new version of every
+    monitor a sync reloads, so settings other than scheduling can be acted on.
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[list[Monitor]], Awaitable[list | None]],
+        clock: Callable[[], float] = time.time,
+        owns: Callable[[int], bool] | None = None,
+        workers: Callable[[], int] | None = None,
+        on_changed: Callable[[Monitor, Monitor], None] | None = None,
+    ):
+        self._dispatch = dispatch
+        self._clock = clock
+        self._owns = owns
+        self._workers = workers
+        self._on_changed = on_changed
+        self._refresh_requested = False
+        self._heap: list[tuple[float, int]] = []
+        self._due_at: dict[int, float] = {}
+        self._monitors: dict[int, Monitor] = {}
+        self._in_flight: set[int] = set()
+        # Adaptive monitors on the failing interval -> UP checks since the last failure
+        self._tightened: dict[int, int] = {}
+        self._ceiling = settings.max_checks_per_second
+        self._tokens = max(self._rate, 1.0)
+        self._tokens_at = clock()
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+
+    @property
+    def _rate(self) -> float:
+        """This worker's share of the check ceiling; the ring splits monitors about evenly."""
+        if self._ceiling <= 0 or self._workers is None:
+            return self._ceiling
+        return self._ceiling / max(self._workers(), 1)
+
+    def interval_for(self, monitor: Monitor) -> float:
+        interval = monitor.interval_seconds or 0
+        if monitor.id in self._tightened:
+            interval = min(interval, settings.adaptive_interval_seconds)
+        return float(max(interval, settings.min_check_interval_seconds))
+
+    def _schedule(self, monitor_id: int, due: float) -> None:
+        self._due_at[monitor_id] = due
+        heapq.heappush(self._heap, (due, monitor_id))
+
+    def sync(self, monitors: list[Monitor]) -> None:
+        """Reconcile the heap with the current set of active monitors."""
+        now = self._clock()
+        seen = set()
+        for monitor in monitors:
+            seen.add(monitor.id)
+            previous = self._monitors.get(monitor.id)
+            self._monitors[monitor.id] = monitor
+            if previous is not None and self._on_changed is not None:
+                self._on_changed(previous, monitor)
+            if not monitor.adaptive:
+                self._tightened.pop(monitor.id, None)
+            if (
+                previous is None
+                or previous.interval_seconds != monitor.interval_seconds
+                or previous.adaptive != monitor.adaptive
+            ):
+                interval = self.interval_for(monitor)
+                self._schedule(
+                    monitor.id, next_slot(now, interval, phase_offset(monitor.id, interval))
+                )
+
+        # Removed monitors leave stale heap entries behind; pop_due skips them
+        for monitor_id in list(self._monitors):
+            if monitor_id not in seen:
+                del self._monitors[monitor_id]
+                self._due_at.pop(monitor_id, None)
+                self._tightened.pop(monitor_id, None)
+
+        updog_worker_owned_monitors.set(len(self._monitors))
+        updog_scheduler_tightened_monitors.set(len(self._tightened))
+        self._wakeup.set()
+
+    def observe(self, results) -> None:
+        """Tighten adaptive monitors that failed or ran over their SLO latency threshold.
+
+        Relaxes them again after enough healthy checks in a row.
+        """
+        now = self._clock()
+        for result in results:
+            monitor = self._monitors.get(result.monitor_id)
+            if monitor is None or not monitor.adaptive:
+                continue
+            before = self.interval_for(monitor)
+            slow = (
+                result.response_time_ms is not None
+                and result.response_time_ms > result.latency_threshold_ms
+            )
+            if not result.is_up or slow:
+                self._tightened[monitor.id] = 0
+            elif monitor.id in self._tightened:
+                self._tightened[monitor.id] += 1
+                if self._tightened[monitor.id] >= settings.adaptive_stable_checks:
+                    del self._tightened[monitor.id]
+
+            interval = self.interval_for(monitor)
+            if interval != before:
+                self._schedule(monitor.id, next_slot(now, interval, phase_offset(monitor.id, interval)))
+        updog_scheduler_tightened_monitors.set(len(self._tightened))
+        self._wakeup.set()
+
+    def _refill(self, now: float) -> None:
+        if self._rate > 0:
+            # One second of burst, so a ceiling below 1/s still lets checks through
+            self._tokens = min(
+                max(self._rate, 1.0), self._tokens + (now - self._tokens_at) * self._rate
+            )
+        self._tokens_at = now
+
+    def throttled_until(self, now: float) -> float | None:
+        """When the next check may start, if the ceiling is holding checks back now."""
+        if self._rate <= 0 or self._tokens >= 1:
+            return None
+        return now + (1 - self._tokens) / self._rate
+
+    def next_due(self) -> float | None:
+        while self._heap:
+            due, monitor_id = self._heap[0]
+            if self._due_at.get(monitor_id) == due:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def pop_due(self, now: float) -> list[Monitor]:
+        """Pop every monitor due at `now` and reschedule it one interval later."""
+        self._refill(now)
+        batch = []
+        while self._heap and self._heap[0][0] <= now:
+            due, monitor_id = self._heap[0]
+            if self._due_at.get(monitor_id) != due:
+                heapq.heappop(self._heap)
+                continue
+            if self._rate > 0 and self._tokens < 1:
+                break  # Over the ceiling: leave the rest due for the next pass
+            heapq.heappop(self._heap)
+
+            monitor = self._monitors[monitor_id]
+            interval = self.interval_for(monitor)
+            following = due + interval
+            if following <= now:
+                # Fell more than a whole interval behind: skip missed slots, don't burst
+                following = next_slot(now, interval, phase_offset(monitor_id, interval))
+            self._schedule(monitor_id, following)
+
+            updog_scheduler_lag_seconds.observe(now - due)
+            if monitor_id in self._in_flight:
+                continue  # Previous check still running
+            if self._rate > 0:
+                self._tokens -= 1
+            batch.append(monitor)
+        self._report_depth(now)
+        return batch
+
+    def waiting(self, now: float) -> int:
+        """Monitors due at or before `now` that haven't been dispatched, e.g. held by the ceiling.
+
+        Walks only the heap entries due by `now`, so it costs the backlog, not the fleet.
+        """
+        waiting = set()
+        stack = [0] if self._heap else []
+        while stack:
+            i = stack.pop()
+            due, monitor_id = self._heap[i]
+            if due > now:
+                continue  # Nothing below a later entry is due either
+            if self._due_at.get(monitor_id) == due and monitor_id not in self._in_flight:
+                waiting.add(monitor_id)
+            stack.extend(c for c in (2 * i + 1, 2 * i + 2) if c < len(self._heap))
+        return len(waiting)
+
+    def _report_depth(self, now: float) -> None:
+        updog_scheduler_due_queue_depth.set(self.waiting(now) + len(self._in_flight))
+
+    def _start(self, batch: list[Monitor]) -> None:
+        self._in_flight.update(m.id for m in batch)
+        self._report_depth(self._clock())
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: list[Monitor]) -> None:
+        try:
+            results = await self._dispatch(batch)
+            if results:
+                self.observe(results)
+        except Exception as e:
+            print(f"Check batch failed: {e}")
+        finally:
+            self._in_flight.difference_update(m.id for m in batch)
+            self._report_depth(self._clock())
+
+    async def refresh(self) -> None:
+        async with async_session() as db:
+            result = await db.execute(select(Monitor).where(Monitor.is_active.is_(True)))
+            monitors = result.scalars().all()
+        updog_monitors_total.labels(state="active").set(len(monitors))
+        if self._owns is not None:
+            monitors = [m for m in monitors if self._owns(m.id)]
+        self.sync(monitors)
+
+    def request_refresh(self) -> None:
+        """Reload monitors on the next loop, e.g. after the worker ring changed."""
+        self._refresh_requested = True
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        next_refresh = 0.0
+        while not self._stopping:
+            now = self._clock()
+            if now >= next_refresh or self._refresh_requested:
+                self._refresh_requested = False
+                try:
+                    await self.refresh()
+                except Exception as e:
+                    print(f"Failed to refresh monitors: {e}")
+                next_refresh = now + settings.scheduler_sync_seconds
+
+            batch = self.pop_due(self._clock())
+            if batch:
+                self._start(batch)
+
+            if self._refresh_requested:
+                continue
+            now = self._clock()
+            wake_at = min(next_refresh, self.next_due() or next_refresh)
+            if wake_at <= now:
+                wake_at = self.throttled_until(now) or wake_at
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(
+                    self._wakeup.wait(), timeout=max(wake_at - self._clock(), 0)
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """Stop scheduling and wait for in-flight checks, cancelling any past `timeout`."""
+        self._stopping = True
+        self._wakeup.set()
+        if not self._tasks:
+            return
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        if pending:
+            print(f"Cancelling {len(pending)} check batches still running")
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,104 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import select, true
+
+from app.core.db import async_session
+from app.models.monitor import Monitor
+from app.models.result import CheckResult
+
+
+@dataclass(slots=True)
+class LastState:
+    is_up: bool
+    checked_at: datetime
+    status_code: int | None = None
+    response_time_ms: int | None = None
+    error_message: str | None = None
+
+
+class StateTable:
+    """Authoritative monitor_id -> last result map for the worker.
+
+    Warmed once from the database, then kept current as results are produced,
+    so state-change detection never has to read check_results.
+    """
+
+    def __init__(self):
+        self._states: dict[int, LastState] = {}
+        self._warm_lock = asyncio.Lock()
+        self.warmed = False
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def get(self, monitor_id: int) -> LastState | None:
+        return self._states.get(monitor_id)
+
+    def is_up(self, monitor_id: int) -> bool | None:
+        state = self._states.get(monitor_id)
+        return state.is_up if state else None
+
+    def update(self, result) -> bool | None:
+        """Record a new result and return the monitor's previous up/down state."""
+        previous = self.is_up(result.monitor_id)
+        self._states[result.monitor_id] = LastState(
+            is_up=result.is_up,
+            checked_at=result.checked_at,
+            status_code=result.status_code,
+            response_time_ms=result.response_time_ms,
+            error_message=result.error_message,
+        )
+        return previous
+
+    def forget(self, monitor_id: int) -> None:
+        self._states.pop(monitor_id, None)
+
+    def invalidate(self) -> None:
+        """Drop everything and re-warm on next use, e.g. after monitors changed owner."""
+        self._states.clear()
+        self.warmed = False
+
+    async def warm(self, db) -> None:
+        """Load the latest result of every monitor in one set-based query."""
+        latest = (
+            select(
+                CheckResult.monitor_id,
+                CheckResult.is_up,
+                CheckResult.checked_at,
+                CheckResult.status_code,
+                CheckResult.response_time_ms,
+                CheckResult.error_message,
+            )
+            .where(CheckResult.monitor_id == Monitor.id)
+            .order_by(CheckResult.checked_at.desc())
+            .limit(1)
+            .lateral()
+        )
+        rows = await db.execute(select(latest).select_from(Monitor).join(latest, true()))
+        for row in rows:
+            # Results produced while warming are newer than the snapshot
+            self._states.setdefault(
+                row.monitor_id,
+                LastState(
+                    is_up=row.is_up,
+                    checked_at=row.checked_at,
+                    status_code=row.status_code,
+                    response_time_ms=row.response_time_ms,
+                    error_message=row.error_message,
+                ),
+            )
+        self.warmed = True
+
+    async def ensure_warm(self) -> None:
+        if self.warmed:
+            return
+        async with self._warm_lock:
+            if not self.warmed:
+                async with async_session() as db:
+                    await self.warm(db)
+                print(f"Loaded last state for {len(self)} monitors")
+
+
+state_table = StateTable()
@@ -0,0 +1,186 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import insert
+
+from app.core.cache import SLOReportCache, slo_cache
+from app.core.config import settings
+from app.core.db import engine
+from app.core.metrics import updog_result_flush_seconds, updog_results_written_total
+from app.core.slo import AVAILABILITY_SLO, LATENCY_PERCENTILE, LATENCY_SLO_MS
+from app.models.result import CheckResult
+from app.models.rollup import naive_utc
+from app.worker.burn import BurnRateEngine, burn_rates
+from app.worker.rollups import RollupBuffer, rollup_buffer
+
+RESULT_COLUMNS = (
+    "monitor_id",
+    "status_code",
+    "response_time_ms",
+    "is_up",
+    "checked_at",
+    "error_message",
+    "dns_ms",
+    "connect_ms",
+    "tls_ms",
+    "ttfb_ms",
+    "transfer_ms",
+)
+
+_SMALLINT_MAX = 32767
+
+
+@dataclass(slots=True)
+class ResultRecord:
+    """A check result on its way to check_results, without ORM bookkeeping."""
+
+    monitor_id: int
+    is_up: bool
+    checked_at: datetime
+    status_code: int | None = None
+    response_time_ms: int | None = None
+    error_message: str | None = None
+    dns_ms: int | None = None
+    connect_ms: int | None = None
+    tls_ms: int | None = None
+    ttfb_ms: int | None = None
+    transfer_ms: int | None = None
+    # The monitor's SLO latency threshold, for rollups, and its targets, for
+    # burn-rate alerts; not check_results columns
+    latency_threshold_ms: int = LATENCY_SLO_MS
+    availability_target: float = AVAILABILITY_SLO
+    latency_target: float = LATENCY_PERCENTILE
+
+    def as_row(self) -> tuple:
+        return (
+            self.monitor_id,
+            self.status_code,
+            self.response_time_ms,
+            self.is_up,
+            naive_utc(self.checked_at),  # check_results.checked_at is naive UTC
+            self.error_message,
+            # Phase columns are SMALLINT; clamp the rare >32s phase
+            *(
+                None if ms is None else min(ms, _SMALLINT_MAX)
+                for ms in (self.dns_ms, self.connect_ms, self.tls_ms, self.ttfb_ms, self.transfer_ms)
+            ),
+        )
+
+
+class ResultWriter:
+    """Buffers results and writes them in bulk.
+
+    Flushes when `batch_size` rows are buffered or every `flush_interval`
+    seconds. Postgres gets a binary COPY; other backends a multi-row INSERT.
+    Rollups, when given, are fed every result and flushed alongside; so are
+    burn-rate counters, which live in memory only. Cached SLO reports of
+    monitors with new results are invalidated once rollups are written.
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_buffer: int,
+        rollups: RollupBuffer | None = None,
+        burn_rates: BurnRateEngine | None = None,
+        slo_cache: SLOReportCache | None = None,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.rollups = rollups
+        self.burn_rates = burn_rates
+        self.slo_cache = slo_cache
+        self._buffer: list[tuple] = []
+        self._flush_lock = asyncio.Lock()
+        self._kick = asyncio.Event()
+        self._stopping = False
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def add(self, record: ResultRecord) -> None:
+        self._buffer.append(record.as_row())
+        if self.rollups is not None:
+            self.rollups.add(record)
+        if self.burn_rates is not None:
+            self.burn_rates.add(record)
+        if len(self._buffer) >= self.batch_size:
+            self._kick.set()
+
+    async def _write(self, rows: list[tuple]) -> None:
+        async with engine.connect() as conn:
+            if conn.dialect.driver == "asyncpg":
+                raw = await conn.get_raw_connection()
+                await raw.driver_connection.copy_records_to_table(
+                    CheckResult.__tablename__, records=rows, columns=RESULT_COLUMNS
+                )
+            else:
+                await conn.execute(
+                    insert(CheckResult.__table__),
+                    [dict(zip(RESULT_COLUMNS, row)) for row in rows],
+                )
+                await conn.commit()
+
+    async def flush(self) -> int:
+        async with self._flush_lock:
+            written = 0
+            monitor_ids: set[int] = set()
+            while self._buffer:
+                rows = self._buffer[: self.batch_size]
+                del self._buffer[: self.batch_size]
+
+                start = time.monotonic()
+                try:
+                    await self._write(rows)
+                except Exception as e:
+                    # Put the batch back for the next flush, dropping the oldest on overflow
+                    self._buffer[:0] = rows
+                    overflow = len(self._buffer) - self.max_buffer
+                    if overflow > 0:
+                        del self._buffer[:overflow]
+                        print(f"Result buffer full, dropped {overflow} results")
+                    print(f"Failed to write {len(rows)} check results: {e}")
+                    break
+
+                updog_result_flush_seconds.observe(time.monotonic() - start)
+                updog_results_written_total.inc(len(rows))
+                written += len(rows)
+                monitor_ids.update(row[0] for row in rows)
+
+            if self.rollups is not None:
+                await self.rollups.flush()
+            if self.slo_cache is not None and monitor_ids:
+                try:
+                    await self.slo_cache.invalidate(monitor_ids)
+                except Exception as e:
+                    print(f"Failed to invalidate cached SLO reports: {e}")
+            return written
+
+    async def run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._kick.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._kick.clear()
+            await self.flush()
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still buffered."""
+        self._stopping = True
+        self._kick.set()
+        await self.flush()
+
+
+result_writer = ResultWriter(
+    batch_size=settings.result_batch_size,
+    flush_interval=settings.result_flush_interval_seconds,
+    max_buffer=settings.result_max_buffer,
+    rollups=rollup_buffer,
+    burn_rates=burn_rates if settings.burn_rate_alerts_enabled else None,
+    slo_cache=slo_cache,
+)
@@ -0,0 +1,23 @@
+# Usage: PYTHONPATH=. python scripts/backfill_rollups.py [--days 30]
+#
+# Rebuilds minute/hour/day rollups from raw check_results. Safe to rerun:
+# complete buckets are replaced, buckets still open are left to the worker.
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from app.core.rollups import backfill_rollups
+
+
+async def main(days: int):
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    print(f"Backfilling rollups for the last {days} days...")
+    buckets = await backfill_rollups(since)
+    print(f"Done! Wrote {buckets} rollup buckets")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=30, help="How far back to rebuild")
+    asyncio.run(main(parser.parse_args().days))
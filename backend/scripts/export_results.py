@@ -0,0 +1,36 @@
+# Usage: PYTHONPATH=. python scripts/export_results.py [--format ndjson|csv|arrow]
+#            [--days 30] [--monitor-id 1 ...] [--gzip] [--output results.ndjson]
+#
+# Streams check history to a file (or stdout) through a server-side cursor,
+# so memory stays flat however many rows there are. Ctrl-C stops the query.
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime, timedelta, timezone
+
+from app.core.export import ENCODERS, FORMAT_NDJSON, export_results
+
+
+async def main(args):
+    since = datetime.now(timezone.utc) - timedelta(days=args.days) if args.days else None
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async for data in export_results(args.monitor_id, since, None, args.format, args.gzip):
+            out.write(data)
+            written += len(data)
+    finally:
+        if args.output:
+            out.close()
+    print(f"Done! Wrote {written} bytes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--format", choices=sorted(ENCODERS), default=FORMAT_NDJSON)
+    parser.add_argument("--days", type=int, default=0, help="How far back to export, 0 for everything")
+    parser.add_argument("--monitor-id", type=int, action="append", help="Repeat for several monitors")
+    parser.add_argument("--gzip", action="store_true", help="Compress the output")
+    parser.add_argument("--output", help="File to write, default stdout")
+    asyncio.run(main(parser.parse_args()))
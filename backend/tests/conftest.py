@@ -1,4 +1,5 @@
 import os
+from datetime import datetime
 
 import pytest
 from httpx import AsyncClient, ASGITransport
@@ -23,3 +24,25 @@ async def client():
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as ac:
         yield ac
+
+
+@pytest.fixture
+def result_row():
+    """Builds a check_results row as a tuple in archive/export column order."""
+
+    def build(row_id=1, is_up=True, monitor_id=1, checked_at=datetime(2026, 10, 16, 12, 0, 5)):
+        return (monitor_id, checked_at, row_id, is_up, 200 if is_up else None, 120,
+                None if is_up else "timeout", None, None, None, None, None)
+
+    return build
+
+
+@pytest.fixture
+def batches():
+    """Yields lists of rows one by one, like a server-side cursor's partitions."""
+
+    async def iterate(*items):
+        for batch in items:
+            yield batch
+
+    return iterate
@@ -1,6 +1,14 @@
 
+from datetime import datetime
+from unittest.mock import AsyncMock
+
 import pytest
 
+from app.core.db import get_db
+from app.core.security import get_current_user
+from app.main import app
+from app.models.monitor import Monitor
+
 
 @pytest.mark.asyncio
 async def test_root_endpoint(client):
@@ -35,3 +43,139 @@ async def test_get_nonexistent_monitor_returns_404(client):
     response = await client.get("/api/monitors/99999")
 
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+@pytest.mark.db_required
+async def test_fleet_slo_endpoint_pages_by_cursor(client):
+    response = await client.get("/api/slo/monitors", params={"limit": 1, "window_days": 7})
+
+    assert response.status_code == 200
+    reports = response.json()
+    assert isinstance(reports, list)
+    assert all(r["window_days"] == 7 for r in reports)
+
+
+@pytest.mark.asyncio
+async def test_fleet_slo_endpoint_rejects_oversized_window(client):
+    response = await client.get("/api/slo/monitors", params={"window_days": 3650})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_compares_aware_and_naive_bounds(client):
+    response = await client.get(
+        "/api/export/results",
+        params={"from": "2026-01-01T02:00:00+02:00", "to": "2026-01-01T00:00:00"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_latency_endpoint_rejects_reversed_window(client):
+    response = await client.get(
+        "/api/slo/latency",
+        params={"since": "2026-01-02T00:00:00Z", "until": "2026-01-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_uptime_endpoint_rejects_reversed_window(client):
+    response = await client.get(
+        "/api/slo/uptime",
+        params={"since": "2026-01-02T00:00:00Z", "until": "2026-01-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_results_endpoint_caps_page_size(client):
+    response = await client.get("/api/monitors/1/results", params={"limit": 100_000})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.db_required
+async def test_results_endpoint_pages_by_cursor(client):
+    monitors = (await client.get("/api/monitors", params={"limit": 1})).json()
+    if not monitors:
+        pytest.skip("No monitors to read results from")
+    url = f"/api/monitors/{monitors[0]['id']}/results"
+
+    first = await client.get(url, params={"limit": 2})
+    cursor = first.headers.get("X-Next-Cursor")
+    if cursor is None:
+        pytest.skip("Not enough results for a second page")
+    second = await client.get(url, params={"limit": 2, "cursor": cursor})
+
+    assert second.status_code == 200
+    seen = {r["id"] for r in first.json()}
+    assert all(r["id"] not in seen for r in second.json())
+    assert second.json()[0]["checked_at"] <= first.json()[-1]["checked_at"]
+
+
+@pytest.mark.asyncio
+async def test_series_endpoint_rejects_reversed_window(client):
+    response = await client.get(
+        "/api/monitors/1/series",
+        params={"from": "2026-01-02T00:00:00Z", "to": "2026-01-01T00:00:00Z"},
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_export_endpoint_rejects_unknown_format(client):
+    response = await client.get("/api/export/results", params={"format": "xlsx"})
+
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+@pytest.mark.db_required
+async def test_dashboard_summary_lists_every_monitor(client):
+    monitors = (await client.get("/api/monitors")).json()
+
+    response = await client.get("/api/dashboard/summary")
+
+    assert response.status_code == 200
+    assert [m["monitor_id"] for m in response.json()] == sorted(m["id"] for m in monitors)
+
+
+@pytest.mark.asyncio
+async def test_update_with_null_resets_optional_settings(client):
+    now = datetime(2026, 1, 1)
+    monitor = Monitor(
+        id=1, name="Site", url="https://example.com", interval_seconds=60, is_active=True,
+        probe_mode="body", timeout_seconds=30.0, max_body_bytes=1000, connection_mode="warm",
+        adaptive=False, slo_availability_target=0.9, slo_latency_target=0.99,
+        slo_latency_threshold_ms=800, slo_window_days=7, slo_calendar_month=False,
+        created_at=now, updated_at=now,
+    )
+    db = AsyncMock()
+    db.get.return_value = monitor
+
+    async def override_db():
+        yield db
+
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_current_user] = lambda: None
+    try:
+        response = await client.put(
+            "/api/monitors/1",
+            json={"slo_availability_target": None, "max_body_bytes": None, "name": "Renamed"},
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert monitor.slo_availability_target is None
+    assert monitor.max_body_bytes is None
+    assert monitor.slo_latency_target == 0.99  # Omitted, so unchanged
+    assert monitor.name == "Renamed"
@@ -0,0 +1,58 @@
+from datetime import datetime, timedelta
+
+from app.core.archive import (
+    archived_ranges,
+    archived_uptime,
+    file_name,
+    split_at_raw_horizon,
+    uncovered,
+    write_archive,
+)
+
+DAY1 = datetime(2026, 1, 1)
+DAY2 = DAY1 + timedelta(days=1)
+
+
+def test_gaps_before_raw_retention_come_from_whole_day_rollups():
+    horizon = DAY2 + timedelta(days=3)
+    gaps = [
+        (DAY1 + timedelta(hours=6), DAY2 + timedelta(days=1)),
+        (DAY2 + timedelta(days=2), DAY2 + timedelta(days=5)),
+    ]
+
+    days, raw = split_at_raw_horizon(gaps, horizon)
+
+    # The partial first day can't be counted from its day rollup
+    assert days == [(DAY2, DAY2 + timedelta(days=1)), (DAY2 + timedelta(days=2), horizon)]
+    assert raw == [(horizon, DAY2 + timedelta(days=5))]
+    assert split_at_raw_horizon(gaps, None) == ([], gaps)
+
+
+def test_uncovered_leaves_gaps_around_archived_ranges():
+    covered = [(DAY1, DAY2)]
+
+    gaps = uncovered(DAY1 - timedelta(hours=6), DAY2 + timedelta(hours=6), covered)
+
+    assert gaps == [(DAY1 - timedelta(hours=6), DAY1), (DAY2, DAY2 + timedelta(hours=6))]
+    assert uncovered(DAY1 + timedelta(hours=1), DAY1 + timedelta(hours=2), covered) == []
+
+
+async def test_archive_round_trip_counts_uptime(tmp_path, result_row, batches):
+    path = tmp_path / file_name(DAY1, DAY2)
+    rows = await write_archive(
+        path,
+        batches(
+            [result_row(monitor_id=1, checked_at=DAY1 + timedelta(minutes=i), is_up=i % 4 != 0)
+             for i in range(8)],
+            [result_row(monitor_id=2, checked_at=DAY1 + timedelta(minutes=i)) for i in range(3)],
+        ),
+    )
+    (tmp_path / "check_results_20260102T0000_20260103T0000.parquet.tmp").touch()
+
+    ranges = archived_ranges(tmp_path)
+    counts = archived_uptime([path], [1], DAY1, DAY1 + timedelta(minutes=6))
+
+    assert rows == 11
+    assert ranges == [(DAY1, DAY2, path)]
+    assert (counts[1].total, counts[1].up) == (6, 4)
+    assert 2 not in counts
@@ -0,0 +1,166 @@
+from datetime import datetime, timezone
+
+from app.worker.burn import PAGE, TICKET, BurnRateEngine, SlidingCounts
+from app.worker.writer import ResultRecord
+
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _record(at, monitor_id=1, is_up=True, response_time_ms=100, **targets):
+    return ResultRecord(
+        monitor_id=monitor_id,
+        is_up=is_up,
+        response_time_ms=response_time_ms if is_up else None,
+        checked_at=datetime.fromtimestamp(at, timezone.utc),
+        **targets,
+    )
+
+
+def _feed(engine, start, minutes, failing_every=0, monitor_id=1, **targets):
+    """One check per minute; every `failing_every`-th one fails."""
+    for i in range(minutes):
+        is_up = not failing_every or i % failing_every
+        engine.add(_record(start + i * 60, monitor_id, is_up=bool(is_up), **targets))
+
+
+def test_window_sums_slide_with_slots():
+    counts = SlidingCounts(60, (2, 5))
+    for slot in range(6):
+        counts.add(slot, (1, 1, 0, 0))
+
+    assert counts.window(0)[0] == 2
+    assert counts.window(1)[0] == 5
+
+    counts.advance(8)
+    assert counts.window(0)[0] == 0
+    assert counts.window(1)[0] == 2  # Slots 4 and 5
+
+
+def test_late_result_counts_only_in_windows_that_cover_it():
+    counts = SlidingCounts(60, (2, 5))
+    counts.add(10, (1, 0, 0, 0))
+    counts.add(7, (1, 0, 0, 0))
+
+    assert counts.window(0)[0] == 1
+    assert counts.window(1)[0] == 2
+
+
+def test_long_gap_clears_everything():
+    counts = SlidingCounts(60, (2, 5))
+    counts.add(0, (3, 3, 3, 3))
+    counts.advance(100)
+
+    assert counts.window(1) == [0, 0, 0, 0]
+
+
+def test_steady_failures_fire_page_once():
+    engine = BurnRateEngine()
+    _feed(engine, T0, 60, failing_every=2)  # 50% errors for an hour
+
+    first = engine.evaluate(T0 + 60 * 60)
+    again = engine.evaluate(T0 + 60 * 60 + 30)
+
+    assert [(a.sli, a.severity) for a in first] == [("availability", PAGE)]
+    assert first[0].burn_rate > 14.4
+    assert again == []
+
+
+def test_single_blip_does_not_alert():
+    engine = BurnRateEngine()
+    _feed(engine, T0, 24 * 60)
+    engine.add(_record(T0 + 24 * 3600, is_up=False))
+
+    assert engine.evaluate(T0 + 24 * 3600 + 30) == []
+
+
+def test_page_eases_to_ticket_quietly_then_resolves():
+    engine = BurnRateEngine()
+    _feed(engine, T0, 60, failing_every=2)
+    engine.evaluate(T0 + 60 * 60)
+
+    # Short page windows are clean, but the day still shows the burn
+    _feed(engine, T0 + 60 * 60, 40)
+    assert engine.evaluate(T0 + 100 * 60) == []
+
+    _feed(engine, T0 + 100 * 60, 25 * 60)
+    changes = engine.evaluate(T0 + 100 * 60 + 25 * 3600)
+
+    assert [(a.sli, a.severity) for a in changes] == [("availability", None)]
+
+
+def test_slow_burn_raises_ticket():
+    engine = BurnRateEngine()
+    # One failure an hour for a day: ~3.3x burn on a 99.5% target, under the page rates
+    _feed(engine, T0, 24 * 60, failing_every=60)
+
+    changes = engine.evaluate(T0 + 24 * 3600 - 30)
+
+    assert [(a.sli, a.severity) for a in changes] == [("availability", TICKET)]
+
+
+def test_rules_use_each_monitors_own_target():
+    engine = BurnRateEngine()
+    _feed(engine, T0, 24 * 60, failing_every=60, monitor_id=1)
+    # The same failures are well inside a 90% target's budget
+    _feed(engine, T0, 24 * 60, failing_every=60, monitor_id=2, availability_target=0.9)
+
+    changes = engine.evaluate(T0 + 24 * 3600 - 30)
+
+    assert [(a.monitor_id, a.severity) for a in changes] == [(1, TICKET)]
+
+
+def test_slow_responses_burn_latency_budget():
+    engine = BurnRateEngine()
+    for i in range(60):
+        engine.add(
+            ResultRecord(
+                monitor_id=1,
+                is_up=True,
+                response_time_ms=2000,
+                checked_at=datetime.fromtimestamp(T0 + i * 60, timezone.utc),
+            )
+        )
+
+    changes = engine.evaluate(T0 + 60 * 60)
+
+    assert [(a.sli, a.severity) for a in changes] == [("latency", PAGE)]
+
+
+def test_invalidate_drops_counters_and_alerts():
+    engine = BurnRateEngine()
+    _feed(engine, T0, 60, failing_every=2)
+    engine.evaluate(T0 + 60 * 60)
+
+    engine.invalidate()
+
+    assert len(engine) == 0
+    assert engine.evaluate(T0 + 60 * 60) == []
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return self.rows
+
+
+async def test_warm_loads_rollups_from_before_first_result():
+    engine = BurnRateEngine()
+    first = T0 + 3 * 3600 + 30 * 60
+    engine.add(_record(first, is_up=False))
+    naive = lambda at: datetime.fromtimestamp(at, timezone.utc).replace(tzinfo=None)  # noqa: E731
+    rows = [
+        # monitor_id, bucket_seconds, bucket_start, total, up, latency_count, latency_good
+        (1, 60, naive(first - 120), 1, 0, 0, 0),
+        (1, 60, naive(first), 1, 1, 1, 1),  # Same minute as the first result: skipped
+        (1, 3600, naive(T0 + 2 * 3600), 60, 60, 60, 60),
+        (1, 3600, naive(T0 + 3 * 3600), 30, 30, 30, 30),  # First result's hour: skipped
+    ]
+
+    await engine.warm(FakeDB(rows), now=first)
+
+    monitor = engine._monitors[1]
+    assert monitor.warm
+    assert monitor.window(5 * 60)[:2] == [2, 0]
+    assert monitor.window(6 * 3600)[:2] == [62, 60]
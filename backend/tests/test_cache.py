@@ -0,0 +1,124 @@
+import pytest
+
+from app.core.cache import MemoryBackend, SLOReportCache
+from app.core.sketch import DDSketch
+from app.core.slo import (
+    LatencyPercentiles,
+    PhaseBreakdown,
+    SLICounts,
+    SLODefinition,
+    build_slo_report,
+)
+
+
+def _report(monitor_id=1, name="API", window_days=30):
+    return build_slo_report(
+        monitor_id,
+        name,
+        SLICounts(total=100, up=99, latency_total=99, latency_fast=98),
+        LatencyPercentiles.from_sketch(DDSketch()),
+        PhaseBreakdown(24, 1.0, None, None, None, None),
+        SLODefinition(window_days=window_days),
+    )
+
+
+async def _cache_report(cache, report):
+    _, versions = await cache.get_many([report.monitor_id], report.window_days)
+    await cache.put([report], versions, report.window_days)
+
+
+@pytest.mark.asyncio
+async def test_put_then_get_hits():
+    cache = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: True)
+    await _cache_report(cache, _report())
+
+    found, _ = await cache.get_many([1, 2], 30)
+
+    assert list(found) == [1]
+    assert found[1].monitor_name == "API"
+
+
+@pytest.mark.asyncio
+async def test_local_cache_is_bypassed_without_a_sole_writer():
+    peers = [1]
+    orphan = SLOReportCache(max_size=10, ttl=60)
+    shared_fleet = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: len(peers) == 1)
+    await _cache_report(orphan, _report())
+    await _cache_report(shared_fleet, _report())
+    peers.append(2)
+
+    assert (await orphan.get_many([1], 30))[0] == {}
+    assert (await shared_fleet.get_many([1], 30))[0] == {}
+
+
+@pytest.mark.asyncio
+async def test_window_is_part_of_the_key():
+    cache = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: True)
+    await _cache_report(cache, _report(window_days=30))
+
+    found, _ = await cache.get_many([1], 7)
+
+    assert found == {}
+
+
+@pytest.mark.asyncio
+async def test_new_results_invalidate_monitor():
+    cache = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: True)
+    await _cache_report(cache, _report(1))
+    await _cache_report(cache, _report(2))
+
+    await cache.invalidate([1])
+    found, _ = await cache.get_many([1, 2], 30)
+
+    assert list(found) == [2]
+
+
+@pytest.mark.asyncio
+async def test_report_computed_before_invalidation_is_not_served():
+    cache = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: True)
+    _, versions = await cache.get_many([1], 30)
+    await cache.invalidate([1])  # Results land while the report is computed
+
+    await cache.put([_report()], versions, 30)
+    found, _ = await cache.get_many([1], 30)
+
+    assert found == {}
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl():
+    cache = SLOReportCache(max_size=10, ttl=0, sole_writer=lambda: True)
+    await _cache_report(cache, _report())
+
+    found, _ = await cache.get_many([1], 30)
+
+    assert found == {}
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_is_evicted():
+    cache = SLOReportCache(max_size=2, ttl=60, sole_writer=lambda: True)
+    await _cache_report(cache, _report(1))
+    await _cache_report(cache, _report(2))
+    await cache.get_many([1], 30)
+    await _cache_report(cache, _report(3))
+
+    found, _ = await cache.get_many([1, 2, 3], 30)
+
+    assert sorted(found) == [1, 3]
+
+
+@pytest.mark.asyncio
+async def test_replicas_share_reports_and_invalidations_through_backend():
+    backend = MemoryBackend()
+    api_a = SLOReportCache(max_size=10, ttl=60, backend=backend)
+    api_b = SLOReportCache(max_size=10, ttl=60, backend=backend)
+    worker = SLOReportCache(max_size=10, ttl=60, backend=backend)
+    await _cache_report(api_a, _report())
+
+    found, _ = await api_b.get_many([1], 30)
+    assert found[1] == _report()
+
+    await worker.invalidate([1])
+    assert (await api_a.get_many([1], 30))[0] == {}
+    assert (await api_b.get_many([1], 30))[0] == {}
@@ -1,15 +1,57 @@
 
+import asyncio
+from datetime import datetime, timezone
+
+import httpx
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
-from app.worker.checker import check_url
+from app.worker.checker import _do_check, check_url, run_checks
+from app.worker.http import ClientPool
+from app.worker.state import StateTable
+from app.worker.writer import ResultRecord
 
 
 class MockMonitor:
-    def __init__(self, id=1, name="Test", url="https://example.com"):
+    def __init__(
+        self, id=1, name="Test", url="https://example.com",
+        probe_mode="headers", timeout_seconds=30.0, max_body_bytes=None,
+        connection_mode="warm", slo_latency_threshold_ms=None,
+    ):
         self.id = id
         self.name = name
         self.url = url
+        self.probe_mode = probe_mode
+        self.timeout_seconds = timeout_seconds
+        self.max_body_bytes = max_body_bytes
+        self.connection_mode = connection_mode
+        self.slo_latency_threshold_ms = slo_latency_threshold_ms
+        self.slo_availability_target = None
+        self.slo_latency_target = None
+        self.slo_window_days = None
+        self.slo_calendar_month = False
+
+
+def _mock_response(status_code, chunks=(), headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    response.request.method = "GET"
+    response.aclose = AsyncMock()
+
+    async def aiter_raw():
+        for chunk in chunks:
+            yield chunk
+
+    response.aiter_raw = aiter_raw
+    return response
+
+
+def _mock_send(mock_client, **kwargs):
+    client = mock_client.return_value.__aenter__.return_value
+    client.build_request = MagicMock()
+    client.send = AsyncMock(**kwargs)
+    return client
 
 
 @pytest.mark.asyncio
@@ -17,12 +59,9 @@ async def test_check_url_success():
     monitor = MockMonitor()
 
     with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
-        mock_response = MagicMock()
-        mock_response.status_code = 200
+        mock_response = _mock_response(200)
 
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-            return_value=mock_response
-        )
+        _mock_send(mock_client, return_value=mock_response)
 
         result = await check_url(monitor)
 
@@ -38,12 +77,9 @@ async def test_check_url_failure_status_code():
     monitor = MockMonitor()
 
     with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
-        mock_response = MagicMock()
-        mock_response.status_code = 500
+        mock_response = _mock_response(500)
 
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-            return_value=mock_response
-        )
+        _mock_send(mock_client, return_value=mock_response)
 
         result = await check_url(monitor)
 
@@ -56,9 +92,7 @@ async def test_check_url_connection_error():
     monitor = MockMonitor()
 
     with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-            side_effect=Exception("Connection refused")
-        )
+        _mock_send(mock_client, side_effect=Exception("Connection refused"))
 
         result = await check_url(monitor)
 
@@ -73,12 +107,9 @@ async def test_check_url_404_is_down():
     monitor = MockMonitor()
 
     with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
-        mock_response = MagicMock()
-        mock_response.status_code = 404
+        mock_response = _mock_response(404)
 
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-            return_value=mock_response
-        )
+        _mock_send(mock_client, return_value=mock_response)
 
         result = await check_url(monitor)
 
@@ -91,14 +122,252 @@ async def test_check_url_redirect_is_up():
     monitor = MockMonitor()
 
     with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
-        mock_response = MagicMock()
-        mock_response.status_code = 301
+        mock_response = _mock_response(301)
 
-        mock_client.return_value.__aenter__.return_value.get = AsyncMock(
-            return_value=mock_response
-        )
+        _mock_send(mock_client, return_value=mock_response)
 
         result = await check_url(monitor)
 
         assert result.is_up is True
         assert result.status_code == 301
+
+
+@pytest.mark.asyncio
+async def test_head_probe_sends_head_request():
+    monitor = MockMonitor(probe_mode="head")
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
+        client = _mock_send(mock_client, return_value=_mock_response(200))
+
+        result = await check_url(monitor)
+
+        assert result.is_up is True
+        assert client.build_request.call_args.args[0] == "HEAD"
+
+
+@pytest.mark.asyncio
+async def test_cold_headers_probe_never_reads_body():
+    monitor = MockMonitor(probe_mode="headers", connection_mode="cold")
+    read = []
+
+    async def chunks():
+        read.append(b"x")
+        yield b"x"
+
+    response = _mock_response(200, headers={"content-length": "1"})
+    response.aiter_raw = chunks
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
+        _mock_send(mock_client, return_value=response)
+
+        await check_url(monitor)
+
+        assert read == []
+        response.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_cold_body_probe_stops_at_byte_cap():
+    monitor = MockMonitor(probe_mode="body", max_body_bytes=10, connection_mode="cold")
+    read = []
+
+    async def chunks():
+        for chunk in [b"x" * 6] * 100:
+            read.append(chunk)
+            yield chunk
+
+    response = _mock_response(200)
+    response.aiter_raw = chunks
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
+        _mock_send(mock_client, return_value=response)
+
+        result = await check_url(monitor)
+
+        assert result.is_up is True
+        assert len(read) == 2
+        response.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_warm_probe_drains_small_body_after_timing():
+    monitor = MockMonitor(probe_mode="headers")
+    read = []
+
+    async def chunks():
+        for chunk in [b"x" * 100] * 3:
+            read.append(chunk)
+            yield chunk
+
+    response = _mock_response(200, headers={"content-length": "300"})
+    response.aiter_raw = chunks
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client, \
+         patch("app.worker.checker.settings.check_drain_bytes", 300):
+        _mock_send(mock_client, return_value=response)
+
+        result = await check_url(monitor)
+
+        assert result.is_up is True
+        assert result.transfer_ms is None  # Draining isn't part of the probe
+        assert len(read) == 3
+        response.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("headers", [{}, {"content-length": "301"}])
+async def test_warm_probe_closes_unknown_or_large_bodies_unread(headers):
+    monitor = MockMonitor(probe_mode="headers")
+    read = []
+
+    async def chunks():
+        read.append(b"x")
+        yield b"x"
+
+    response = _mock_response(200, headers=headers)
+    response.aiter_raw = chunks
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client, \
+         patch("app.worker.checker.settings.check_drain_bytes", 300):
+        _mock_send(mock_client, return_value=response)
+
+        await check_url(monitor)
+
+        assert read == []
+        response.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_slow_stream_after_headers_is_up():
+    async def stream():
+        yield b"data: 1\n\n"
+        await asyncio.sleep(1)
+        yield b"data: 2\n\n"
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-length": "18"}, content=stream())
+
+    monitor = MockMonitor(probe_mode="headers", timeout_seconds=0.05)
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        result = await _do_check(monitor, client)
+
+    assert result.is_up is True
+    assert result.status_code == 200
+
+
+async def _keepalive_server(connections: list):
+    """Local HTTP/1.1 server with keep-alive that records every accepted connection."""
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                body = b"ok" * 1000
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body)
+                    + (b"" if head.startswith(b"HEAD") else body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("probe_mode", ["head", "headers", "body"])
+async def test_warm_checks_reuse_one_connection(probe_mode):
+    connections = []
+    server = await _keepalive_server(connections)
+    port = server.sockets[0].getsockname()[1]
+    monitor = MockMonitor(url=f"http://127.0.0.1:{port}/", probe_mode=probe_mode, max_body_bytes=100)
+    pool = ClientPool()
+    try:
+        for _ in range(5):
+            result = await _do_check(monitor, pool.warm)
+            assert result.is_up is True
+    finally:
+        await pool.aclose()
+        server.close()
+
+    assert len(connections) == 1
+
+
+@pytest.mark.asyncio
+async def test_check_times_out_at_monitor_timeout():
+    monitor = MockMonitor(timeout_seconds=0.05)
+
+    async def hang(*args, **kwargs):
+        await asyncio.sleep(5)
+
+    with patch("app.worker.checker.httpx.AsyncClient") as mock_client:
+        _mock_send(mock_client, side_effect=hang)
+
+        result = await check_url(monitor)
+
+        assert result.is_up is False
+        assert "timed out after 0.05s" in result.error_message
+
+
+@pytest.mark.asyncio
+async def test_alert_is_not_held_back_by_slow_checks():
+    fast, slow = MockMonitor(id=1, name="Fast"), MockMonitor(id=2, name="Slow")
+    states = StateTable()
+    states.warmed = True
+    for monitor_id in (1, 2):
+        states.update(ResultRecord(
+            monitor_id=monitor_id, is_up=True, checked_at=datetime.now(timezone.utc)
+        ))
+
+    slow_done = asyncio.Event()
+
+    async def fake_check(monitor, client=None, limiter=None):
+        if monitor.id == 2:
+            await asyncio.sleep(0.2)
+            slow_done.set()
+        return ResultRecord(
+            monitor_id=monitor.id, is_up=monitor.id == 2,
+            checked_at=datetime.now(timezone.utc),
+        )
+
+    alerted_before_slow = []
+
+    async def fake_alert(**kwargs):
+        alerted_before_slow.append(not slow_done.is_set())
+        return True
+
+    with patch("app.worker.checker.check_url", side_effect=fake_check), \
+         patch("app.worker.checker.send_discord_alert", side_effect=fake_alert), \
+         patch("app.worker.checker.state_table", states), \
+         patch("app.worker.checker.record_incident", new_callable=AsyncMock), \
+         patch("app.worker.checker.settings.confirm_retries", 0), \
+         patch("app.worker.checker.result_writer") as mock_writer:
+        await run_checks([fast, slow])
+
+    assert alerted_before_slow == [True]
+    assert mock_writer.add.call_count == 2
+    assert states.is_up(1) is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_up", [True, False])
+async def test_first_result_opens_incident_only_when_down(is_up):
+    monitor = MockMonitor()
+    states = StateTable()
+    states.warmed = True
+
+    async def fake_check(monitor, client=None, limiter=None):
+        return ResultRecord(monitor_id=monitor.id, is_up=is_up, checked_at=datetime.now(timezone.utc))
+
+    with patch("app.worker.checker.check_url", side_effect=fake_check), \
+         patch("app.worker.checker.send_discord_alert", new_callable=AsyncMock) as alert, \
+         patch("app.worker.checker.state_table", states), \
+         patch("app.worker.checker.record_incident", new_callable=AsyncMock) as incident, \
+         patch("app.worker.checker.settings.confirm_retries", 0), \
+         patch("app.worker.checker.result_writer"):
+        await run_checks([monitor])
+
+    assert incident.await_count == (0 if is_up else 1)
+    assert alert.await_count == (0 if is_up else 1)
+    assert states.is_up(1) is is_up
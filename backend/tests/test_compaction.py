@@ -0,0 +1,66 @@
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.core.compaction import (
+    CompactionStats,
+    delete_rollups_before,
+    retained_resolutions,
+    rollup_cutoffs,
+)
+from app.models.rollup import DAY, HOUR, MINUTE
+
+
+def test_cutoffs_skip_tiers_kept_forever():
+    now = datetime(2026, 10, 16, 12, tzinfo=timezone.utc)
+    with patch("app.core.compaction.settings.rollup_minute_retention_days", 14), \
+         patch("app.core.compaction.settings.rollup_hour_retention_days", 0):
+        cutoffs = rollup_cutoffs(now)
+
+    assert cutoffs == [(MINUTE, datetime(2026, 10, 2, 12))]
+
+
+def test_retained_resolutions_drop_tiers_aged_out_before_until():
+    now = datetime(2026, 10, 16, 12)
+    with patch("app.core.compaction.settings.rollup_minute_retention_days", 14), \
+         patch("app.core.compaction.settings.rollup_hour_retention_days", 400):
+        assert retained_resolutions(datetime(2026, 9, 1), now) == (HOUR, DAY)
+        assert retained_resolutions(datetime(2026, 10, 3), now) == (MINUTE, HOUR, DAY)
+        assert retained_resolutions(datetime(2025, 1, 1), now) == (DAY,)
+
+
+def test_rows_per_second_handles_empty_runs():
+    assert CompactionStats("minute").rows_per_second == 0.0
+    assert CompactionStats("minute", rows=500, seconds=2.0).rows_per_second == 250.0
+
+
+class FakeEngine:
+    """engine.begin() stand-in that deletes up to :batch of `remaining` rows per transaction."""
+
+    def __init__(self, remaining):
+        self.remaining = remaining
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def begin(self):
+        self.transactions += 1
+        yield self
+
+    dialect = SimpleNamespace(name="postgresql")
+
+    async def execute(self, stmt, params):
+        rows = min(self.remaining, params["batch"])
+        self.remaining -= rows
+        return SimpleNamespace(one=lambda: (rows, rows * 100))
+
+
+async def test_deletes_in_batches_until_a_short_one():
+    engine = FakeEngine(remaining=25)
+    with patch("app.core.compaction.engine", engine):
+        stats = await delete_rollups_before(
+            HOUR, datetime(2026, 1, 1) - timedelta(days=1), batch_size=10, pause=0
+        )
+
+    assert engine.transactions == 3
+    assert (stats.tier, stats.rows, stats.bytes) == ("hour", 25, 2500)
@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.worker.confirm import Confirmer
+from app.worker.writer import ResultRecord
+
+
+class MockMonitor:
+    def __init__(self, id=1, name="Test"):
+        self.id = id
+        self.name = name
+
+
+def _result(is_up, monitor_id=1):
+    return ResultRecord(monitor_id=monitor_id, is_up=is_up, checked_at=datetime.now(timezone.utc))
+
+
+def _rechecks(*states):
+    results = iter(states)
+
+    async def check(monitor):
+        return _result(next(results), monitor.id)
+
+    return check
+
+
+async def _confirm(confirmer, candidate):
+    monitor = MockMonitor()
+    with patch("app.worker.confirm.result_writer") as mock_writer:
+        confirmer.start(monitor, candidate)
+        assert confirmer.is_pending(monitor.id)
+        await confirmer._pending[monitor.id]
+    assert not confirmer.is_pending(monitor.id)
+    return mock_writer
+
+
+@pytest.mark.asyncio
+async def test_transition_confirmed_when_all_rechecks_agree():
+    on_confirmed = AsyncMock()
+    confirmer = Confirmer(_rechecks(False, False), on_confirmed, retries=2, backoff=0)
+    candidate = _result(False)
+
+    mock_writer = await _confirm(confirmer, candidate)
+
+    on_confirmed.assert_awaited_once()
+    _, first, latest = on_confirmed.await_args.args
+    assert first is candidate
+    assert latest.is_up is False
+    assert mock_writer.add.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_flap_is_rejected_on_first_disagreeing_recheck():
+    on_confirmed = AsyncMock()
+    confirmer = Confirmer(_rechecks(True, False), on_confirmed, retries=2, backoff=0)
+
+    mock_writer = await _confirm(confirmer, _result(False))
+
+    on_confirmed.assert_not_awaited()
+    assert mock_writer.add.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_second_start_for_same_monitor_is_ignored():
+    check = AsyncMock(return_value=_result(False))
+    confirmer = Confirmer(check, AsyncMock(), retries=1, backoff=10)
+    monitor = MockMonitor()
+
+    confirmer.start(monitor, _result(False))
+    confirmer.start(monitor, _result(False))
+    assert len(confirmer) == 1
+
+    await confirmer.stop()
+    check.assert_not_awaited()
@@ -0,0 +1,45 @@
+from app.worker.coordination import Coordinator, HashRing
+
+
+def test_ring_spreads_monitors_across_workers():
+    ring = HashRing(["w1", "w2", "w3", "w4"])
+
+    counts: dict[str, int] = {}
+    for monitor_id in range(10_000):
+        node = ring.node_for(monitor_id)
+        counts[node] = counts.get(node, 0) + 1
+
+    assert set(counts) == {"w1", "w2", "w3", "w4"}
+    assert min(counts.values()) > 1500
+
+
+def test_ring_only_moves_monitors_of_the_departed_worker():
+    before = HashRing(["w1", "w2", "w3"])
+    after = HashRing(["w1", "w2"])
+
+    for monitor_id in range(2_000):
+        owner = before.node_for(monitor_id)
+        if owner != "w3":
+            assert after.node_for(monitor_id) == owner
+
+
+def test_empty_ring_has_no_owner():
+    assert HashRing([]).node_for(1) is None
+
+
+def test_workers_split_monitors_without_overlap():
+    w1, w2 = Coordinator("w1"), Coordinator("w2")
+    w1.set_members(["w1", "w2"])
+    w2.set_members(["w1", "w2"])
+
+    for monitor_id in range(1_000):
+        assert w1.owns(monitor_id) != w2.owns(monitor_id)
+
+
+def test_single_worker_owns_everything_and_leads():
+    worker = Coordinator("solo")
+
+    assert worker.is_leader
+    assert all(worker.owns(monitor_id) for monitor_id in range(100))
+    assert worker.set_members(["solo"]) is False
+    assert worker.set_members(["solo", "other"]) is True
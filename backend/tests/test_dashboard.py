@@ -0,0 +1,62 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from app.core.dashboard import get_dashboard_summary
+from app.core.sketch import DDSketch
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return self.rows
+
+
+def _sketch(*latencies_ms):
+    sketch = DDSketch()
+    for ms in latencies_ms:
+        sketch.add(ms)
+    return sketch.to_bytes()
+
+
+async def test_summary_fills_missing_stats_with_none():
+    checked_at = datetime(2026, 10, 16, 11, 59)
+    incident = datetime(2026, 10, 16, 11, 0)
+    rows = [
+        (1, "api", "https://api.example.com", True, False, checked_at, 503, 80,
+         100, 90, [_sketch(*[80] * 45), _sketch(*[80] * 35, *[9000] * 10)], incident),
+        (2, "paused", "https://old.example.com", False, None, None, None, None,
+         None, None, None, None),
+    ]
+
+    busy, idle = await get_dashboard_summary(FakeDB(rows), now=datetime(2026, 10, 16, 12))
+
+    assert (busy.is_up, busy.checks_24h, busy.uptime_24h) == (False, 100, 0.9)
+    # Past the coarse histogram's last bound, within the sketch's accuracy
+    assert 8800 < busy.p95_ms_24h < 9200
+    assert busy.incident_started_at == incident
+    assert (idle.checks_24h, idle.uptime_24h, idle.p95_ms_24h, idle.is_up) == (0, None, None, None)
+
+
+async def test_summary_takes_naive_now_as_utc(monkeypatch):
+    # A naive time read as local time would shift the window here
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+
+    class CapturingDB(FakeDB):
+        async def execute(self, stmt):
+            self.params = stmt.compile().params
+            return self.rows
+
+    naive, aware = CapturingDB([]), CapturingDB([])
+    at = datetime(2026, 10, 16, 12)
+    try:
+        await get_dashboard_summary(naive, now=at)
+        await get_dashboard_summary(aware, now=at.replace(tzinfo=timezone.utc))
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+    assert naive.params == aware.params
+    assert at - timedelta(hours=24) in naive.params.values()
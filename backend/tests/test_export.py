@@ -0,0 +1,52 @@
+import csv
+import gzip
+import io
+import json
+
+import pyarrow as pa
+import pytest
+
+from app.core.export import FORMAT_ARROW, FORMAT_CSV, FORMAT_NDJSON, encode
+
+
+async def _collect(fmt, batches, gzip=False):
+    return [chunk async for chunk in encode(batches, fmt, gzip)]
+
+
+async def test_ndjson_sends_a_chunk_per_batch(result_row, batches):
+    chunks = await _collect(
+        FORMAT_NDJSON, batches([result_row(1), result_row(2)], [result_row(3, is_up=False)])
+    )
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+    assert [r["id"] for r in rows] == [1, 2, 3]
+    assert rows[0]["checked_at"] == "2026-10-16T12:00:05"
+    assert rows[2]["error_message"] == "timeout"
+
+
+async def test_csv_starts_with_header_even_when_empty(batches):
+    chunks = await _collect(FORMAT_CSV, batches())
+
+    assert next(csv.reader(io.StringIO(b"".join(chunks).decode())))[:3] == ["monitor_id", "checked_at", "id"]
+
+
+async def test_arrow_stream_reads_back(result_row, batches):
+    data = b"".join(
+        await _collect(FORMAT_ARROW, batches([result_row(1)], [result_row(2), result_row(3)]))
+    )
+
+    table = pa.ipc.open_stream(data).read_all()
+
+    assert table.num_rows == 3
+    assert table["id"].to_pylist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize("fmt", [FORMAT_NDJSON, FORMAT_CSV, FORMAT_ARROW])
+async def test_gzip_output_decompresses_to_plain_output(fmt, result_row, batches):
+    rows = [[result_row(1)], [result_row(2)]]
+
+    plain = b"".join(await _collect(fmt, batches(*rows)))
+    compressed = b"".join(await _collect(fmt, batches(*rows), gzip=True))
+
+    assert gzip.decompress(compressed) == plain
@@ -0,0 +1,122 @@
+import time
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.worker.http import CachingDNSBackend, ClientPool, PhaseTimer, current_timer
+
+
+class MockMonitor:
+    def __init__(self, connection_mode="warm"):
+        self.connection_mode = connection_mode
+
+
+@pytest.mark.asyncio
+async def test_dns_answers_are_cached_until_ttl():
+    backend = CachingDNSBackend(ttl=60)
+    backend._lookup = AsyncMock(return_value=("93.184.216.34", None))
+
+    assert await backend.resolve("example.com", 443) == "93.184.216.34"
+    assert await backend.resolve("example.com", 443) == "93.184.216.34"
+    assert backend._lookup.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_dns_answer_is_looked_up_again():
+    backend = CachingDNSBackend(ttl=0)
+    backend._lookup = AsyncMock(return_value=("93.184.216.34", None))
+
+    await backend.resolve("example.com", 443)
+    await backend.resolve("example.com", 443)
+
+    assert backend._lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_short_record_ttl_expires_before_the_ceiling():
+    backend = CachingDNSBackend(ttl=60)
+    backend._lookup = AsyncMock(return_value=("93.184.216.34", 0))
+
+    await backend.resolve("example.com", 443)
+    await backend.resolve("example.com", 443)
+
+    assert backend._lookup.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_long_record_ttl_is_capped_at_the_ceiling():
+    backend = CachingDNSBackend(ttl=60)
+    backend._lookup = AsyncMock(return_value=("93.184.216.34", 86400))
+
+    await backend.resolve("example.com", 443)
+
+    assert backend._cache[("example.com", 443)][0] <= time.monotonic() + 60
+
+
+@pytest.mark.asyncio
+async def test_ip_literals_skip_resolution():
+    backend = CachingDNSBackend(ttl=60)
+    backend._lookup = AsyncMock()
+
+    assert await backend.resolve("10.0.0.1", 80) == "10.0.0.1"
+    backend._lookup.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_cold_monitors_get_no_shared_client():
+    pool = ClientPool()
+
+    assert pool.client_for(MockMonitor("cold")) is None
+    warm = pool.client_for(MockMonitor("warm"))
+    assert warm is pool.client_for(MockMonitor("warm"))
+
+    await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_phase_timer_splits_dns_from_connect():
+    timer = PhaseTimer()
+    timer.marks = {
+        "connect_tcp.started": 0.000,
+        "connect_tcp.complete": 0.030,
+        "start_tls.started": 0.030,
+        "start_tls.complete": 0.070,
+        "send_request_headers.started": 0.070,
+        "receive_response_headers.complete": 0.170,
+    }
+    timer.dns_ms = 10
+
+    assert timer.phases() == {
+        "dns": 10,
+        "connect": 20,
+        "tls": 40,
+        "ttfb": 100,
+        "transfer": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_phase_timer_leaves_skipped_phases_empty():
+    timer = PhaseTimer()
+    await timer.trace("http11.send_request_headers.started", {})
+    await timer.trace("http11.receive_response_headers.complete", {})
+
+    phases = timer.phases()
+
+    assert phases["ttfb"] is not None
+    assert phases["dns"] is phases["connect"] is phases["tls"] is None
+
+
+@pytest.mark.asyncio
+async def test_dns_time_is_reported_to_current_timer():
+    backend = CachingDNSBackend(ttl=60)
+    backend._lookup = AsyncMock(return_value=("93.184.216.34", None))
+    timer = PhaseTimer()
+
+    token = current_timer.set(timer)
+    try:
+        await backend.resolve("example.com", 443)
+    finally:
+        current_timer.reset(token)
+
+    assert timer.dns_ms is not None
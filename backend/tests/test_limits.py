@@ -0,0 +1,61 @@
+import asyncio
+
+import pytest
+
+from app.worker.limits import HostLimiter, host_of
+
+
+def test_host_of_normalizes_hostname():
+    assert host_of("https://Example.com:8443/path") == "example.com"
+
+
+async def _peak(limiter, hosts):
+    active: dict[str, int] = {}
+    peak = {"total": 0}
+
+    async def hold(host):
+        async with limiter.slot(host):
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            peak["total"] = max(peak["total"], sum(active.values()))
+            await asyncio.sleep(0.01)
+            active[host] -= 1
+
+    await asyncio.gather(*[hold(h) for h in hosts])
+    return peak
+
+
+@pytest.mark.asyncio
+async def test_per_host_cap_is_enforced():
+    limiter = HostLimiter(max_concurrency=100, per_host=2)
+
+    peak = await _peak(limiter, ["a.com"] * 10 + ["b.com"] * 10)
+
+    assert peak["a.com"] == 2
+    assert peak["b.com"] == 2
+
+
+@pytest.mark.asyncio
+async def test_global_budget_is_enforced():
+    limiter = HostLimiter(max_concurrency=3, per_host=10)
+
+    peak = await _peak(limiter, [f"host{i}.com" for i in range(20)])
+
+    assert peak["total"] == 3
+
+
+@pytest.mark.asyncio
+async def test_queued_time_is_reported_and_hosts_released():
+    limiter = HostLimiter(max_concurrency=1, per_host=1)
+    waits = []
+
+    async def hold():
+        async with limiter.slot("a.com") as queued:
+            waits.append(queued)
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(hold(), hold())
+
+    assert min(waits) < 0.01
+    assert max(waits) >= 0.015
+    assert limiter._hosts == {}
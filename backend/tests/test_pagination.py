@@ -0,0 +1,26 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.monitors import decode_result_cursor, encode_result_cursor
+
+
+def test_result_cursor_round_trips():
+    at = datetime(2026, 10, 16, 12, 30, 15, 123456)
+
+    assert decode_result_cursor(encode_result_cursor(at, 42)) == (at, 42)
+
+
+def test_result_cursor_with_offset_becomes_naive_utc():
+    at = datetime(2026, 10, 16, 14, 30, tzinfo=timezone(timedelta(hours=2)))
+
+    assert decode_result_cursor(encode_result_cursor(at, 7)) == (datetime(2026, 10, 16, 12, 30), 7)
+
+
+@pytest.mark.parametrize("cursor", ["", "42", "yesterday,1", "2026-10-16T12:00:00,x"])
+def test_malformed_result_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_result_cursor(cursor)
+
+    assert exc.value.status_code == 400
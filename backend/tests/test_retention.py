@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+
+from app.core.retention import (
+    PERIOD_DAY,
+    PERIOD_WEEK,
+    missing_ranges,
+    partition_name,
+    partition_start,
+    period_start,
+)
+
+
+def test_period_start_aligns_to_day_and_monday():
+    at = datetime(2026, 10, 16, 13, 45)  # A Friday
+
+    assert period_start(at, PERIOD_DAY) == datetime(2026, 10, 16)
+    assert period_start(at, PERIOD_WEEK) == datetime(2026, 10, 12)
+
+
+def test_partition_name_uses_start_date():
+    assert partition_name(datetime(2026, 10, 16)) == "check_results_p20261016"
+
+
+def test_missing_ranges_skips_existing_partitions():
+    day = datetime(2026, 10, 16)
+    existing = [(day, day + timedelta(days=1))]
+
+    ranges = missing_ranges(day, day + timedelta(days=3), existing, PERIOD_DAY)
+
+    assert ranges == [
+        (day + timedelta(days=1), day + timedelta(days=2)),
+        (day + timedelta(days=2), day + timedelta(days=3)),
+    ]
+
+
+def test_switching_to_weekly_only_fills_gaps_around_daily_partitions():
+    monday = datetime(2026, 10, 12)
+    existing = [(monday + timedelta(days=i), monday + timedelta(days=i + 1)) for i in range(3)]
+
+    ranges = missing_ranges(monday, monday + timedelta(weeks=2), existing, PERIOD_WEEK)
+
+    assert ranges == [
+        (monday + timedelta(days=3), monday + timedelta(weeks=1)),
+        (monday + timedelta(weeks=1), monday + timedelta(weeks=2)),
+    ]
+
+
+def test_partition_start_reads_the_bound_back_from_the_name():
+    start = datetime(2026, 3, 9)
+
+    assert partition_start(partition_name(start)) == start
+    assert partition_start("check_results_p2026") is None
+    assert partition_start("check_rollups_p20260309") is None
@@ -0,0 +1,149 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.rollups import window_segments
+from app.models.rollup import COUNTER_COLUMNS, DAY, HOUR, MINUTE, bucket_start, naive_utc
+from app.worker.rollups import RollupBuffer, counters_for
+from app.worker.writer import ResultRecord
+
+
+def _record(monitor_id=1, is_up=True, response_time_ms=120, checked_at=None):
+    return ResultRecord(
+        monitor_id=monitor_id,
+        is_up=is_up,
+        response_time_ms=response_time_ms,
+        checked_at=checked_at or datetime(2026, 1, 1, 12, 30, 15, tzinfo=timezone.utc),
+    )
+
+
+def test_bucket_start_floors_to_naive_utc():
+    at = datetime(2026, 1, 1, 12, 30, 15, tzinfo=timezone.utc)
+
+    assert bucket_start(at, MINUTE) == datetime(2026, 1, 1, 12, 30)
+    assert bucket_start(at, HOUR) == datetime(2026, 1, 1, 12, 0)
+    assert bucket_start(at, DAY) == datetime(2026, 1, 1)
+
+
+def test_naive_utc_converts_aware_and_keeps_naive():
+    eastern = timezone(timedelta(hours=-5))
+
+    assert naive_utc(datetime(2026, 1, 1, 7, 30, tzinfo=eastern)) == datetime(2026, 1, 1, 12, 30)
+    assert naive_utc(datetime(2026, 1, 1, 12, 30)) == datetime(2026, 1, 1, 12, 30)
+
+
+def test_counters_fill_cumulative_histogram():
+    total, up, latency_count, latency_sum, good, *histogram = counters_for(
+        _record(response_time_ms=120)
+    )
+
+    assert (total, up, latency_count, latency_sum, good) == (1, 1, 1, 120, 1)
+    # le_50, le_100 miss; le_250 and above count it
+    assert histogram == [0, 0, 1, 1, 1, 1, 1]
+
+
+def test_failed_check_without_latency_only_counts_total():
+    assert counters_for(_record(is_up=False, response_time_ms=None)) == [1, 0, 0, 0, 0] + [0] * 7
+
+
+def test_latency_good_uses_the_monitors_own_threshold():
+    record = _record(response_time_ms=800)
+    record.latency_threshold_ms = 1000
+
+    assert counters_for(record)[4] == 1
+    assert counters_for(_record(response_time_ms=800))[4] == 0
+
+
+def test_window_segments_use_largest_buckets_that_fit():
+    since = datetime(2026, 1, 1, 22, 30)
+    until = datetime(2026, 1, 4, 1, 15, 30)
+
+    assert window_segments(since, until) == [
+        (MINUTE, datetime(2026, 1, 1, 22, 30), datetime(2026, 1, 1, 23, 0)),
+        (HOUR, datetime(2026, 1, 1, 23, 0), datetime(2026, 1, 2)),
+        (DAY, datetime(2026, 1, 2), datetime(2026, 1, 4)),
+        (HOUR, datetime(2026, 1, 4), datetime(2026, 1, 4, 1, 0)),
+        (MINUTE, datetime(2026, 1, 4, 1, 0), until),
+    ]
+
+
+def test_window_segments_are_contiguous():
+    since = datetime(2026, 1, 1, 5, 17, 40)
+    until = since + timedelta(days=2, hours=7, minutes=3)
+
+    segments = window_segments(since, until)
+
+    assert segments[0][1] == datetime(2026, 1, 1, 5, 18)
+    assert segments[-1][2] == until
+    for (_, _, hi), (_, lo, _) in zip(segments, segments[1:]):
+        assert hi == lo
+
+
+class CapturingBuffer(RollupBuffer):
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.rows = []
+        self.recounts = []
+
+    async def _upsert(self, pending):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.rows.extend(
+            {
+                "bucket_seconds": seconds,
+                **dict(zip(COUNTER_COLUMNS, bucket.counters)),
+                "latency_sketch": bucket.sketch,
+            }
+            for (_, seconds, _), bucket in pending.items()
+        )
+
+    async def _recount(self, monitor_id, threshold_ms):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.recounts.append((monitor_id, threshold_ms))
+
+
+@pytest.mark.asyncio
+async def test_results_in_same_bucket_are_merged_before_flush():
+    buffer = CapturingBuffer()
+    buffer.add(_record(response_time_ms=40))
+    buffer.add(_record(is_up=False, response_time_ms=None))
+
+    assert len(buffer) == 3  # One bucket per resolution
+    assert await buffer.flush() == 3
+
+    minute = next(r for r in buffer.rows if r["bucket_seconds"] == MINUTE)
+    assert (minute["total"], minute["up"], minute["latency_count"], minute["le_50"]) == (2, 1, 1, 1)
+    assert minute["latency_sketch"].count == 1
+    assert len(buffer) == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_deltas():
+    buffer = CapturingBuffer(fail=True)
+    buffer.add(_record())
+
+    assert await buffer.flush() == 0
+    buffer.add(_record())
+    buffer.fail = False
+    await buffer.flush()
+
+    assert all(row["total"] == 2 for row in buffer.rows)
+    assert all(row["latency_sketch"].count == 2 for row in buffer.rows)
+
+
+@pytest.mark.asyncio
+async def test_threshold_change_is_recounted_after_deltas_are_written():
+    buffer = CapturingBuffer(fail=True)
+    buffer.add(_record())
+    buffer.request_recompute(1, 1000)
+
+    await buffer.flush()
+    assert buffer.recounts == []
+
+    buffer.fail = False
+    await buffer.flush()
+    await buffer.flush()
+
+    assert buffer.recounts == [(1, 1000)]
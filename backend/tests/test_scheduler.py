@@ -0,0 +1,199 @@
+from unittest.mock import patch
+
+import pytest
+
+from app.worker.scheduler import CheckScheduler, next_slot, phase_offset
+
+
+class MockMonitor:
+    def __init__(self, id=1, interval_seconds=60, adaptive=False):
+        self.id = id
+        self.name = f"Monitor {id}"
+        self.url = "https://example.com"
+        self.interval_seconds = interval_seconds
+        self.adaptive = adaptive
+
+
+class MockResult:
+    def __init__(self, monitor_id=1, is_up=True, response_time_ms=100, latency_threshold_ms=500):
+        self.monitor_id = monitor_id
+        self.is_up = is_up
+        self.response_time_ms = response_time_ms
+        self.latency_threshold_ms = latency_threshold_ms
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+async def _noop(batch):
+    return None
+
+
+def test_phase_offsets_spread_across_interval():
+    offsets = sorted(phase_offset(i, 60) for i in range(1, 61))
+
+    assert all(0 <= o < 60 for o in offsets)
+    # Sequential ids should never bunch up in the same second
+    gaps = [b - a for a, b in zip(offsets, offsets[1:])]
+    assert max(gaps) < 3
+
+
+def test_next_slot_is_strictly_after_now():
+    assert next_slot(100.0, 60, 10) == 130.0
+    assert next_slot(130.0, 60, 10) == 190.0
+    assert next_slot(129.9, 60, 10) == 130.0
+
+
+@pytest.mark.asyncio
+async def test_each_monitor_runs_on_its_own_interval():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 30), MockMonitor(2, 120)])
+
+    runs = {1: 0, 2: 0}
+    for _ in range(240):
+        clock.now += 1
+        for monitor in scheduler.pop_due(clock.now):
+            runs[monitor.id] += 1
+
+    assert runs == {1: 8, 2: 2}
+
+
+@pytest.mark.asyncio
+async def test_removed_monitor_is_not_dispatched():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 60), MockMonitor(2, 60)])
+    scheduler.sync([MockMonitor(2, 60)])
+
+    clock.now += 61
+    assert [m.id for m in scheduler.pop_due(clock.now)] == [2]
+
+
+@pytest.mark.asyncio
+async def test_lagging_monitor_skips_missed_slots():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 60)])
+
+    clock.now += 600
+    assert len(scheduler.pop_due(clock.now)) == 1
+    # Missed slots are dropped rather than replayed in a burst
+    assert scheduler.pop_due(clock.now) == []
+    assert scheduler.next_due() > clock.now
+
+
+@pytest.mark.asyncio
+async def test_in_flight_monitor_is_not_dispatched_twice():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 60)])
+
+    clock.now += 60
+    batch = scheduler.pop_due(clock.now)
+    scheduler._in_flight.update(m.id for m in batch)
+
+    clock.now += 60
+    assert scheduler.pop_due(clock.now) == []
+
+
+@pytest.mark.asyncio
+async def test_adaptive_monitor_tightens_while_failing_and_relaxes_when_stable():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 60, adaptive=True), MockMonitor(2, 60)])
+
+    with patch("app.worker.scheduler.settings.adaptive_interval_seconds", 10), \
+         patch("app.worker.scheduler.settings.adaptive_stable_checks", 2):
+        scheduler.observe([MockResult(1, is_up=False), MockResult(2, is_up=False)])
+        assert scheduler.interval_for(scheduler._monitors[1]) == 10
+        assert scheduler.interval_for(scheduler._monitors[2]) == 60
+        assert scheduler._due_at[1] <= clock.now + 10
+
+        scheduler.observe([MockResult(1, is_up=True)])
+        assert scheduler.interval_for(scheduler._monitors[1]) == 10
+        scheduler.observe([MockResult(1, is_up=True)])
+        assert scheduler.interval_for(scheduler._monitors[1]) == 60
+
+
+@pytest.mark.asyncio
+async def test_adaptive_monitor_tightens_on_slow_checks():
+    clock = FakeClock()
+    scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(1, 60, adaptive=True)])
+
+    with patch("app.worker.scheduler.settings.adaptive_interval_seconds", 10):
+        scheduler.observe([MockResult(1, response_time_ms=500)])
+        assert scheduler.interval_for(scheduler._monitors[1]) == 60
+        scheduler.observe([MockResult(1, response_time_ms=501)])
+        assert scheduler.interval_for(scheduler._monitors[1]) == 10
+
+
+@pytest.mark.asyncio
+async def test_ceiling_defers_checks_past_the_rate():
+    clock = FakeClock()
+    with patch("app.worker.scheduler.settings.max_checks_per_second", 2):
+        scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(i, 60) for i in range(1, 11)])
+
+    clock.now += 60
+    assert len(scheduler.pop_due(clock.now)) == 2
+    assert scheduler.pop_due(clock.now) == []
+    assert scheduler.throttled_until(clock.now) == clock.now + 0.5
+
+    clock.now += 1
+    assert len(scheduler.pop_due(clock.now)) == 2
+
+
+@pytest.mark.asyncio
+async def test_due_queue_depth_counts_checks_held_by_the_ceiling():
+    clock = FakeClock()
+    with patch("app.worker.scheduler.settings.max_checks_per_second", 2):
+        scheduler = CheckScheduler(_noop, clock=clock)
+    scheduler.sync([MockMonitor(i, 60) for i in range(1, 11)])
+
+    clock.now += 60
+    assert scheduler.waiting(clock.now) == 10
+    batch = scheduler.pop_due(clock.now)
+    assert scheduler.waiting(clock.now) == 8
+
+    with patch("app.worker.scheduler.updog_scheduler_due_queue_depth") as depth:
+        scheduler._in_flight.update(m.id for m in batch)
+        scheduler._report_depth(clock.now)
+    depth.set.assert_called_once_with(10)
+
+
+@pytest.mark.asyncio
+async def test_ceiling_is_shared_across_live_workers():
+    clock = FakeClock()
+    workers = 2
+    with patch("app.worker.scheduler.settings.max_checks_per_second", 4):
+        scheduler = CheckScheduler(_noop, clock=clock, workers=lambda: workers)
+    scheduler.sync([MockMonitor(i, 60) for i in range(1, 21)])
+
+    clock.now += 60
+    scheduler.pop_due(clock.now)  # Spend the initial burst
+    clock.now += 1
+    assert len(scheduler.pop_due(clock.now)) == 2
+
+    workers = 4
+    clock.now += 1
+    assert len(scheduler.pop_due(clock.now)) == 1
+
+
+def test_sync_reports_reloaded_monitors_to_on_changed():
+    changes = []
+    scheduler = CheckScheduler(
+        _noop, clock=FakeClock(), on_changed=lambda old, new: changes.append((old, new))
+    )
+    first = MockMonitor(1, 60)
+    scheduler.sync([first])
+    second = MockMonitor(1, 60)
+    scheduler.sync([second])
+
+    assert changes == [(first, second)]
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.core.series import calculate_series, series_resolution
+from app.core.sketch import DDSketch
+from app.models.rollup import DAY, HOUR, MINUTE
+
+NOW = datetime(2026, 10, 16, 12)
+
+
+def test_week_at_500_points_reads_minutes_in_whole_minute_buckets():
+    since = NOW - timedelta(days=7)
+
+    resolution, width = series_resolution(since, NOW, 500, NOW)
+
+    assert resolution == MINUTE
+    assert width % MINUTE == 0
+    assert (NOW - since).total_seconds() / width <= 500
+
+
+def test_year_reads_day_rollups():
+    assert series_resolution(NOW - timedelta(days=365), NOW, 300, NOW)[0] == DAY
+
+
+def test_compacted_minutes_fall_back_to_hours():
+    since = NOW - timedelta(days=200)
+    with patch("app.core.compaction.settings.rollup_minute_retention_days", 120):
+        resolution, width = series_resolution(since, since + timedelta(hours=6), 300, NOW)
+
+    assert (resolution, width) == (HOUR, HOUR)
+
+
+class FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def execute(self, stmt):
+        return self.rows
+
+
+def _sketch(*values):
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+    return sketch.to_bytes()
+
+
+async def test_series_merges_rollups_into_buckets_and_keeps_gaps():
+    since = NOW - timedelta(hours=1)
+    rows = [
+        # bucket_start, total, up, latency_count, latency_sum_ms, latency_sketch
+        (since, 1, 1, 1, 100, _sketch(100)),
+        (since + timedelta(minutes=1), 2, 1, 1, 300, _sketch(300)),
+        (since + timedelta(minutes=50), 1, 0, 0, 0, None),
+    ]
+
+    series = await calculate_series(FakeDB(rows), 1, since, NOW, points=6, now=NOW)
+
+    assert series.bucket_seconds == 10 * MINUTE
+    assert len(series.buckets) == 6
+    first = series.buckets[0]
+    assert (first.total, first.uptime, first.latency_avg_ms) == (3, 2 / 3, 200)
+    assert abs(first.latency_min_ms - 100) <= 1
+    assert abs(first.latency_max_ms - 300) <= 3
+    assert series.buckets[1].uptime is None
+    assert (series.buckets[5].total, series.buckets[5].latency_p95_ms) == (1, None)
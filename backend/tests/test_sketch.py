@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from app.core.sketch import RELATIVE_ACCURACY, DDSketch
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.95, 0.99])
+def test_quantiles_stay_within_relative_accuracy(q):
+    rng = random.Random(42)
+    values = [rng.lognormvariate(5, 1) for _ in range(5000)]
+    sketch = DDSketch()
+    for value in values:
+        sketch.add(value)
+
+    assert sketch.quantile(q) == pytest.approx(_exact_quantile(values, q), rel=RELATIVE_ACCURACY)
+
+
+def test_merged_sketches_match_one_sketch_of_everything():
+    whole, left, right = DDSketch(), DDSketch(), DDSketch()
+    for ms in range(1, 1001):
+        whole.add(ms)
+        (left if ms % 3 else right).add(ms)
+
+    left.merge(right)
+
+    assert left.count == whole.count
+    assert left.bins == whole.bins
+
+
+def test_sub_millisecond_values_count_as_zero():
+    sketch = DDSketch()
+    sketch.add(0)
+    sketch.add(0)
+    sketch.add(200)
+
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(200, rel=RELATIVE_ACCURACY)
+
+
+def test_empty_sketch_has_no_quantiles():
+    sketch = DDSketch()
+
+    assert not sketch
+    assert sketch.quantile(0.95) is None
+
+
+def test_bytes_round_trip():
+    sketch = DDSketch()
+    for ms in (0, 12, 12, 480, 3100):
+        sketch.add(ms)
+
+    restored = DDSketch.from_bytes(sketch.to_bytes())
+
+    assert (restored.bins, restored.zero_count, restored.count) == (
+        sketch.bins,
+        sketch.zero_count,
+        sketch.count,
+    )
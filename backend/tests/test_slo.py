@@ -1,6 +1,17 @@
+from datetime import datetime
+from types import SimpleNamespace
 
 import pytest
-from app.core.slo import calculate_error_budget, AVAILABILITY_SLO
+from app.core.sketch import DDSketch
+from app.core.slo import (
+    AVAILABILITY_SLO,
+    LatencyPercentiles,
+    PhaseBreakdown,
+    SLICounts,
+    SLODefinition,
+    build_slo_report,
+    calculate_error_budget,
+)
 
 
 class TestErrorBudgetCalculation:
@@ -77,3 +88,90 @@ class TestSLOEndpoint:
         response = await client.get("/api/slo/monitors/99999")
 
         assert response.status_code == 404
+
+
+class TestSLOReport:
+
+    def test_report_is_built_from_counts(self):
+        counts = SLICounts(total=1000, up=990, latency_total=990, latency_fast=980)
+        percentiles = LatencyPercentiles.from_sketch(DDSketch())
+        phases = PhaseBreakdown(24, None, None, None, None, None)
+
+        report = build_slo_report(
+            1, "API", counts, percentiles, phases, SLODefinition(window_days=7)
+        )
+
+        assert report.window_days == 7
+        assert report.total_checks == 1000
+        assert report.availability.current == pytest.approx(0.99)
+        assert report.availability.is_met is False
+        assert report.latency.current == pytest.approx(980 / 990)
+        assert report.latency.is_met is True
+
+    def test_report_uses_monitors_own_targets(self):
+        counts = SLICounts(total=1000, up=990, latency_total=990, latency_fast=900)
+        definition = SLODefinition(
+            availability_target=0.98, latency_target=0.9, latency_threshold_ms=1000
+        )
+
+        report = build_slo_report(
+            1, "API", counts, LatencyPercentiles.from_sketch(DDSketch()),
+            PhaseBreakdown(24, None, None, None, None, None), definition,
+        )
+
+        assert report.availability.is_met is True
+        assert report.latency.target == 0.9
+        assert report.latency.name == "Latency (p90 < 1000ms)"
+
+    def test_no_data_counts_as_meeting_slo(self):
+        counts = SLICounts()
+
+        assert counts.availability == 1.0
+        assert counts.latency == 1.0
+
+    def test_percentiles_come_from_sketch(self):
+        sketch = DDSketch()
+        for ms in range(1, 101):
+            sketch.add(ms)
+
+        percentiles = LatencyPercentiles.from_sketch(sketch)
+
+        assert percentiles.count == 100
+        assert percentiles.p50_ms == pytest.approx(50, rel=0.02)
+        assert percentiles.p99_ms == pytest.approx(99, rel=0.02)
+
+    def test_no_data_has_no_percentiles(self):
+        percentiles = LatencyPercentiles.from_sketch(DDSketch())
+
+        assert percentiles.count == 0
+        assert percentiles.p95_ms is None
+
+
+class TestSLODefinition:
+
+    def test_unset_fields_fall_back_to_defaults(self):
+        monitor = SimpleNamespace(
+            slo_availability_target=0.999,
+            slo_latency_target=None,
+            slo_latency_threshold_ms=None,
+            slo_window_days=7,
+            slo_calendar_month=False,
+        )
+
+        definition = SLODefinition.for_monitor(monitor)
+
+        assert definition == SLODefinition(availability_target=0.999, window_days=7)
+
+    def test_rolling_window(self):
+        now = datetime(2026, 3, 15, 12, 0)
+
+        since, until = SLODefinition(window_days=7).window(now)
+
+        assert (since, until) == (datetime(2026, 3, 8, 12, 0), now)
+
+    def test_calendar_month_window_starts_on_the_first(self):
+        now = datetime(2026, 2, 15, 12, 0)
+        definition = SLODefinition(calendar_month=True)
+
+        assert definition.window(now) == (datetime(2026, 2, 1), now)
+        assert definition.period_days(now) == 28
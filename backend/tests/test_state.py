@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.worker.runner import Worker
+from app.worker.state import StateTable, state_table
+from app.worker.writer import result_writer
+
+
+class MockResult:
+    def __init__(self, monitor_id=1, is_up=True):
+        self.monitor_id = monitor_id
+        self.is_up = is_up
+        self.status_code = 200 if is_up else 500
+        self.response_time_ms = 42
+        self.error_message = None
+        self.checked_at = datetime.now(timezone.utc)
+
+
+def test_update_returns_previous_state():
+    table = StateTable()
+
+    assert table.update(MockResult(is_up=True)) is None
+    assert table.update(MockResult(is_up=False)) is True
+    assert table.update(MockResult(is_up=False)) is False
+    assert table.is_up(1) is False
+
+
+def test_states_are_tracked_per_monitor():
+    table = StateTable()
+    table.update(MockResult(monitor_id=1, is_up=True))
+    table.update(MockResult(monitor_id=2, is_up=False))
+
+    assert table.is_up(1) is True
+    assert table.is_up(2) is False
+    assert table.get(2).status_code == 500
+    assert table.is_up(3) is None
+
+
+def test_forget_drops_monitor():
+    table = StateTable()
+    table.update(MockResult(monitor_id=1))
+    table.forget(1)
+
+    assert table.get(1) is None
+    assert len(table) == 0
+
+
+@pytest.mark.asyncio
+async def test_rebalance_flushes_buffered_results_before_rewarming():
+    calls = []
+
+    async def flush():
+        calls.append("flush")
+
+    worker = Worker()
+    with patch.object(result_writer, "flush", flush), \
+         patch.object(state_table, "invalidate", lambda: calls.append("invalidate")):
+        worker._rebalance()
+        await worker._tasks.pop()
+
+    assert calls == ["flush", "invalidate"]
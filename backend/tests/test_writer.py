@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.core.cache import SLOReportCache
+from app.worker.writer import ResultRecord, ResultWriter
+
+
+class CapturingWriter(ResultWriter):
+    def __init__(self, fail=False, **kwargs):
+        super().__init__(**{"batch_size": 2, "flush_interval": 1.0, "max_buffer": 3, **kwargs})
+        self.batches = []
+        self.fail = fail
+
+    async def _write(self, rows):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+        self.batches.append(rows)
+
+
+def _record(monitor_id=1):
+    return ResultRecord(
+        monitor_id=monitor_id,
+        is_up=True,
+        status_code=200,
+        response_time_ms=50,
+        checked_at=datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc),
+    )
+
+
+def test_record_row_uses_naive_utc_timestamp():
+    row = _record().as_row()
+
+    assert row[4] == datetime(2026, 1, 1, 12, 0)
+    assert row[4].tzinfo is None
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_in_batches():
+    writer = CapturingWriter()
+    for i in range(5):
+        writer.add(_record(i))
+
+    written = await writer.flush()
+
+    assert written == 5
+    assert [len(b) for b in writer.batches] == [2, 2, 1]
+    assert len(writer) == 0
+
+
+@pytest.mark.asyncio
+async def test_full_batch_wakes_flush_loop():
+    writer = CapturingWriter()
+    writer.add(_record())
+    assert not writer._kick.is_set()
+
+    writer.add(_record())
+    assert writer._kick.is_set()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_keeps_newest_results():
+    writer = CapturingWriter(fail=True, batch_size=10)
+    for i in range(5):
+        writer.add(_record(i))
+
+    assert await writer.flush() == 0
+    assert [row[0] for row in writer._buffer] == [2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_flush_invalidates_cached_reports_of_written_monitors():
+    cache = SLOReportCache(max_size=10, ttl=60, sole_writer=lambda: True)
+    writer = CapturingWriter(slo_cache=cache)
+    writer.add(_record(1))
+    writer.add(_record(2))
+
+    await writer.flush()
+
+    assert await cache.versions([1, 2, 3]) == {1: 1, 2: 1, 3: 0}
@@ -14,6 +14,11 @@ export interface Monitor {
   url: string                                                                                                             
   interval_seconds: number                                                                                                
   is_active: boolean                                                                                                      
+  probe_mode: 'head' | 'headers' | 'body'
+  timeout_seconds: number
+  max_body_bytes: number | null
+  connection_mode: 'warm' | 'cold'
+  adaptive: boolean
   created_at: string                                                                                                      
   updated_at: string                                                                                                      
 }                                                                                                                         
@@ -25,17 +30,53 @@ export interface CheckResult {
   response_time_ms: number | null                                                                                         
   is_up: boolean                                                                                                          
   checked_at: string                                                                                                      
-  error_message: string | null                                                                                            
+  error_message: string | null
+  dns_ms: number | null
+  connect_ms: number | null
+  tls_ms: number | null
+  ttfb_ms: number | null
+  transfer_ms: number | null
 }                                                                                                                         
                                                                                                                           
-export async function getMonitors(): Promise<Monitor[]> {                                                                 
-  const response = await fetch(`${API_BASE}/api/monitors`)                                                                           
-  if (!response.ok) {                                                                                                     
-    throw new Error('Failed to fetch monitors')                                                                           
-  }                                                                                                                       
-  return response.json()                                                                                                  
+export async function getMonitors(): Promise<Monitor[]> {
+  // Follow X-Next-Cursor until every page is in
+  const monitors: Monitor[] = []
+  let cursor: string | null = null
+  do {
+    const query: string = cursor ? `?cursor=${encodeURIComponent(cursor)}` : ''
+    const response = await fetch(`${API_BASE}/api/monitors${query}`)
+    if (!response.ok) {
+      throw new Error('Failed to fetch monitors')
+    }
+    monitors.push(...(await response.json()))
+    cursor = response.headers.get('X-Next-Cursor')
+  } while (cursor)
+  return monitors
 }                                                                                                                         
                                                                                                                           
+export interface MonitorSummary {
+  monitor_id: number
+  name: string
+  url: string
+  is_active: boolean
+  is_up: boolean | null
+  last_checked_at: string | null
+  status_code: number | null
+  response_time_ms: number | null
+  checks_24h: number
+  uptime_24h: number | null
+  p95_ms_24h: number | null
+  incident_started_at: string | null
+}
+
+export async function getDashboardSummary(): Promise<MonitorSummary[]> {
+  const response = await fetch(`${API_BASE}/api/dashboard/summary`)
+  if (!response.ok) {
+    throw new Error('Failed to fetch dashboard summary')
+  }
+  return response.json()
+}
+
 export async function getMonitor(id: string): Promise<Monitor> {                                                          
   const response = await fetch(`${API_BASE}/api/monitors/${id}`)                                                                     
   if (!response.ok) {                                                                                                     
@@ -52,6 +93,39 @@ export async function getMonitorResults(id: string, limit = 20): Promise<CheckRe
   return response.json()                                                                                                  
 }
 
+export interface SeriesPoint {
+  start: string
+  total_checks: number
+  uptime: number | null
+  latency_min_ms: number | null
+  latency_avg_ms: number | null
+  latency_max_ms: number | null
+  latency_p95_ms: number | null
+}
+
+export interface Series {
+  monitor_id: number
+  since: string
+  until: string
+  resolution_seconds: number
+  bucket_seconds: number
+  points: SeriesPoint[]
+}
+
+export async function getMonitorSeries(
+  id: string,
+  from: string,
+  to: string,
+  points = 300,
+): Promise<Series> {
+  const query = new URLSearchParams({ from, to, points: String(points) })
+  const response = await fetch(`${API_BASE}/api/monitors/${id}/series?${query}`)
+  if (!response.ok) {
+    throw new Error('Failed to fetch series')
+  }
+  return response.json()
+}
+
 export async function createMonitor(data: {
   name: string
   url: string
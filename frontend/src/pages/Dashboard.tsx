@@ -1,17 +1,17 @@
 import { useEffect, useState } from 'react'
 import { Link } from 'react-router-dom'
-import type { Monitor } from '../api/monitors'
-import { getMonitors } from '../api/monitors'
+import type { MonitorSummary } from '../api/monitors'
+import { getDashboardSummary } from '../api/monitors'
 import { useAuth } from '../context/AuthContext'
 
 function Dashboard() {
   const { user } = useAuth()
-  const [monitors, setMonitors] = useState<Monitor[]>([])
+  const [monitors, setMonitors] = useState<MonitorSummary[]>([])
   const [loading, setLoading] = useState(true)
   const [error, setError] = useState<string | null>(null)
 
   useEffect(() => {
-    getMonitors()
+    getDashboardSummary()
       .then((data) => {
         setMonitors(data)
         setLoading(false)
@@ -34,12 +34,15 @@ function Dashboard() {
       ) : (
         <ul>
           {monitors.map((monitor) => (
-            <li key={monitor.id}>
-              <Link to={`/monitors/${monitor.id}`}>
+            <li key={monitor.monitor_id}>
+              <Link to={`/monitors/${monitor.monitor_id}`}>
                 {monitor.name}
               </Link>
               {' - '}
-              {monitor.is_active ? 'Active' : 'Paused'}
+              {!monitor.is_active ? 'Paused' : monitor.is_up === null ? 'No data' : monitor.is_up ? 'Up' : 'Down'}
+              {monitor.uptime_24h !== null && ` - ${(monitor.uptime_24h * 100).toFixed(2)}% (24h)`}
+              {monitor.p95_ms_24h !== null && ` - p95 ${Math.round(monitor.p95_ms_24h)}ms`}
+              {monitor.incident_started_at && ` - down since ${new Date(monitor.incident_started_at + 'Z').toLocaleString()}`}
             </li>
           ))}
         </ul>